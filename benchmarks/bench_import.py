@@ -0,0 +1,86 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Benchmark the cold import time of the youtube_agent package.
+
+Imports the package in fresh interpreters with ``-X importtime``, reports the
+median time and the slowest imports, and exits non-zero when the median goes
+over the budget or a heavy dependency (agno, bindu, mem0, ...) is imported
+eagerly again.
+
+    python benchmarks/bench_import.py [--budget-ms 500] [--json results.json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Only loaded once the agent is built (agno, openai) or served (bindu), or with MEM0_API_KEY (mem0)
+HEAVY_MODULES = ("agno", "bindu", "mem0", "openai", "sqlalchemy", "qdrant_client")
+
+
+def measure(module: str = "youtube_agent") -> tuple[float, list[tuple[float, str]], list[str]]:
+    """Import ``module`` in a fresh interpreter.
+
+    Returns its cumulative import time in seconds, the (seconds, name) of every
+    imported module, and the heavy modules that were loaded.
+    """
+    code = f"import sys, {module}; print(' '.join(sorted(m for m in sys.modules if '.' not in m)))"
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings: list[tuple[float, str]] = []
+    total = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line.split("|"))
+        if not cumulative.isdigit():
+            continue
+        timings.append((int(cumulative) / 1e6, name))
+        if name == module:
+            total = int(cumulative) / 1e6
+    loaded = set(result.stdout.split())
+    return total, timings, [name for name in HEAVY_MODULES if name in loaded]
+
+
+def main() -> None:
+    """Run the benchmark, print a summary and exit 1 when over budget."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=500.0, help="Fail when the median import is slower")
+    parser.add_argument("--json", type=str, default=None, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.repeats)]
+    median_ms = statistics.median(total for total, _, _ in runs) * 1000
+    slowest = sorted(runs[-1][1], reverse=True)[1:11]
+    heavy = runs[-1][2]
+
+    print(f"import youtube_agent: median {median_ms:.1f} ms over {args.repeats} runs (budget {args.budget_ms:.0f} ms)")
+    for seconds, name in slowest:
+        print(f"  {seconds * 1000:8.1f} ms  {name}")
+    if heavy:
+        print(f"❌ Heavy modules imported eagerly: {', '.join(heavy)}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"median_ms": round(median_ms, 1), "budget_ms": args.budget_ms, "heavy": heavy}, f, indent=2)
+
+    if median_ms > args.budget_ms or heavy:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Benchmark the peak memory of analysing multi-hour videos, offline against the stand-ins.
+
+Each transcript length runs in a fresh interpreter: the agent is initialized
+and warmed up on a short video, then analyses synthetic transcripts of the
+given length through ``handler`` (map-reduce over the transcript, then the
+agent's tool call). Reports the peak RSS and how much one long request added
+to it, and exits non-zero when the peak goes over the per-request budget in
+skill.yaml or the longest videos need much more memory than the shortest.
+
+    python benchmarks/bench_memory.py [--hours 1 3 10] [--ceiling-mb 512] [--json results.json]
+"""
+
+import argparse
+import asyncio
+import gc
+import importlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+from typing import Any
+
+from youtube_agent.standins import FakeTranscriptProvider, StandInLLMServer
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def _analyze(agent_main: Any, video: str) -> str:
+    messages = [{"role": "user", "content": f"Summarize https://www.youtube.com/watch?v={video}"}]
+    result = await agent_main.handler(messages)
+    if hasattr(result, "__aiter__"):
+        return "".join([str(chunk) async for chunk in result])
+    return str(getattr(result, "content", result) or "")
+
+
+async def measure(hours: float, requests: int, completion_tokens: int) -> dict[str, Any]:
+    """Analyse ``requests`` videos of ``hours`` each in this process and return its memory use."""
+    server = StandInLLMServer(latency=0.0, tokens_per_second=100_000, completion_tokens=completion_tokens)
+    server.start()
+    os.environ.update({
+        "OPENROUTER_API_KEY": "stand-in",
+        "OPENROUTER_BASE_URL": server.base_url,
+        "YOUTUBE_AGENT_CACHE_DIR": tempfile.mkdtemp(prefix="youtube-agent-memory-"),
+        "RESULT_CACHE_BACKEND": "off",
+        "STREAM_RESPONSES": "false",
+    })
+    os.environ.pop("MEM0_API_KEY", None)
+
+    # Imported late so the environment above is in place
+    agent_main = importlib.import_module("youtube_agent.main")
+    await agent_main._ensure_initialized()
+
+    # Load every code path on a short video first, so the baseline is the warm process
+    agent_main.transcript_cache.provider = FakeTranscriptProvider(latency=0.0, minutes=10)
+    await _analyze(agent_main, "warmup00000")
+    gc.collect()
+    baseline = _peak_rss_mb()
+
+    agent_main.transcript_cache.provider = FakeTranscriptProvider(latency=0.0, minutes=hours * 60)
+    for index in range(requests):
+        await _analyze(agent_main, f"long{index:07d}")
+    peak = _peak_rss_mb()
+    stats = agent_main.collect_stats()
+    await agent_main.cleanup()
+    server.stop()
+    return {
+        "hours": hours,
+        "requests": requests,
+        "baseline_rss_mb": baseline,
+        "peak_rss_mb": peak,
+        "request_rss_mb": round(peak - baseline, 1),
+        "llm_calls": server.requests,
+        "spill": stats.get("spill", {}),
+    }
+
+
+def run(hours: list[float], requests: int, completion_tokens: int, spill_chars: int | None) -> list[dict[str, Any]]:
+    """Measure every transcript length in its own interpreter, so peaks do not carry over."""
+    env = dict(os.environ)
+    if spill_chars is not None:
+        env["SPILL_TOOL_OUTPUT_CHARS"] = str(spill_chars)
+    results = []
+    for length in hours:
+        child = subprocess.run(  # noqa: S603
+            [
+                sys.executable,
+                __file__,
+                "--child",
+                "--hours",
+                str(length),
+                "--requests",
+                str(requests),
+                "--completion-tokens",
+                str(completion_tokens),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        )
+        results.append(json.loads(child.stdout.strip().splitlines()[-1]))
+    return results
+
+
+def main() -> None:
+    """Run the benchmark, print a table and exit 1 when memory is over budget."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 3, 10])
+    parser.add_argument("--requests", type=int, default=2, help="Long videos analysed per length")
+    parser.add_argument("--completion-tokens", type=int, default=120)
+    parser.add_argument("--ceiling-mb", type=float, default=512.0, help="Peak RSS budget (skill.yaml)")
+    parser.add_argument(
+        "--max-growth-mb", type=float, default=32.0, help="Fail when the longest request adds this much more"
+    )
+    parser.add_argument("--spill-chars", type=int, default=None, help="SPILL_TOOL_OUTPUT_CHARS; 0 disables")
+    parser.add_argument("--json", type=str, default=None, help="Write results to this JSON file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(measure(args.hours[0], args.requests, args.completion_tokens))))
+        return
+
+    results = run(args.hours, args.requests, args.completion_tokens, args.spill_chars)
+    print(f"{'hours':>6} {'baseline MB':>12} {'peak MB':>9} {'request MB':>11} {'LLM calls':>10} {'spilled':>8}")
+    for r in results:
+        print(
+            f"{r['hours']:>6g} {r['baseline_rss_mb']:>12.1f} {r['peak_rss_mb']:>9.1f} "
+            f"{r['request_rss_mb']:>11.1f} {r['llm_calls']:>10} {r['spill'].get('spilled', 0):>8}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    over = [r for r in results if r["peak_rss_mb"] > args.ceiling_mb]
+    growth = results[-1]["request_rss_mb"] - results[0]["request_rss_mb"]
+    for r in over:
+        print(f"❌ {r['hours']:g}h peaked at {r['peak_rss_mb']:.1f} MB, over the {args.ceiling_mb:.0f} MB budget")
+    if growth > args.max_growth_mb:
+        print(f"❌ {results[-1]['hours']:g}h requests need {growth:.1f} MB more than {results[0]['hours']:g}h ones")
+    if over or growth > args.max_growth_mb:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
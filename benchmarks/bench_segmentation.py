@@ -0,0 +1,100 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Benchmark local topic segmentation on long synthetic transcripts.
+
+Reports segmentation time, boundary recall/precision against the known topic
+changes, and the prompt size of the segmented tool output compared with the
+per-line timestamp dump the agent used to receive.
+
+    python benchmarks/bench_segmentation.py [--json results.json]
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from youtube_agent.segmentation import format_segments, segment_transcript
+from youtube_agent.standins import synthetic_transcript
+
+TOLERANCE_SECONDS = 30.0
+
+
+def _timestamp_dump(snippets) -> str:
+    """The old get_video_timestamps output: one "m:ss - text" line per caption."""
+    lines = []
+    for snippet in snippets:
+        minutes, seconds = divmod(int(snippet.start), 60)
+        lines.append(f"{minutes}:{seconds:02d} - {snippet.text}")
+    return "\n".join(lines)
+
+
+def _match(found: list[float], truth: list[float]) -> tuple[float, float]:
+    """Return (recall, precision) of boundaries within TOLERANCE_SECONDS."""
+    hits = sum(any(abs(f - t) <= TOLERANCE_SECONDS for f in found) for t in truth)
+    correct = sum(any(abs(f - t) <= TOLERANCE_SECONDS for t in truth) for f in found)
+    return hits / len(truth) if truth else 1.0, correct / len(found) if found else 1.0
+
+
+def run(durations: list[float], repeats: int) -> list[dict]:
+    """Benchmark every transcript duration (in minutes)."""
+    results = []
+    for minutes in durations:
+        snippets, truth = synthetic_transcript(minutes, seed=int(minutes))
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            segments = segment_transcript(snippets, max_segments=None)
+            timings.append(time.perf_counter() - started)
+
+        # Boundaries past the first are what segmentation has to find
+        recall, precision = _match([s.start for s in segments[1:]], truth[1:])
+        before = len(_timestamp_dump(snippets))
+        after = len(format_segments(segments))
+        results.append({
+            "minutes": minutes,
+            "snippets": len(snippets),
+            "segments": len(segments),
+            "true_segments": len(truth),
+            "median_ms": round(statistics.median(timings) * 1000, 2),
+            "recall": round(recall, 3),
+            "precision": round(precision, 3),
+            "prompt_tokens_before": before // 4,
+            "prompt_tokens_after": after // 4,
+            "prompt_reduction": round(1 - after / before, 3),
+        })
+    return results
+
+
+def main() -> None:
+    """Run the benchmark and print a table (and optionally write JSON)."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, nargs="+", default=[30, 60, 180, 600])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", type=str, default=None, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.minutes, args.repeats)
+    header = f"{'minutes':>8} {'snippets':>9} {'segments':>9} {'ms':>9} {'recall':>7} {'precision':>9} {'tokens':>15}"
+    print(header)
+    for r in results:
+        tokens = f"{r['prompt_tokens_before']}→{r['prompt_tokens_after']}"
+        print(
+            f"{r['minutes']:>8.0f} {r['snippets']:>9} {r['segments']:>4}/{r['true_segments']:<4} "
+            f"{r['median_ms']:>9.2f} {r['recall']:>7.2f} {r['precision']:>9.2f} {tokens:>15}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Benchmark how handler throughput scales with the number of worker processes.
+
+For each worker count, a WorkerSupervisor runs that many processes on one
+port, each serving the real ``handler`` (transcript fetch, segmentation,
+packing and the agno agent loop) over plain HTTP, against the local model
+stand-in and synthetic transcripts. Every request is for a different video,
+so each one does the CPU-bound transcript work. Results share one SQLite cache
+directory, as in ``--workers`` mode.
+
+    python benchmarks/bench_workers.py [--workers 1,2,4] [--requests 200] [--json results.json]
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import tempfile
+import time
+from typing import Any
+
+import httpx
+
+from youtube_agent.standins import FakeTranscriptProvider, StandInLLMServer
+from youtube_agent.stats import LatencySamples
+from youtube_agent.workers import WorkerSupervisor, serve_app
+
+
+def _serve_handler(sock: Any, index: int, ready: Any, transcript_minutes: float) -> None:
+    """Worker process: serve ``handler`` at POST / with the stand-ins configured by the parent."""
+    agent_main = importlib.import_module("youtube_agent.main")
+    asyncio.run(agent_main.warm_up())
+    agent_main.transcript_cache.provider = FakeTranscriptProvider(latency=0.0, minutes=transcript_minutes)
+    agent_main.agent.model.cache_response = False
+
+    async def app(scope: dict, receive: Any, send: Any) -> None:
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        result = await agent_main.handler(json.loads(body)["messages"])
+        content = str(getattr(result, "content", result) or "")
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+        await send({"type": "http.response.body", "body": content.encode()})
+
+    serve_app(app, sock, ready=ready, lifespan="off", log_level="warning", access_log=False)
+
+
+async def _drive(port: int, requests: int, concurrency: int, offset: int) -> tuple[float, LatencySamples, int]:
+    latencies = LatencySamples(maxlen=requests)
+    errors = 0
+    gate = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=120, limits=limits) as client:
+
+        async def one(index: int) -> None:
+            nonlocal errors
+            video = f"vid{offset + index:08d}"
+            messages = [{"role": "user", "content": f"Summarize https://www.youtube.com/watch?v={video}"}]
+            async with gate:
+                started = time.perf_counter()
+                try:
+                    response = await client.post("/", json={"messages": messages})
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    return
+                latencies.add(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        return time.perf_counter() - started, latencies, errors
+
+
+def measure(workers: int, args: argparse.Namespace, offset: int) -> dict[str, Any]:
+    """Serve with ``workers`` processes and return throughput and latency."""
+    supervisor = WorkerSupervisor(_serve_handler, "127.0.0.1", 0, workers, args=(args.transcript_minutes,))
+    supervisor.start()
+    try:
+        while not supervisor.ready():
+            time.sleep(0.1)
+        # Warm every worker's connections and first-call paths outside the measurement
+        asyncio.run(_drive(supervisor.port, workers * 4, workers * 4, offset))
+        elapsed, latencies, errors = asyncio.run(
+            _drive(supervisor.port, args.requests, args.concurrency, offset + workers * 4)
+        )
+    finally:
+        supervisor.stop()
+    return {
+        "workers": workers,
+        "requests_per_second": round(latencies.count / elapsed, 2) if elapsed else 0.0,
+        "latency_p50": round(latencies.percentile(0.50), 4),
+        "latency_p95": round(latencies.percentile(0.95), 4),
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    """Run the benchmark for each worker count and print the scaling table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    cores = os.cpu_count() or 1
+    default_workers = ",".join(str(n) for n in sorted({1, 2, 4, cores}) if n <= cores)
+    parser.add_argument("--workers", type=str, default=default_workers, help="Comma-separated worker counts")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--llm-latency", type=float, default=0.02, help="Stand-in model latency in seconds")
+    parser.add_argument("--transcript-minutes", type=float, default=30.0)
+    parser.add_argument("--json", type=str, default=None, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    with StandInLLMServer(latency=args.llm_latency, tokens_per_second=5000, completion_tokens=200) as server:
+        # Spawned workers inherit this environment
+        os.environ.update({
+            "OPENROUTER_API_KEY": "stand-in",
+            "OPENROUTER_BASE_URL": server.base_url,
+            "YOUTUBE_AGENT_CACHE_DIR": tempfile.mkdtemp(prefix="youtube-agent-workers-"),
+            "RESULT_CACHE_BACKEND": "off",
+            "MAX_CONCURRENT_RUNS": str(args.concurrency),
+            "MAX_QUEUE_DEPTH": str(max(args.requests, 64)),
+        })
+        os.environ.pop("MEM0_API_KEY", None)
+        os.environ.pop("STREAM_RESPONSES", None)
+
+        results = []
+        for index, workers in enumerate(int(n) for n in args.workers.split(",")):
+            results.append(measure(workers, args, offset=index * 1_000_000))
+
+    baseline = results[0]["requests_per_second"] or 1.0
+    print(f"{'workers':>8} {'req/s':>9} {'speedup':>8} {'p50 s':>8} {'p95 s':>8} {'errors':>7}   ({cores} cores)")
+    for row in results:
+        row["speedup"] = round(row["requests_per_second"] / baseline, 2)
+        print(
+            f"{row['workers']:>8} {row['requests_per_second']:>9.1f} {row['speedup']:>7.2f}x "
+            f"{row['latency_p50']:>8.3f} {row['latency_p95']:>8.3f} {row['errors']:>7}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"cpu_count": cores, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Load-test the agent handler offline against local OpenRouter and YouTube stand-ins.
+
+Drives ``handler`` with concurrent requests while a local OpenAI-compatible
+server plays the model (tunable latency and token rate) and a fake provider
+serves synthetic transcripts. Reports end-to-end p50/p95/p99, requests per
+second, peak RSS and a per-stage breakdown, and can save the results as JSON
+and compare them with a previous run.
+
+    python benchmarks/load_test.py [--requests 200] [--concurrency 16] [--json results.json]
+    python benchmarks/load_test.py --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+from youtube_agent.standins import FakeTranscriptProvider, StandInLLMServer
+from youtube_agent.stats import LatencySamples
+
+# Lower is better for every compared metric except throughput
+COMPARED = ("latency_p50", "latency_p95", "latency_p99", "requests_per_second", "peak_rss_mb")
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def _percentiles(samples: LatencySamples, prefix: str = "") -> dict[str, float]:
+    return {f"{prefix}p{round(q * 100)}": round(samples.percentile(q), 4) for q in (0.50, 0.95, 0.99)}
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def _consume(result: Any) -> tuple[str, float | None]:
+    """Drain a handler result; returns the text and, for streams, the time to the first chunk."""
+    if not hasattr(result, "__aiter__"):
+        return str(getattr(result, "content", result) or ""), None
+
+    started = time.perf_counter()
+    first = None
+    parts = []
+    async for chunk in result:
+        if first is None and chunk:
+            first = time.perf_counter() - started
+        if chunk:
+            parts.append(str(chunk))
+    return "".join(parts), first
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run one load test and return its results."""
+    server = StandInLLMServer(
+        latency=args.llm_latency,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+    )
+    server.start()
+    provider = FakeTranscriptProvider(latency=args.transcript_latency, minutes=args.transcript_minutes)
+
+    os.environ.update({
+        "OPENROUTER_API_KEY": "stand-in",
+        "OPENROUTER_BASE_URL": server.base_url,
+        "YOUTUBE_AGENT_CACHE_DIR": tempfile.mkdtemp(prefix="youtube-agent-load-"),
+        "RESULT_CACHE_BACKEND": "off",
+        "STREAM_RESPONSES": "true" if args.stream else "false",
+        "MAX_CONCURRENT_RUNS": str(args.max_runs),
+        "MAX_QUEUE_DEPTH": str(max(args.requests, 64)),
+    })
+    os.environ.pop("MEM0_API_KEY", None)
+
+    # Imported late so the environment above is in place; the package re-exports a main() function
+    agent_main = importlib.import_module("youtube_agent.main")
+
+    await agent_main._ensure_initialized()
+    agent_main.transcript_cache.provider = provider
+    # Every request should reach the stand-in model, not agno's on-disk response cache
+    agent_main.agent.model.cache_response = False
+
+    latencies = LatencySamples(maxlen=args.requests)
+    first_chunks = LatencySamples(maxlen=args.requests)
+    errors = 0
+    gate = asyncio.Semaphore(args.concurrency)
+
+    async def one(index: int) -> None:
+        nonlocal errors
+        video = f"vid{index % args.unique_videos:08d}"
+        messages = [{"role": "user", "content": f"Summarize https://www.youtube.com/watch?v={video}"}]
+        async with gate:
+            started = time.perf_counter()
+            try:
+                _, first = await _consume(await agent_main.handler(messages))
+            except Exception:
+                errors += 1
+                return
+            latencies.add(time.perf_counter() - started)
+            if first is not None:
+                first_chunks.add(first)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - started
+    stats = agent_main.collect_stats()
+    server.stop()
+
+    results: dict[str, Any] = {
+        "commit": _git_commit(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("json", "compare")},
+        "requests": args.requests,
+        "errors": errors,
+        "elapsed_seconds": round(elapsed, 3),
+        "requests_per_second": round(latencies.count / elapsed, 2) if elapsed else 0.0,
+        **_percentiles(latencies, "latency_"),
+        "peak_rss_mb": _peak_rss_mb(),
+        "stages": {
+            "transcript_fetch": {"count": provider.fetch_times.count, **_percentiles(provider.fetch_times)},
+            "llm_call": {"count": server.call_times.count, **_percentiles(server.call_times)},
+            "queue_wait": {key: value for key, value in stats["scheduler"].items() if key.startswith("queue_wait")},
+            "packing": stats["packing"],
+            "http_pool_wait": {key: value for key, value in stats["http_pool"].items() if key != "hosts"},
+        },
+        "llm_prompt_tokens": server.prompt_tokens,
+    }
+    if first_chunks.count:
+        results["stages"]["first_chunk"] = _percentiles(first_chunks)
+    return results
+
+
+def _compare(results: dict[str, Any], baseline: dict[str, Any]) -> None:
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    for key in COMPARED:
+        before, after = baseline.get(key), results.get(key)
+        if not before or after is None:
+            continue
+        change = (after - before) / before * 100
+        better = change > 0 if key == "requests_per_second" else change < 0
+        print(f"  {key:<22} {before:>10} → {after:<10} {change:+6.1f}% {'✅' if better or change == 0 else '⚠️'}")
+
+
+def main() -> None:
+    """Run the load test, print a summary and optionally write or compare JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--unique-videos", type=int, default=50, help="Distinct videos among the requests")
+    parser.add_argument("--max-runs", type=int, default=8, help="MAX_CONCURRENT_RUNS for the scheduler")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--completion-tokens", type=int, default=200)
+    parser.add_argument("--transcript-latency", type=float, default=0.05, help="Seconds per transcript fetch")
+    parser.add_argument("--transcript-minutes", type=float, default=20.0)
+    parser.add_argument("--stream", action="store_true", help="Use the token-streaming handler path")
+    parser.add_argument("--json", type=str, default=None, help="Write results to this JSON file")
+    parser.add_argument("--compare", type=str, default=None, help="Compare with a previous JSON result")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps({key: value for key, value in results.items() if key != "config"}, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            _compare(results, json.load(f))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+import pytest
+from agno.utils.http import aclose_default_clients
+
+
+@pytest.fixture(autouse=True)
+async def _close_agno_http_clients():
+    """Close agno's process-wide HTTP clients after each test.
+
+    Every async test runs on its own event loop, and a keep-alive connection
+    left from an earlier loop fails with "Event loop is closed" when a later
+    stand-in server happens to get the same port.
+    """
+    yield
+    await aclose_default_clients()
@@ -0,0 +1,127 @@
+import json
+
+from youtube_agent.backfill import parse_cues, parse_json_captions, run_backfill
+from youtube_agent.main import AGENT_INSTRUCTIONS, _analysis_instructions, main
+from youtube_agent.standins import StandInLLMServer, synthetic_transcript
+
+VTT = """\
+WEBVTT
+Kind: captions
+
+NOTE produced by hand
+
+00:00.000 --> 00:02.500 align:start
+<c>welcome</c> to the lecture
+
+00:02.500 --> 00:05.000
+on neural &amp; networks
+"""
+
+SRT = """\
+1
+00:00:00,000 --> 00:00:02,500
+welcome to the lecture
+
+2
+00:00:02,500 --> 00:00:05,000
+on neural & networks
+"""
+
+
+def _write_captions(root, count):
+    for i in range(count):
+        snippets, _ = synthetic_transcript(10, seed=i)
+        path = root / ("talks" if i % 2 else "") / f"video{i}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps([{"text": s.text, "start": s.start, "duration": s.duration} for s in snippets]))
+
+
+def test_tool_less_agent_is_not_told_to_call_tools():
+    """Test that the backfill agent's instructions point at the prompt's segments instead of tools."""
+    offline = _analysis_instructions([])
+
+    assert "get_video_segments" in AGENT_INSTRUCTIONS
+    assert "get_video_segments" not in offline
+    assert "search_video_transcript" not in offline
+    assert "given segment boundaries" in offline
+    assert _analysis_instructions([object()]) == AGENT_INSTRUCTIONS
+
+
+def test_vtt_srt_and_json_captions_parse_the_same():
+    """Test that VTT and SRT cues (with headers, cue numbers and tags) and JSON snippets give equal captions."""
+    whisper = (
+        '{"segments": [{"text": "welcome to the lecture", "start": 0, "end": 2.5},'
+        ' {"text": "on neural & networks", "start": 2.5, "end": 5}]}'
+    )
+
+    assert parse_cues(VTT) == parse_cues(SRT) == parse_json_captions(whisper)
+    assert [(s.text, s.start, s.duration) for s in parse_cues(SRT)] == [
+        ("welcome to the lecture", 0.0, 2.5),
+        ("on neural & networks", 2.5, 2.5),
+    ]
+
+
+async def test_backfill_writes_jsonl_and_resumes(tmp_path):
+    """Test that every file gets one result line, and a rerun only retries the documents that failed."""
+    _write_captions(tmp_path / "in", 5)
+    (tmp_path / "in" / "broken.srt").write_text("no cues here")
+    output = tmp_path / "out.jsonl"
+    analyzed = []
+
+    async def analyze(document):
+        analyzed.append(document.doc_id)
+        if document.doc_id == "video2.json" and analyzed.count("video2.json") == 1:
+            error_msg = "model unavailable"
+            raise RuntimeError(error_msg)
+        assert "[Segment 1] 00:00:00" in document.prompt
+        return f"summary of {document.doc_id}"
+
+    first = await run_backfill(tmp_path / "in", output, analyze, processes=2, concurrency=2)
+    second = await run_backfill(tmp_path / "in", output, analyze, processes=2, concurrency=2)
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert (first.succeeded, first.failed, first.skipped) == (4, 2, 0)
+    assert (second.succeeded, second.failed, second.skipped) == (1, 1, 4)
+    assert analyzed.count("video2.json") == 2
+    assert {r["id"] for r in records if r["status"] == "ok"} == {
+        "video0.json",
+        "talks/video1.json",
+        "video2.json",
+        "talks/video3.json",
+        "video4.json",
+    }
+    errors = {r["id"]: r["error"] for r in records if r["status"] == "error"}
+    assert errors == {"broken.srt": "No captions found in broken.srt", "video2.json": "model unavailable"}
+    assert first.docs_per_second > 0
+
+
+def test_batch_command_runs_against_an_openai_compatible_endpoint(tmp_path, monkeypatch, capsys):
+    """Test that `python -m youtube_agent batch` analyses caption files with the stand-in model."""
+    for name in ("OPENROUTER_BASE_URL", "OPENROUTER_API_KEY", "MODEL_NAME"):
+        monkeypatch.delenv(name, raising=False)
+    _write_captions(tmp_path / "in", 3)
+    output = tmp_path / "out.jsonl"
+
+    with StandInLLMServer(latency=0.0, tokens_per_second=100_000, completion_tokens=30) as server:
+        main([
+            "batch",
+            str(tmp_path / "in"),
+            "--output",
+            str(output),
+            "--base-url",
+            server.base_url,
+            "--api-key",
+            "stand-in",
+            "--model",
+            "stand-in",
+            "--processes",
+            "1",
+        ])
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    report = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert [r["status"] for r in records] == ["ok"] * 3
+    assert all(len(r["content"].split()) == 30 for r in records)
+    assert server.requests == 3
+    assert report["succeeded"] == 3
+    assert report["docs_per_second"] > 0
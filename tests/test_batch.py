@@ -0,0 +1,121 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from youtube_agent.batch import (
+    BatchRequest,
+    extract_playlist_id,
+    parse_batch_request,
+    parse_playlist_page,
+    run_batch,
+)
+from youtube_agent.cache import TieredCache
+from youtube_agent.main import handler
+from youtube_agent.results import AnalysisRequest, ResultCache, create_result_backend
+from youtube_agent.streaming import StreamedResult
+from youtube_agent.transcripts import TranscriptCache, TranscriptSnippet
+
+VIDEOS = ["aaaaaaaaaaa", "bbbbbbbbbbb", "ccccccccccc"]
+PLAYLIST_ID = "PLx0sYbCqOb8TBPRdmBHs5Iftvv9TPboYG"
+
+
+def _user(content):
+    return [{"role": "user", "content": content}]
+
+
+def test_parse_batch_request():
+    """Test that JSON batch messages are recognised and normalised."""
+    request = parse_batch_request(
+        _user(json.dumps({"videos": [f"https://youtu.be/{VIDEOS[0]}", VIDEOS[0], VIDEOS[1]], "intent": "chapters"}))
+    )
+    assert request == BatchRequest((f"https://youtu.be/{VIDEOS[0]}", VIDEOS[0], VIDEOS[1]), "chapters")
+
+    request = parse_batch_request(_user(json.dumps({"playlist": f"https://youtube.com/playlist?list={PLAYLIST_ID}"})))
+    assert request == BatchRequest((), "summary", PLAYLIST_ID)
+
+    assert parse_batch_request(_user(json.dumps({"videos": VIDEOS, "prompt": "make a study guide"}))).intent == (
+        "study_guide"
+    )
+    assert parse_batch_request(_user("Summarize https://youtu.be/aaaaaaaaaaa")) is None
+    assert parse_batch_request(_user('{"question": "hi"}')) is None
+    with pytest.raises(ValueError, match="playlist"):
+        parse_batch_request(_user('{"playlist": "not a playlist"}'))
+
+
+def test_extract_playlist_id_and_page():
+    """Test playlist URL parsing and video extraction from a playlist page."""
+    assert extract_playlist_id(PLAYLIST_ID) == PLAYLIST_ID
+    assert extract_playlist_id(f"https://www.youtube.com/watch?v={VIDEOS[0]}&list={PLAYLIST_ID}") == PLAYLIST_ID
+    assert extract_playlist_id("https://www.youtube.com/watch?v=aaaaaaaaaaa") is None
+
+    html = "".join(f'"playlistVideoRenderer":{{"videoId":"{video}","title":"x"}}' for video in [*VIDEOS, VIDEOS[0]])
+    assert parse_playlist_page(html + '"videoId":"ddddddddddd"') == VIDEOS
+
+
+@pytest.mark.asyncio
+async def test_run_batch_is_bounded_and_isolates_failures():
+    """Test the analysis pool limit, prefetching and per-item error reporting."""
+    running = 0
+    peak = 0
+    prefetched: list[str] = []
+
+    async def prefetch(video):
+        prefetched.append(video)
+
+    async def analyze(video):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if video == "bad":
+            error_msg = "no transcript"
+            raise RuntimeError(error_msg)
+        return f"summary of {video}"
+
+    videos = [f"v{i}" for i in range(9)] + ["bad"]
+    items = [item async for item in run_batch(videos, analyze, prefetch=prefetch, max_concurrency=3)]
+
+    assert peak == 3
+    assert sorted(prefetched) == sorted(videos)
+    assert {item.video for item in items} == set(videos)
+    failed = [item for item in items if item.status == "error"]
+    assert [item.error for item in failed] == ["no transcript"]
+    assert all({"fetch", "queued", "analysis", "total"} <= item.timings.keys() for item in items if item.status == "ok")
+
+
+@pytest.mark.asyncio
+async def test_handler_streams_batch_results():
+    """Test that a batch streams one progress line per video and ends with the full report."""
+    store = TieredCache(None)
+    provider = MagicMock()
+    provider.fetch.return_value = [TranscriptSnippet("hello", 0.0, 1.0)]
+    result_cache = ResultCache(create_result_backend("memory", None), model_name="m", prompt_version="v1")
+    result_cache.set(AnalysisRequest(VIDEOS[0], "summary"), "cached summary")
+
+    async def fake_run(messages):
+        return MagicMock(content=f"fresh: {messages[-1]['content']}", status=None)
+
+    with (
+        patch("youtube_agent.main._initialized", True),
+        patch("youtube_agent.main.transcript_cache", TranscriptCache(provider, store)),
+        patch("youtube_agent.main.result_cache", result_cache),
+        patch("youtube_agent.main.scheduler", None),
+        patch("youtube_agent.main.run_agent", new_callable=AsyncMock, side_effect=fake_run),
+    ):
+        stream = await handler(_user(json.dumps({"videos": [*VIDEOS, "not a video!"]})))
+        chunks = [chunk async for chunk in stream]
+
+    events = [json.loads(chunk) for chunk in chunks[:-1]]
+    assert [event["progress"]["done"] for event in events] == [1, 2, 3, 4]
+    assert events[-1]["progress"]["failed"] == 1
+
+    assert isinstance(chunks[-1], StreamedResult)
+    report = json.loads(chunks[-1].content)
+    assert [item["video"] for item in report["items"]] == [*VIDEOS, "not a video!"]
+    assert report["items"][0]["content"] == "cached summary"
+    assert report["items"][1]["content"].startswith("fresh: Summarize this video")
+    assert report["items"][3]["status"] == "error"
+    assert provider.fetch.call_count == 3
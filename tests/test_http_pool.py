@@ -0,0 +1,85 @@
+import asyncio
+from unittest.mock import patch
+
+from requests import Session
+
+from youtube_agent.http_pool import HttpPool, PoolConfig
+from youtube_agent.main import cleanup, collect_stats
+from youtube_agent.standins import StandInLLMServer
+
+BODY = {"model": "m", "messages": [{"role": "user", "content": "hi"}]}
+
+
+async def test_per_host_limit_queues_and_reports_saturation():
+    """Test that requests over the per-host limit wait for a slot and are counted as saturated."""
+    pool = HttpPool(PoolConfig(max_connections_per_host=2))
+    with StandInLLMServer(latency=0.1, tokens_per_second=10_000, completion_tokens=1) as server:
+        client = pool.async_client()
+        responses = await asyncio.gather(
+            *(client.post(f"{server.base_url}/chat/completions", json=BODY) for _ in range(5))
+        )
+        await pool.aclose()
+
+    stats = pool.stats()
+    assert all(response.status_code == 200 for response in responses)
+    assert stats["hosts"]["127.0.0.1"]["peak_in_flight"] == 2
+    assert stats["requests"] == 5
+    assert stats["saturated"] >= 3
+    assert stats["wait_p95"] > 0.05
+    assert stats["in_flight"] == stats["waiting"] == 0
+
+
+async def test_streamed_response_holds_its_slot_until_closed():
+    """Test that a streamed response counts as in flight until its body is closed."""
+    pool = HttpPool()
+    with StandInLLMServer(latency=0.0, tokens_per_second=10_000, completion_tokens=3) as server:
+        client = pool.async_client()
+        async with client.stream("POST", f"{server.base_url}/chat/completions", json={**BODY, "stream": True}) as r:
+            assert pool.stats()["in_flight"] == 1
+            await r.aread()
+        assert pool.stats()["in_flight"] == 0
+        await pool.aclose()
+
+    assert client.is_closed
+
+
+def test_sync_clients_and_requests_adapter_share_the_pool_stats():
+    """Test that the httpx sync client and the requests adapter report to the same pool."""
+    pool = HttpPool()
+    with StandInLLMServer(latency=0.0, tokens_per_second=10_000, completion_tokens=1) as server:
+        client = pool.sync_client(base_url=server.base_url)
+        session = Session()
+        session.mount("http://", pool.requests_adapter())
+
+        assert client.post("/chat/completions", json=BODY).status_code == 200
+        assert session.post(f"{server.base_url}/chat/completions", json=BODY).status_code == 200
+        asyncio.run(pool.aclose())
+
+    assert pool.stats()["hosts"]["127.0.0.1"]["requests"] == 2
+    assert pool.stats()["in_flight"] == 0
+    assert client.is_closed
+
+
+def test_pool_config_from_env(monkeypatch):
+    """Test that the pool limits and timeouts are read from the environment."""
+    monkeypatch.setenv("HTTP_MAX_CONNECTIONS_PER_HOST", "5")
+    monkeypatch.setenv("HTTP_READ_TIMEOUT", "30")
+    monkeypatch.setenv("HTTP2", "off")
+
+    config = PoolConfig.from_env()
+
+    assert config.max_connections_per_host == 5
+    assert config.read_timeout == 30.0
+    assert config.http2 is False
+    assert config.max_connections == PoolConfig().max_connections
+
+
+async def test_cleanup_closes_the_shared_pool():
+    """Test that cleanup() closes the process-wide pool and collect_stats() reports it."""
+    pool = HttpPool()
+    client = pool.async_client()
+    with patch("youtube_agent.main._http_pool", pool):
+        assert collect_stats()["http_pool"]["requests"] == 0
+        await cleanup()
+
+    assert client.is_closed
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+# Generous enough for slow CI machines; eager agno/bindu/mem0 imports take seconds
+IMPORT_BUDGET_SECONDS = 1.5
+
+
+def _run(code: str, **env: str) -> subprocess.CompletedProcess:
+    return subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "MEM0_API_KEY": "", **env},
+    )
+
+
+def test_package_import_is_lazy_and_fast():
+    """Test that importing the package loads no agno, bindu or mem0 and stays within the budget."""
+    result = _run("import sys, youtube_agent; print(sorted({m.split('.')[0] for m in sys.modules}))")
+
+    loaded = result.stdout
+    for heavy in ("agno", "bindu", "mem0", "openai", "sqlalchemy"):
+        assert f"'{heavy}'" not in loaded
+
+    total = next(
+        int(line.split("|")[1]) / 1e6
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and line.rstrip().endswith("| youtube_agent")
+    )
+    assert total < IMPORT_BUDGET_SECONDS
+
+
+def test_tools_without_mem0_key_never_import_mem0(tmp_path):
+    """Test that setting up the agent's tools without MEM0_API_KEY leaves the Mem0 stack unloaded."""
+    result = _run(
+        "import sys; from youtube_agent.main import _setup_tools; "
+        "tools = _setup_tools(None); print(len(tools), 'mem0' in sys.modules, 'agno' in sys.modules)",
+        YOUTUBE_AGENT_CACHE_DIR=str(tmp_path),
+    )
+
+    assert result.stdout.split()[-3:] == ["1", "False", "True"]
@@ -219,3 +219,57 @@ async def test_handler_with_tutorial_analysis_query():
     assert result is not None
     assert result.run_id == "tutorial-run-id"
     assert result.content == "Tutorial analysis completed."
+
+
+@pytest.mark.asyncio
+async def test_handler_fast_path_skips_lock_after_initialization():
+    """Test that an initialized agent serves requests without taking the init lock."""
+    messages = [{"role": "user", "content": "Test"}]
+
+    mock_lock = MagicMock()
+    mock_lock.__aenter__ = AsyncMock(side_effect=AssertionError("lock taken on the fast path"))
+    mock_lock.__aexit__ = AsyncMock(return_value=None)
+
+    with (
+        patch("youtube_agent.main._initialized", True),
+        patch("youtube_agent.main._init_lock", mock_lock),
+        patch("youtube_agent.main.run_agent", new_callable=AsyncMock, return_value=MagicMock()) as mock_run,
+    ):
+        await handler(messages)
+
+    mock_run.assert_awaited_once_with(messages)
+    mock_lock.__aenter__.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_initializes_before_first_request():
+    """Test that warm-up builds the agent so the first request is already warm."""
+    from youtube_agent.main import warm_up
+
+    with (
+        patch("youtube_agent.main._initialized", False),
+        patch("youtube_agent.main.initialize_agent", new_callable=AsyncMock) as mock_init,
+        patch("youtube_agent.main.run_agent", new_callable=AsyncMock, return_value=MagicMock()),
+    ):
+        await warm_up()
+        await handler([{"role": "user", "content": "Test"}])
+
+    mock_init.assert_awaited_once()
+
+
+def test_is_ready_requires_warm_agent_and_listening_server():
+    """Test the readiness signal used by load balancers."""
+    from youtube_agent.main import is_ready
+
+    with (
+        patch("youtube_agent.main._initialized", False),
+        patch("youtube_agent.main.port_accepts_connections", return_value=True),
+    ):
+        assert not is_ready("127.0.0.1", 3773)
+        assert is_ready("127.0.0.1", 3773, warmup=False)
+
+    with (
+        patch("youtube_agent.main._initialized", True),
+        patch("youtube_agent.main.port_accepts_connections", return_value=False),
+    ):
+        assert not is_ready("127.0.0.1", 3773)
@@ -0,0 +1,135 @@
+import json
+import threading
+import time
+from unittest.mock import patch
+
+from youtube_agent.main import cleanup, collect_stats
+from youtube_agent.memory import CachedMem0Tools, RecallCache, WriteBehindQueue, create_mem0_backend
+from youtube_agent.standins import FakeMemoryBackend
+
+
+def test_writes_are_queued_and_batched():
+    """Test that add_memory returns before the backend is called and queued writes share one request."""
+    backend = FakeMemoryBackend(latency=0.2)
+    tools = CachedMem0Tools(backend, user_id="ada", flush_interval=5.0)
+
+    started = time.perf_counter()
+    for fact in ("Ada is learning Rust", "Ada watched the borrow checker talk", "Ada prefers short summaries"):
+        assert json.loads(tools.add_memory(None, fact))["status"] == "queued"
+    assert time.perf_counter() - started < 0.1
+
+    assert tools.flush(timeout=5)
+    assert backend.calls == {"add": 1}
+    assert len(backend.memories["ada"]) == 3
+    assert tools.stats()["writes"] == {"pending": 0, "written": 3, "batches": 1, "failed": 0, "dropped": 0}
+    tools.close()
+
+
+def test_recent_memories_are_recalled_locally():
+    """Test that a search about a just-written or already-searched fact does not reach the backend."""
+    backend = FakeMemoryBackend()
+    backend.memories["ada"] = [{"id": "1", "memory": "Ada analyzed a video about sourdough bread baking"}]
+    tools = CachedMem0Tools(backend, user_id="ada")
+
+    tools.add_memory(None, "Ada wants the Rust ownership video summarized with timestamps")
+    recalled = json.loads(tools.search_memory(None, "rust ownership video"))
+    remote = json.loads(tools.search_memory(None, "Sourdough   bread"))
+    repeated = json.loads(tools.search_memory(None, "sourdough bread"))
+
+    assert recalled[0]["pending"] is True
+    assert remote == repeated
+    assert backend.calls["search"] == 1
+    assert tools.stats()["recall"]["vector_hits"] == 1
+    assert tools.stats()["recall"]["query_hits"] == 1
+    tools.close()
+
+
+def test_vector_recall_needs_a_close_match():
+    """Test that an unrelated query falls through to Mem0."""
+    recall = RecallCache(min_score=0.5)
+    recall.remember("ada", [{"memory": "Ada likes guitar chord tutorials"}])
+
+    assert recall.lookup("ada", "guitar chord tutorials") is not None
+    assert recall.lookup("ada", "planet orbit telescope") is None
+    assert recall.lookup("grace", "guitar chord tutorials") is None
+
+
+def test_delete_all_drops_queued_writes_and_cached_recall():
+    """Test that deleting a user's memories also discards their queued writes and cached searches."""
+    backend = FakeMemoryBackend()
+    tools = CachedMem0Tools(backend, user_id="ada", flush_interval=5.0)
+    tools.add_memory(None, "Ada likes guitar chord tutorials")
+
+    tools.delete_all_memories(None)
+    tools.flush(timeout=5)
+
+    assert "add" not in backend.calls
+    assert tools.recall.lookup("ada", "guitar chord tutorials") is None
+    tools.close()
+
+
+def test_delete_all_waits_for_a_write_already_being_sent():
+    """Test that a write sent while the user deletes their memories does not bring one back."""
+    sending, release = threading.Event(), threading.Event()
+
+    class SlowAdds(FakeMemoryBackend):
+        def add(self, messages, **kwargs):
+            sending.set()
+            release.wait(5)
+            return super().add(messages, **kwargs)
+
+    backend = SlowAdds()
+    tools = CachedMem0Tools(backend, user_id="ada", flush_interval=0.0)
+    tools.add_memory(None, "Ada likes guitar chord tutorials")
+    assert sending.wait(5)
+
+    threading.Timer(0.2, release.set).start()
+    tools.delete_all_memories(None)
+    tools.flush(timeout=5)
+
+    assert "ada" not in backend.memories
+    tools.close()
+
+
+def test_mem0_backend_uses_the_org_and_project_from_the_environment(monkeypatch):
+    """Test that MEM0_ORG_ID and MEM0_PROJECT_ID reach the Mem0 client."""
+    monkeypatch.setenv("MEM0_ORG_ID", "org-1")
+    monkeypatch.setenv("MEM0_PROJECT_ID", "project-1")
+
+    with patch("mem0.client.main.MemoryClient") as client:
+        create_mem0_backend("key")
+
+    client.assert_called_once_with(api_key="key", org_id="org-1", project_id="project-1", client=None)
+
+
+def test_failed_writes_are_counted_not_raised():
+    """Test that a failing backend write is reported in the stats and does not stop the queue."""
+    attempts = []
+
+    def write(user_id, messages, infer):
+        attempts.append(user_id)
+        if user_id == "bad":
+            raise ConnectionError
+
+    queue = WriteBehindQueue(write, flush_interval=0.0)
+    queue.put("bad", [{"role": "user", "content": "x"}])
+    queue.flush(timeout=5)
+    queue.put("good", [{"role": "user", "content": "y"}])
+
+    assert queue.close(timeout=5)
+    assert attempts == ["bad", "good"]
+    assert queue.stats()["failed"] == 1
+    assert not queue.put("late", [{"role": "user", "content": "z"}])
+
+
+async def test_cleanup_flushes_queued_memory_writes():
+    """Test that cleanup() sends queued writes before the process exits."""
+    backend = FakeMemoryBackend()
+    tools = CachedMem0Tools(backend, user_id="ada", flush_interval=60.0)
+    tools.add_memory(None, "Ada finished the Rust course")
+
+    with patch("youtube_agent.main._memory_tools", tools):
+        assert collect_stats()["memory"]["writes"]["pending"] == 1
+        await cleanup()
+
+    assert backend.memories["ada"][0]["memory"] == "Ada finished the Rust course"
@@ -0,0 +1,168 @@
+import socket
+import threading
+import time
+import urllib.request
+
+import pytest
+from agno.agent import Agent
+
+from youtube_agent.cache import TieredCache
+from youtube_agent.main import AGENT_DESCRIPTION, _create_analysis_agent, _start_status_server, _volatile_context
+from youtube_agent.metrics import Histogram, MetricsRegistry, new_request_id
+from youtube_agent.models import InstrumentedOpenRouter
+from youtube_agent.standins import FakeTranscriptProvider, StandInLLMServer
+from youtube_agent.stats import LatencySamples
+from youtube_agent.tools import CachedYouTubeTools
+from youtube_agent.transcripts import TranscriptCache
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test the Prometheus histogram exposition, including label escaping."""
+    histogram = Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage='say "hi"')
+    histogram.observe(0.5, stage='say "hi"')
+    histogram.observe(5.0, stage='say "hi"')
+
+    lines = histogram.render()
+
+    assert 'latency_seconds_bucket{stage="say \\"hi\\"",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{stage="say \\"hi\\"",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{stage="say \\"hi\\"",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{stage="say \\"hi\\""} 3' in lines
+    assert histogram.count(stage='say "hi"') == 3
+
+
+def test_spans_nest_and_carry_the_request_id():
+    """Test that spans record parents, the request ID and errors."""
+    metrics = MetricsRegistry()
+    request = new_request_id()
+
+    with metrics.span("request"), pytest.raises(ValueError), metrics.span("tool", tool="captions"):
+        raise ValueError
+
+    tool, outer = metrics.recent_spans(request)
+    assert tool["parent_id"] == outer["span_id"]
+    assert tool["error"] == "ValueError"
+    assert tool["tool"] == "captions"
+    assert outer["parent_id"] is None
+    assert metrics.stage_errors.value(stage="tool", error="ValueError") == 1
+    assert metrics.stage_seconds.count(stage="request") == 1
+
+
+def test_render_includes_stats_gauges():
+    """Test that nested numeric stats are exported as gauges and other values are skipped."""
+    text = MetricsRegistry().render({"result_cache": {"hits": 3, "misses": 1}, "enabled": True, "name": "x"})
+
+    assert "youtube_agent_result_cache_hits 3\n" in text
+    assert "youtube_agent_result_cache_misses 1\n" in text
+    assert "enabled" not in text
+    assert "# TYPE youtube_agent_stage_duration_seconds histogram" in text
+
+
+def test_stats_can_be_read_from_another_thread_while_recording():
+    """Test that the status thread can render spans and latency windows while they are being appended to."""
+    metrics = MetricsRegistry(max_spans=64)
+    samples = LatencySamples(maxlen=64)
+    errors: list[BaseException] = []
+    stop = threading.Event()
+
+    def read():
+        try:
+            while not stop.is_set():
+                metrics.render({"latency": samples.summary("wait")})
+                metrics.prompt_cache(request="missing")
+        except BaseException as e:
+            errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for index in range(20_000):
+        metrics.record_span("stage", 0.001, request_kind=index)
+        samples.add(index / 1000)
+    stop.set()
+    reader.join()
+
+    assert errors == []
+
+
+def test_span_overhead_is_small():
+    """Test that a span costs well under a millisecond, so metrics can stay on in production."""
+    metrics = MetricsRegistry()
+    started = time.perf_counter()
+    for _ in range(2000):
+        with metrics.span("stage"):
+            pass
+    assert (time.perf_counter() - started) / 2000 < 0.0005
+
+
+async def test_model_and_tool_calls_are_instrumented():
+    """Test that model calls and tool calls against the stand-ins are timed and counted."""
+    metrics = MetricsRegistry()
+    provider = FakeTranscriptProvider(latency=0.0, minutes=5)
+    tools = CachedYouTubeTools(TranscriptCache(provider, TieredCache(None)), enable_get_video_timestamps=False)
+
+    with StandInLLMServer(latency=0.0, tokens_per_second=10_000, completion_tokens=7) as server:
+        model = InstrumentedOpenRouter(id="stand-in", api_key="stand-in", base_url=server.base_url, metrics=metrics)
+        agent = Agent(model=model, tools=[tools], tool_hooks=[metrics.tool_hook])
+        request = new_request_id()
+        with metrics.span("agent_run"):
+            await agent.arun("Summarize https://www.youtube.com/watch?v=zjkBMFhNj_g")
+
+    spans = metrics.recent_spans(request)
+    run = spans[-1]
+    assert [span["name"] for span in spans] == ["model", "tool", "model", "agent_run"]
+    assert all(span["parent_id"] == run["span_id"] for span in spans[:-1])
+    assert spans[1]["tool"] == "get_video_segments"
+    assert metrics.model_seconds.count(model="stand-in") == 2
+    assert metrics.tokens.value(model="stand-in", kind="output") == 7
+    assert metrics.tokens.value(model="stand-in", kind="input") > 0
+
+
+def test_status_server_serves_metrics():
+    """Test that the status side-car exposes /metrics in the Prometheus text format."""
+    server = _start_status_server({"deployment": {"url": "http://127.0.0.1:1"}}, _free_port(), warmup=False)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=2) as response:
+            body = response.read().decode()
+            content_type = response.headers["Content-Type"]
+    finally:
+        server.stop()
+
+    assert content_type.startswith("text/plain; version=0.0.4")
+    assert "youtube_agent_coalescing_leaders" in body
+
+
+async def test_system_prompt_is_a_stable_cacheable_prefix():
+    """Test that the analysis prompt is byte-identical across requests and reported as cached by the stand-in."""
+    metrics = MetricsRegistry()
+    provider = FakeTranscriptProvider(latency=0.0, minutes=5)
+    tools = CachedYouTubeTools(TranscriptCache(provider, TieredCache(None)), enable_get_video_timestamps=False)
+
+    with StandInLLMServer(latency=0.0, tokens_per_second=10_000, completion_tokens=7) as server:
+        model = InstrumentedOpenRouter(
+            id="stand-in",
+            api_key="stand-in",
+            base_url=server.base_url,
+            metrics=metrics,
+            volatile_context=_volatile_context,
+        )
+        agent = _create_analysis_agent(model, [tools])
+        requests = []
+        for video in ("zjkBMFhNj_g", "aaaaaaaaaaa"):
+            requests.append(new_request_id())
+            await agent.arun([{"role": "user", "content": f"Summarize https://www.youtube.com/watch?v={video}"}])
+
+    system_prompt = server.system_prompts[0]
+    assert len(set(server.system_prompts)) == 1
+    assert system_prompt.startswith(AGENT_DESCRIPTION)
+    assert system_prompt.endswith(_volatile_context())
+    first, second = (metrics.prompt_cache(request) for request in requests)
+    assert second["cached_tokens"] >= len(system_prompt) // 4
+    assert second["uncached_tokens"] < first["uncached_tokens"]
+    assert metrics.prompt_cache()["cached_tokens"] == server.cached_tokens
@@ -0,0 +1,102 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from youtube_agent.cache import TieredCache
+from youtube_agent.packing import (
+    approximate_tokens,
+    clean_caption,
+    clean_transcript,
+    get_token_counter,
+    pack_transcript,
+)
+from youtube_agent.tools import CachedYouTubeTools
+from youtube_agent.transcripts import CompactTranscript, TranscriptCache, TranscriptSnippet
+
+ROLLING = [
+    ("so today we are", 0.0),
+    ("today we are going to um talk", 1.5),
+    ("going to talk about caching", 3.0),
+    ("going to talk about caching", 4.5),
+    ("[Music]", 6.0),
+    ("caching is is hard", 25.0),
+]
+
+
+def _transcript(rows=ROLLING):
+    return CompactTranscript.from_lines([text for text, _ in rows], [start for _, start in rows], [1.5] * len(rows))
+
+
+def test_compact_transcript_round_trip():
+    """Test that the columnar cache payload (and the old row format) decode to the same transcript."""
+    snippets = [TranscriptSnippet("hello\nthere", 0.0, 2.0), TranscriptSnippet("", 2.0, 1.0)]
+    transcript = CompactTranscript.from_snippets(snippets)
+
+    assert transcript.lines() == ["hello there", ""]
+    assert transcript.line(0) == "hello there"
+    assert transcript.ends.tolist() == [2.0, 3.0]
+    assert CompactTranscript.from_payload(transcript.to_payload()).snippets() == transcript.snippets()
+    assert CompactTranscript.from_payload([["hello there", 0.0, 2.0]]).lines() == ["hello there"]
+    assert isinstance(transcript.starts, np.ndarray)
+
+
+def test_clean_caption_and_overlaps():
+    """Test that filler, stutters, sound tags and rolling caption overlaps are removed."""
+    assert clean_caption("um so uh the the [Applause] answer") == "so the answer"
+
+    cleaned = clean_transcript(_transcript())
+
+    assert cleaned.lines() == ["so today we are", "going to talk", "about caching", "caching is hard"]
+    assert cleaned.starts.tolist() == [0.0, 1.5, 3.0, 25.0]
+
+
+def test_token_counter_falls_back_when_the_encoding_cannot_be_downloaded():
+    """Test that a tiktoken install without network access falls back to the length estimate."""
+    tiktoken = MagicMock()
+    tiktoken.encoding_name_for_model.side_effect = KeyError("openrouter-model")
+    tiktoken.get_encoding.side_effect = ConnectionError("no route to host")
+
+    with patch.dict("sys.modules", {"tiktoken": tiktoken}):
+        count = get_token_counter("openrouter/openrouter-model")
+
+    assert count is approximate_tokens
+    tiktoken.get_encoding.assert_called_once_with("o200k_base")
+
+
+def test_pack_transcript_merges_and_reports_savings():
+    """Test merging into timestamped lines and the tokens-saved accounting."""
+    packed = pack_transcript(_transcript(), merge_seconds=20.0)
+
+    assert packed.text == "[00:00:00] so today we are going to talk about caching\n[00:00:25] caching is hard"
+    assert packed.lines == 2
+    assert packed.tokens_saved == packed.tokens_before - packed.tokens_after > 0
+    assert not packed.truncated
+
+
+def test_pack_transcript_fits_budget():
+    """Test that a long transcript is shortened evenly to fit the token budget."""
+    rows = [(f"line {i} " + "lorem ipsum dolor sit amet consectetur " * 3, i * 5.0) for i in range(600)]
+    packed = pack_transcript(_transcript(rows), max_tokens=2000)
+
+    assert packed.truncated
+    assert packed.tokens_after <= 2000
+    assert packed.text.startswith("[00:00:00] line 0")
+    assert "[00:49:40] line 596" in packed.text  # the end of the video is still covered
+
+
+def test_tools_report_packing():
+    """Test that the captions tool reports tokens saved for each call."""
+    provider = MagicMock()
+    provider.fetch.return_value = _transcript().snippets()
+    reports = []
+    tools = CachedYouTubeTools(
+        TranscriptCache(provider, TieredCache(None)),
+        count_tokens=approximate_tokens,
+        on_pack=lambda url, packed: reports.append((url, packed)),
+    )
+
+    text = tools.get_youtube_video_captions("https://youtu.be/zjkBMFhNj_g")
+
+    assert text.startswith("[00:00:00] so today")
+    assert [url for url, _ in reports] == ["https://youtu.be/zjkBMFhNj_g"]
+    assert reports[0][1].text == text
@@ -0,0 +1,173 @@
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+from agno.agent import Agent
+from agno.exceptions import ModelProviderError
+
+from youtube_agent.models import InstrumentedOpenRouter
+from youtube_agent.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Hedger,
+    RetryPolicy,
+    Upstream,
+    is_transient,
+)
+from youtube_agent.standins import StandInLLMServer
+
+
+def _agent(server: StandInLLMServer, upstream: Upstream) -> Agent:
+    model = InstrumentedOpenRouter(
+        id="stand-in", api_key="stand-in", base_url=server.base_url, upstream=upstream, max_retries=0
+    )
+    return Agent(model=model)
+
+
+def test_circuit_breaker_fails_fast_then_probes():
+    """Test that the circuit opens after consecutive failures and one probe after the reset closes it."""
+    breaker = CircuitBreaker("youtube", failure_threshold=2, reset_seconds=0.05)
+    breaker.record_failure()
+    breaker.check()
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    time.sleep(0.06)
+    breaker.check()  # the probe
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    breaker.record_success()
+    breaker.check()
+
+    assert breaker.stats() == {"state": "closed", "failures": 0, "opened": 1, "rejected": 2}
+
+
+async def test_probe_that_ends_without_a_verdict_is_handed_back():
+    """Test that a probe failing with a non-transient error or cancelled lets the next call probe."""
+    breaker = CircuitBreaker("stand-in", failure_threshold=1, reset_seconds=0.01)
+    upstream = Upstream("stand-in", breaker=breaker, retry=RetryPolicy(attempts=1))
+    breaker.record_failure()
+    time.sleep(0.02)
+
+    async def bad_request():
+        error_msg = "bad prompt"
+        raise ValueError(error_msg)
+
+    with pytest.raises(ValueError, match="bad prompt"):
+        await upstream.call(bad_request)
+    assert breaker.state == "open"
+
+    started = asyncio.Event()
+
+    async def hang():
+        started.set()
+        await asyncio.sleep(60)
+
+    probe = asyncio.ensure_future(upstream.call(hang))
+    await started.wait()
+    assert breaker.state == "half_open"
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    assert breaker.state == "open"
+
+    async def ok():
+        return "ok"
+
+    assert await upstream.call(ok) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_only_transient_errors_are_retried_with_jitter():
+    """Test that timeouts, dropped connections and 5xx are retried after a jittered wait, and 4xx are not."""
+    policy = RetryPolicy(attempts=3, base_delay=0.001, max_delay=0.002)
+    assert all(0 <= policy.delay(attempt) <= 0.002 for attempt in range(10))
+    assert is_transient(httpx.ConnectError("refused"))
+    assert is_transient(type("ProviderError", (Exception,), {"status_code": 503})())
+    assert not is_transient(type("ProviderError", (Exception,), {"status_code": 400})())
+    assert not is_transient(ValueError("bad video"))
+
+    upstream = Upstream("youtube", retry=policy)
+    outcomes = iter([ConnectionResetError("reset"), TimeoutError("slow"), "transcript"])
+
+    def fetch():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    assert upstream.call_sync(fetch) == "transcript"
+    with pytest.raises(ValueError, match="bad video"):
+        upstream.call_sync(lambda: (_ for _ in ()).throw(ValueError("bad video")))
+    assert upstream.retries == 2
+    assert upstream.breaker.failures == 0
+
+
+def test_provider_errors_are_transient_only_for_a_real_transient_response():
+    """Test that agno's default 502 on bad requests is not retried, while a wrapped 503 or dropped connection is."""
+    request = httpx.Request("POST", "http://stand-in/chat/completions")
+
+    def wrapped(cause: Exception) -> ModelProviderError:
+        # What agno raises ``from`` the provider's own error
+        error = ModelProviderError("provider failed")
+        error.__cause__ = cause
+        return error
+
+    overloaded = openai.InternalServerError("overloaded", response=httpx.Response(503, request=request), body=None)
+    too_long = openai.BadRequestError("context too long", response=httpx.Response(400, request=request), body=None)
+    assert is_transient(wrapped(overloaded))
+    assert is_transient(wrapped(openai.APIConnectionError(request=request)))
+    assert not is_transient(wrapped(too_long))
+    assert not is_transient(ModelProviderError("context too long"))
+    assert not is_transient(wrapped(ValueError("bad arguments")))
+
+
+async def test_slow_model_calls_are_hedged():
+    """Test that a call slower than usual is duplicated, the fast duplicate wins and the slow one is dropped."""
+    hedger = Hedger(min_samples=3, min_delay=0.05, max_ratio=0.5)
+    with StandInLLMServer(latency=0.0, tokens_per_second=100_000, completion_tokens=5) as server:
+        agent = _agent(server, Upstream("stand-in", hedger=hedger, deadline=5.0))
+        for _ in range(3):
+            await agent.arun("hello")
+        server.slow_requests, server.slow_latency = 1, 3.0
+
+        started = time.perf_counter()
+        result = await agent.arun("hello")
+        elapsed = time.perf_counter() - started
+
+    assert len(str(result.content).split()) == 5
+    assert elapsed < 2.0
+    assert hedger.stats()["hedged"] == 1
+    assert hedger.stats()["hedge_wins"] == 1
+
+
+async def test_retries_deadlines_and_circuit_against_stand_in():
+    """Test that errors and stalls are retried, and a failing backend is then no longer called."""
+    upstream = Upstream(
+        "stand-in",
+        breaker=CircuitBreaker("stand-in", failure_threshold=2, reset_seconds=60),
+        retry=RetryPolicy(attempts=2, base_delay=0.01),
+        deadline=0.5,
+    )
+    with StandInLLMServer(latency=0.0, tokens_per_second=100_000, completion_tokens=5) as server:
+        agent = _agent(server, upstream)
+        server.failures = 1
+        assert (await agent.arun("hello")).status.value == "COMPLETED"
+        server.slow_requests, server.slow_latency = 1, 3.0
+        assert (await agent.arun("hello")).status.value == "COMPLETED"
+
+        server.failures = 10
+        failed = await agent.arun("hello")
+        calls = server.failed
+        rejected = await agent.arun("hello")
+
+        assert server.failed == calls
+
+    assert failed.status.value == "ERROR"
+    assert "is failing" in str(rejected.content)
+    assert upstream.stats()["retries"] == 3
+    assert upstream.stats()["deadlines_exceeded"] == 1
+    assert upstream.stats()["circuit"]["state"] == "open"
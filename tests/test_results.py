@@ -0,0 +1,166 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from youtube_agent.cache import TieredCache
+from youtube_agent.main import handler
+from youtube_agent.results import (
+    AnalysisRequest,
+    CacheMode,
+    ResultCache,
+    cache_mode,
+    create_result_backend,
+    detect_intent,
+    parse_analysis_request,
+    prompt_fingerprint,
+)
+
+VIDEO_ID = "zjkBMFhNj_g"
+
+
+def _user(content: str, **extra) -> list[dict]:
+    return [{"role": "user", "content": content, **extra}]
+
+
+def _result_cache(model_name: str = "openai/gpt-4o", prompt_version: str = "v1") -> ResultCache:
+    return ResultCache(TieredCache(None), model_name=model_name, prompt_version=prompt_version)
+
+
+def test_equivalent_requests_share_a_key():
+    """Test that different wording and URL forms map to the same request."""
+    first = parse_analysis_request(_user(f"Summarize https://youtu.be/{VIDEO_ID}"))
+    second = parse_analysis_request(_user(f"Analyze https://www.youtube.com/watch?v={VIDEO_ID}"))
+
+    assert first == second == AnalysisRequest(VIDEO_ID, "summary")
+
+
+@pytest.mark.parametrize(
+    ("text", "intent"),
+    [
+        ("Create a study guide from this lecture", "study_guide"),
+        ("Extract key points from this tutorial with timestamps", "key_points"),
+        ("Break down this video into chapters", "chapters"),
+        ("Give me an overview", "summary"),
+        ("Who is the presenter?", None),
+    ],
+)
+def test_detect_intent(text, intent):
+    """Test intent classification of common requests."""
+    assert detect_intent(text) == intent
+
+
+def test_non_cacheable_requests():
+    """Test that follow-ups and multi-video requests are not cached."""
+    assert parse_analysis_request(_user("What did they say about backprop?")) is None
+    assert (
+        parse_analysis_request(_user(f"Compare https://youtu.be/{VIDEO_ID} and https://youtu.be/aaaaaaaaaaa")) is None
+    )
+
+
+def test_intent_words_inside_a_real_question_stay_in_the_key():
+    """Test that a message mixing an intent word with its own question never shares the generic analysis."""
+    generic = parse_analysis_request(_user(f"Break https://youtu.be/{VIDEO_ID} down into chapters #refresh"))
+    section = parse_analysis_request(
+        _user(f"What does the section at 12:30 of https://youtu.be/{VIDEO_ID} say about X?")
+    )
+    compare = parse_analysis_request(_user(f"Compare the overview of https://youtu.be/{VIDEO_ID} with your own view"))
+    same_question = parse_analysis_request(_user(f"what does the SECTION at 12:30 of youtu.be/{VIDEO_ID} say about x"))
+
+    assert generic == AnalysisRequest(VIDEO_ID, "chapters")
+    assert section == same_question == AnalysisRequest(VIDEO_ID, "chapters", "what does at 12 30 say x")
+    assert compare == AnalysisRequest(VIDEO_ID, "summary", "compare your own view")
+
+    cache = _result_cache()
+    cache.set(generic, "generic chapters")
+    assert cache.get(section) is None
+    assert cache.key(section) == cache.key(same_question)
+
+
+def test_cache_mode_flags():
+    """Test the explicit bypass/refresh flags."""
+    assert cache_mode(_user("Summarize it")) is CacheMode.USE
+    assert cache_mode(_user("Summarize it", cache="refresh")) is CacheMode.REFRESH
+    assert cache_mode(_user("Summarize it", cache="BYPASS")) is CacheMode.BYPASS
+    assert cache_mode(_user("Summarize it #refresh")) is CacheMode.REFRESH
+    assert cache_mode(_user("#nocache Summarize it")) is CacheMode.BYPASS
+
+
+def test_key_depends_on_model_and_prompt_version():
+    """Test that a model or prompt change never serves stale results."""
+    request = AnalysisRequest(VIDEO_ID, "summary")
+    keys = {
+        _result_cache().key(request),
+        _result_cache(model_name="anthropic/claude-3.5-sonnet").key(request),
+        _result_cache(prompt_version=prompt_fingerprint("new instructions")).key(request),
+    }
+    assert len(keys) == 3
+
+
+def test_create_result_backend(tmp_path):
+    """Test backend selection."""
+    assert create_result_backend("off", tmp_path) is None
+    assert isinstance(create_result_backend("memory", tmp_path), TieredCache)
+    create_result_backend("sqlite", tmp_path)
+    assert (tmp_path / "results.sqlite3").exists()
+    with pytest.raises(ValueError, match="Unknown result cache backend"):
+        create_result_backend("redis", tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_handler_serves_equivalent_requests_from_cache():
+    """Test that a second, differently worded request skips the agent."""
+    mock_response = MagicMock(content="## Video Overview", status="COMPLETED")
+
+    with (
+        patch("youtube_agent.main._initialized", True),
+        patch("youtube_agent.main.result_cache", _result_cache()),
+        patch("youtube_agent.main.run_agent", new_callable=AsyncMock, return_value=mock_response) as mock_run,
+    ):
+        first = await handler(_user(f"Summarize https://youtu.be/{VIDEO_ID}"))
+        second = await handler(_user(f"Analyze https://www.youtube.com/watch?v={VIDEO_ID}"))
+
+    assert first is mock_response
+    assert second == "## Video Overview"
+    mock_run.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_handler_refresh_and_bypass():
+    """Test that refresh re-runs and stores, and bypass neither reads nor writes."""
+    cache = _result_cache()
+    request = AnalysisRequest(VIDEO_ID, "summary")
+    cache.set(request, "stale")
+
+    with (
+        patch("youtube_agent.main._initialized", True),
+        patch("youtube_agent.main.result_cache", cache),
+        patch(
+            "youtube_agent.main.run_agent",
+            new_callable=AsyncMock,
+            side_effect=[MagicMock(content="fresh"), MagicMock(content="uncached")],
+        ) as mock_run,
+    ):
+        await handler(_user(f"Summarize https://youtu.be/{VIDEO_ID}", cache="refresh"))
+        await handler(_user(f"Summarize https://youtu.be/{VIDEO_ID}", cache="bypass"))
+
+    assert mock_run.await_count == 2
+    assert cache.get(request) == "fresh"
+
+
+@pytest.mark.asyncio
+async def test_handler_does_not_cache_failed_runs():
+    """Test that errored runs are not stored."""
+    cache = _result_cache()
+
+    with (
+        patch("youtube_agent.main._initialized", True),
+        patch("youtube_agent.main.result_cache", cache),
+        patch(
+            "youtube_agent.main.run_agent",
+            new_callable=AsyncMock,
+            return_value=MagicMock(content="Error: rate limited", status="ERROR"),
+        ),
+    ):
+        await handler(_user(f"Summarize https://youtu.be/{VIDEO_ID}"))
+
+    assert cache.get(AnalysisRequest(VIDEO_ID, "summary")) is None
@@ -0,0 +1,94 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from youtube_agent.cache import TieredCache
+from youtube_agent.main import _route, collect_stats, run_agent
+from youtube_agent.routing import ModelRouter, Route, RouteDecision, parse_routes
+from youtube_agent.transcripts import TranscriptCache, TranscriptSnippet
+
+ROUTES = [Route("mini", 20_000, frozenset({"summary", "key_points"})), Route("mid", 80_000), Route("big")]
+
+
+def test_parse_routes():
+    """Test that MODEL_ROUTES entries parse into size and intent limits, in order."""
+    assert parse_routes("openai/gpt-4o-mini<=20000:summary+key_points, openai/gpt-4o") == [
+        Route("openai/gpt-4o-mini", 20000, frozenset({"summary", "key_points"})),
+        Route("openai/gpt-4o"),
+    ]
+    assert parse_routes("") == []
+    with pytest.raises(ValueError, match="Invalid model route"):
+        parse_routes("openai/gpt-4o<=lots")
+
+
+def test_routes_by_transcript_length_and_intent():
+    """Test that the first route accepting the transcript size and intent wins."""
+    router = ModelRouter(ROUTES)
+
+    assert router.choose(5_000, "summary").model == "mini"
+    assert router.choose(5_000, "timestamps").model == "mid"
+    assert router.choose(50_000, "summary").model == "mid"
+    assert router.choose(500_000, "summary").model == "big"
+    # Unknown length only fits unbounded routes
+    assert router.choose(None, "summary").model == "big"
+
+
+def test_slow_or_failing_model_is_skipped_until_probed():
+    """Test that a model over its latency or error limit is skipped, then probed once per probe interval."""
+    router = ModelRouter(ROUTES, fallback="backup", slow_seconds=10.0, max_error_rate=0.25, probe_seconds=60.0)
+
+    first = router.choose(5_000, "summary")
+    router.record(first, "mini", 30.0, error=False)
+    slow = router.choose(5_000, "summary")
+    assert slow.model == "mid"
+    assert "mini (latency EWMA 30.0s)" in slow.reason
+
+    router.record(slow, "mid", 1.0, error=True)
+    router.record(RouteDecision("big", ""), "big", 1.0, error=True)
+    assert router.choose(5_000, "summary").model == "backup"
+
+    router.health("mini").last_used -= 60.0
+    assert router.choose(5_000, "summary").model == "mini"
+    # Only one request probes per interval, even while that probe is still running
+    assert router.choose(5_000, "summary").model == "backup"
+    assert router.stats()["models"]["mini"]["latency_ewma"] == 30.0
+
+
+async def test_route_measures_the_transcript():
+    """Test that requests are routed on the fetched transcript's length."""
+    provider = MagicMock()
+    provider.fetch.return_value = [TranscriptSnippet("a short caption line", float(i), 1.0) for i in range(50)]
+    messages = [{"role": "user", "content": "Summarize https://youtu.be/zjkBMFhNj_g"}]
+
+    with (
+        patch("youtube_agent.main._router", ModelRouter(ROUTES)),
+        patch("youtube_agent.main.transcript_cache", TranscriptCache(provider, TieredCache(None))),
+    ):
+        decision = await _route(messages)
+        assert decision.model == "mini"
+        assert collect_stats()["routing"]["models"]["mini"]["routed"] == 1
+
+
+async def test_failed_run_falls_back_to_secondary_model():
+    """Test that a routed run that raises is retried on the fallback model and both outcomes are recorded."""
+    messages = [{"role": "user", "content": "What is this video about?"}]
+    primary = MagicMock()
+    primary.arun = AsyncMock(side_effect=ConnectionError("upstream 502"))
+    backup = MagicMock()
+    backup.arun = AsyncMock(return_value=MagicMock(content="answer", status=None))
+    router = ModelRouter([Route("big")], fallback="backup")
+
+    with (
+        patch("youtube_agent.main.agent", primary),
+        patch("youtube_agent.main._agents", {"big": primary, "backup": backup}),
+        patch("youtube_agent.main._router", router),
+        patch("youtube_agent.main.transcript_cache", None),
+    ):
+        result = await run_agent(messages, router.choose(None, None))
+
+    assert result.content == "answer"
+    stats = router.stats()
+    assert stats["fallbacks"] == 1
+    assert stats["models"]["big"]["errors"] == 1
+    assert stats["models"]["backup"]["calls"] == 1
+    assert [(d["model"], d["error"]) for d in stats["recent"]] == [("big", True), ("backup", False)]
@@ -0,0 +1,216 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from youtube_agent.cache import TieredCache
+from youtube_agent.main import _request_priority, handler
+from youtube_agent.scheduler import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    AdmissionScheduler,
+    OverloadedError,
+    TokenBudget,
+    parse_tpm_budgets,
+)
+from youtube_agent.transcripts import TranscriptCache
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_is_bounded():
+    """Test that no more than max_workers calls run at once."""
+    scheduler = AdmissionScheduler(max_workers=3, max_queue_depth=100)
+    running = 0
+    peak = 0
+
+    async def call():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    await asyncio.gather(*(scheduler.run(call) for _ in range(12)))
+
+    assert peak == 3
+    assert scheduler.stats()["completed"] == 12
+    assert scheduler.stats()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_runs_first():
+    """Test that queued requests are admitted by priority, then arrival order."""
+    scheduler = AdmissionScheduler(max_workers=1, max_queue_depth=10)
+    release = asyncio.Event()
+    order: list[str] = []
+
+    async def blocker():
+        await release.wait()
+
+    def record(name):
+        async def call():
+            order.append(name)
+
+        return call
+
+    first = asyncio.create_task(scheduler.run(blocker))
+    await asyncio.sleep(0)
+    queued = [
+        asyncio.create_task(scheduler.run(record("low-1"), priority=PRIORITY_LOW)),
+        asyncio.create_task(scheduler.run(record("high"), priority=PRIORITY_HIGH)),
+        asyncio.create_task(scheduler.run(record("low-2"), priority=PRIORITY_LOW)),
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(first, *queued)
+
+    assert order == ["high", "low-1", "low-2"]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_sheds_load():
+    """Test that requests beyond the queue depth are rejected immediately."""
+    scheduler = AdmissionScheduler(max_workers=1, max_queue_depth=2)
+    release = asyncio.Event()
+
+    async def blocker():
+        await release.wait()
+
+    tasks = [asyncio.create_task(scheduler.run(blocker)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(OverloadedError, match="overloaded"):
+        await scheduler.run(blocker)
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert scheduler.stats()["rejected"] == 1
+    assert scheduler.stats()["admitted"] == 3
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    """Test that a cancelled queued request frees its queue slot."""
+    scheduler = AdmissionScheduler(max_workers=1, max_queue_depth=1)
+    release = asyncio.Event()
+
+    async def blocker():
+        await release.wait()
+
+    running = asyncio.create_task(scheduler.run(blocker))
+    waiting = asyncio.create_task(scheduler.run(blocker))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    await asyncio.gather(waiting, return_exceptions=True)
+
+    assert scheduler.queued == 0
+    release.set()
+    await running
+    assert scheduler.stats()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_waiter_cancelled_just_before_a_release_stays_cancelled():
+    """Test that a waiter whose slot a release already dropped still ends with CancelledError."""
+    scheduler = AdmissionScheduler(max_workers=1, max_queue_depth=1)
+    await scheduler._acquire_worker(PRIORITY_HIGH)
+    waiting = asyncio.create_task(scheduler.run(AsyncMock()))
+    await asyncio.sleep(0)
+
+    # The worker is released after the cancellation but before the waiter resumes
+    waiting.cancel()
+    scheduler._release_worker()
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert scheduler.queued == 0
+    assert scheduler.stats()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_token_budget_throttles():
+    """Test that a tokens-per-minute budget delays calls that exceed it."""
+    budget = TokenBudget(tokens_per_minute=60_000)  # 1000 tokens per second
+
+    assert await budget.acquire(60_000) == 0
+    waited = await budget.acquire(50)
+
+    assert 0.03 < waited < 0.2
+
+
+@pytest.mark.asyncio
+async def test_throttled_model_does_not_hold_workers():
+    """Test that calls waiting for a model's token budget leave the workers to other models."""
+    scheduler = AdmissionScheduler(max_workers=1, max_queue_depth=10, tpm_budgets={"slow": 600})
+    await scheduler.budgets["slow"].acquire(600)  # drained; 50 tokens take 5 seconds to refill
+    throttled = asyncio.create_task(scheduler.run(AsyncMock(), model="slow", estimated_tokens=50))
+    await asyncio.sleep(0)
+
+    await asyncio.wait_for(scheduler.run(AsyncMock(), model="fast", estimated_tokens=50), timeout=1)
+
+    assert scheduler.stats()["active"] == 0
+    throttled.cancel()
+    await asyncio.gather(throttled, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_rejected_call_gets_its_tokens_back():
+    """Test that a call shed after taking token budget refunds it."""
+    scheduler = AdmissionScheduler(max_workers=1, max_queue_depth=0, tpm_budgets={"m": 600})
+    await scheduler._acquire_worker(PRIORITY_HIGH)
+
+    with pytest.raises(OverloadedError):
+        await scheduler.run(AsyncMock(), model="m", estimated_tokens=500)
+
+    assert scheduler.budgets["m"].available > 500
+
+
+def test_parse_tpm_budgets():
+    """Test the MODEL_TPM_BUDGETS format."""
+    assert parse_tpm_budgets("openai/gpt-4o=300000, openai/gpt-4o-mini=1000000") == {
+        "openai/gpt-4o": 300_000,
+        "openai/gpt-4o-mini": 1_000_000,
+    }
+    assert parse_tpm_budgets(None) == {}
+    with pytest.raises(ValueError, match="Invalid token budget"):
+        parse_tpm_budgets("openai/gpt-4o")
+
+
+@pytest.mark.asyncio
+async def test_request_priority_prefers_cached_short_videos():
+    """Test that cached short transcripts get high priority and unknown ones low."""
+    store = TieredCache(None)
+    cache = TranscriptCache(MagicMock(), store)
+    store.set(TranscriptCache.cache_key("aaaaaaaaaaa", ("en",)), [["short clip", 0.0, 3.0]])
+
+    with patch("youtube_agent.main.transcript_cache", cache):
+        cached = await _request_priority([{"role": "user", "content": "Summarize youtu.be/aaaaaaaaaaa"}])
+        unknown = await _request_priority([{"role": "user", "content": "Summarize youtu.be/bbbbbbbbbbb"}])
+
+    assert cached[0] == PRIORITY_HIGH
+    assert unknown[0] == PRIORITY_LOW
+
+    assert store.stats.misses == 0
+
+
+@pytest.mark.asyncio
+async def test_handler_runs_through_scheduler():
+    """Test that handler surfaces load shedding to the caller."""
+    scheduler = AdmissionScheduler(max_workers=1, max_queue_depth=0)
+    release = asyncio.Event()
+
+    async def slow_run(messages):
+        await release.wait()
+        return MagicMock(content="done", metrics=MagicMock(total_tokens=123))
+
+    with (
+        patch("youtube_agent.main._initialized", True),
+        patch("youtube_agent.main.scheduler", scheduler),
+        patch("youtube_agent.main.run_agent", new_callable=AsyncMock, side_effect=slow_run),
+    ):
+        first = asyncio.create_task(handler([{"role": "user", "content": "hello"}]))
+        await asyncio.sleep(0)
+        with pytest.raises(OverloadedError):
+            await handler([{"role": "user", "content": "hello again"}])
+        release.set()
+        assert (await first).content == "done"
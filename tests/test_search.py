@@ -0,0 +1,95 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from youtube_agent.cache import TieredCache
+from youtube_agent.main import collect_stats, handler
+from youtube_agent.search import TranscriptIndex, TranscriptLookup, parse_lookup
+from youtube_agent.tools import CachedYouTubeTools
+from youtube_agent.transcripts import CompactTranscript, TranscriptCache, TranscriptSnippet
+
+VIDEO = "zjkBMFhNj_g"
+URL = f"https://youtu.be/{VIDEO}"
+
+LECTURE = [
+    "welcome to the lecture on neural networks",
+    "first we look at the forward pass",
+    "and how each layer transforms its input",
+    "then we get to backpropagation",
+    "which computes the gradient of the loss",
+    "finally we train with gradient descent",
+]
+
+
+def _lecture(seconds_per_line: float = 30.0) -> list[TranscriptSnippet]:
+    return [TranscriptSnippet(text, i * seconds_per_line, seconds_per_line) for i, text in enumerate(LECTURE)]
+
+
+def _user(*contents):
+    return [{"role": "user", "content": content} for content in contents]
+
+
+def test_parse_lookup_finds_the_video_in_earlier_messages():
+    """Test that a follow-up lookup question uses the video from earlier in the conversation."""
+    assert parse_lookup(_user(f"Summarize {URL}", "At what timestamp do they talk about backprop?")) == (
+        TranscriptLookup(VIDEO, "backprop")
+    )
+    assert parse_lookup(_user(f"Where does he mention gradient descent in {URL}?")) == (
+        TranscriptLookup(VIDEO, "gradient descent")
+    )
+    assert parse_lookup(_user("find where they talk about dropout in this video", URL)) is None
+    assert parse_lookup(_user(f"Summarize {URL}", "Why does backprop work?")) is None
+    assert parse_lookup(_user("Where do they talk about backprop?")) is None
+
+
+def test_index_search_matches_prefixes_once_per_video():
+    """Test that a video is indexed once and prefix queries find its passages with their times."""
+    index = TranscriptIndex(None, passage_seconds=30.0)
+    transcript = CompactTranscript.from_snippets(_lecture())
+
+    assert index.add(VIDEO, transcript) == len(LECTURE)
+    assert index.add(VIDEO, transcript) == 0
+
+    hits = index.search("backprop", video_id=VIDEO)
+    assert [(hit.start, hit.end) for hit in hits] == [(90.0, 120.0)]
+    assert "**backpropagation**" in hits[0].excerpt
+    # No passage has both words, so any-word matches are returned instead
+    assert {hit.start for hit in index.search("forward descent", video_id=VIDEO)} == {30.0, 150.0}
+    assert index.search("backprop", video_id="other_video") == []
+    assert index.stats()["videos"] == 1
+
+
+def test_search_tool_indexes_on_first_use():
+    """Test that search_video_transcript returns timestamped links from the index."""
+    provider = MagicMock()
+    provider.fetch.return_value = _lecture()
+    tools = CachedYouTubeTools(TranscriptCache(provider, TieredCache(None)), transcript_index=TranscriptIndex(None))
+
+    output = tools.search_video_transcript(URL, "gradient")
+
+    assert f"[00:02:00](https://www.youtube.com/watch?v={VIDEO}&t=120s)" in output
+    assert output.index("00:02:00") < output.index("00:02:30")
+    assert "not mentioned" in tools.search_video_transcript(URL, "attention")
+
+
+async def test_handler_answers_lookups_from_the_index():
+    """Test that a lookup about an indexed video never reaches the agent, and a miss falls back to it."""
+    index = TranscriptIndex(None)
+    provider = MagicMock()
+    provider.fetch.return_value = _lecture()
+    cache = TranscriptCache(provider, TieredCache(None), on_load=index.add)
+    cache.get(VIDEO)
+
+    with (
+        patch("youtube_agent.main._initialized", True),
+        patch("youtube_agent.main.transcript_cache", cache),
+        patch("youtube_agent.main.transcript_index", index),
+        patch("youtube_agent.main.run_agent", new_callable=AsyncMock, return_value=MagicMock()) as mock_run,
+    ):
+        answer = await handler(_user(f"Summarize {URL}", "When do they discuss backprop?"))
+        mock_run.assert_not_awaited()
+        await handler(_user(f"Summarize {URL}", "When do they discuss attention?"))
+        mock_run.assert_awaited_once()
+        assert collect_stats()["transcript_index"]["searches"] == 2
+
+    assert answer.startswith('Mentions of "backprop"')
+    assert "&t=90s" in answer
+    assert provider.fetch.call_count == 1
@@ -0,0 +1,95 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from youtube_agent.cache import TieredCache
+from youtube_agent.segmentation import (
+    _block_term_weights,
+    _gap_similarity,
+    find_boundaries,
+    format_segments,
+    segment_transcript,
+)
+from youtube_agent.tools import CachedYouTubeTools
+from youtube_agent.transcripts import TranscriptCache, TranscriptSnippet
+
+TOPICS = [
+    "python function variable loop dictionary import module class",
+    "guitar chord string strum melody rhythm fret tuning",
+    "bread flour yeast dough oven knead crust bake",
+]
+
+
+def _transcript(minutes_per_topic=5, caption_seconds=3.0):
+    """Three topics in a row, one caption every ``caption_seconds``."""
+    snippets = []
+    time = 0.0
+    for words in TOPICS:
+        vocabulary = words.split()
+        for i in range(int(minutes_per_topic * 60 / caption_seconds)):
+            text = " ".join(vocabulary[(i + k) % len(vocabulary)] for k in range(3)) + " and so on"
+            snippets.append(TranscriptSnippet(text, time, caption_seconds))
+            time += caption_seconds
+    return snippets
+
+
+def test_segments_follow_topic_changes():
+    """Test that boundaries land exactly on the captions where the topic changes."""
+    segments = segment_transcript(_transcript())
+
+    assert [segment.start for segment in segments] == [0.0, 300.0, 600.0]
+    assert [segment.end for segment in segments] == [300.0, 600.0, 900.0]
+    assert set(segments[1].keywords) <= set(TOPICS[1].split())
+    assert segments[2].text.startswith("bread")
+
+
+def test_segment_limits():
+    """Test the minimum segment length and the segment cap."""
+    snippets = _transcript()
+
+    assert len(segment_transcript(snippets, max_segments=2)) == 2
+    assert len(segment_transcript(snippets, min_segment_seconds=400)) <= 2
+    assert segment_transcript([]) == []
+    assert len(segment_transcript(snippets[:5])) == 1
+
+
+def test_window_similarity_matches_dense_window_sums():
+    """Test that the banded similarity equals the cosine of the summed dense windows, ends included."""
+    snippets = _transcript(minutes_per_topic=2)
+    block_ids = np.asarray([int(snippet.start // 30) for snippet in snippets])
+    n_blocks = int(block_ids[-1]) + 1
+    weights = _block_term_weights(block_ids, [snippet.text for snippet in snippets], n_blocks)
+
+    dense = np.zeros((n_blocks, len(weights.vocabulary)))
+    np.add.at(dense, (weights.blocks, weights.terms), weights.weights)
+    expected = []
+    for gap in range(1, n_blocks):
+        before, after = dense[max(gap - 3, 0) : gap].sum(axis=0), dense[gap : gap + 3].sum(axis=0)
+        expected.append(before @ after / (np.linalg.norm(before) * np.linalg.norm(after)))
+
+    np.testing.assert_allclose(_gap_similarity(weights, 3), expected)
+
+
+def test_find_boundaries_prefers_deepest_valleys():
+    """Test that the deepest dips win and stay min_gap apart."""
+    similarity = np.array([0.9, 0.9, 0.1, 0.9, 0.9, 0.7, 0.9, 0.9, 0.9, 0.2, 0.9, 0.9])
+
+    assert find_boundaries(similarity, min_gap=2) == [2, 9]
+    assert find_boundaries(similarity, min_gap=2, max_boundaries=1) == [2]
+
+
+def test_video_segments_tool():
+    """Test that get_video_segments returns exact, formatted segment times."""
+    provider = MagicMock()
+    provider.fetch.return_value = _transcript()
+    tools = CachedYouTubeTools(TranscriptCache(provider, TieredCache(None)))
+
+    output = tools.get_video_segments("https://youtu.be/zjkBMFhNj_g")
+
+    assert output == format_segments(segment_transcript(_transcript()))
+    assert output.startswith("[Segment 1] 00:00:00 - 00:05:00")
+    assert "[Segment 3] 00:10:00 - 00:15:00" in output
+    assert "get_video_segments" in tools.functions
+    assert tools.get_video_segments("not a url") == (
+        "Error getting video ID from URL, please provide a valid YouTube url"
+    )
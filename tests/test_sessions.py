@@ -0,0 +1,112 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from youtube_agent.cache import TieredCache
+from youtube_agent.main import collect_stats, handler
+from youtube_agent.search import TranscriptIndex
+from youtube_agent.sessions import SessionStore, VideoAnalysis, followup_video, session_id
+from youtube_agent.transcripts import CompactTranscript, TranscriptSnippet
+
+VIDEO = "zjkBMFhNj_g"
+URL = f"https://youtu.be/{VIDEO}"
+
+ANALYSIS = """\
+# Neural Networks from Scratch
+
+A lecture that builds a small neural network and trains it on handwritten digits.
+
+## Chapters
+- **[00:00:00 - 00:05:00]** Introduction and the forward pass
+- **[00:05:00 - 00:12:30]** Backpropagation and the chain rule
+- **[00:12:30 - 00:20:00]** Training with gradient descent
+
+## Key Points
+- Gradients flow backwards through every layer
+- A small learning rate trains more slowly but more reliably
+"""
+
+
+def test_analysis_is_distilled_into_chapters_and_key_points():
+    """Test that the markdown answer is reduced to its overview, timestamped chapters and key points."""
+    analysis = VideoAnalysis.from_markdown(VIDEO, ANALYSIS)
+
+    assert analysis.overview == "A lecture that builds a small neural network and trains it on handwritten digits."
+    assert analysis.chapters[1] == "[00:05:00 - 00:12:30] Backpropagation and the chain rule"
+    assert len(analysis.chapters) == 3
+    assert analysis.key_points == (
+        "Gradients flow backwards through every layer",
+        "A small learning rate trains more slowly but more reliably",
+    )
+    assert len(VideoAnalysis.from_markdown(VIDEO, ANALYSIS * 50).render()) < 6000
+
+
+def test_followups_are_recognised_by_their_conversation():
+    """Test that a follow-up names no video and refers to the one earlier in its conversation."""
+    first = [{"role": "user", "content": f"Summarize {URL}"}]
+    followup = [*first, {"role": "assistant", "content": ANALYSIS}, {"role": "user", "content": "Who is it for?"}]
+
+    assert followup_video(first) is None
+    assert followup_video(followup) == VIDEO
+    assert followup_video([*followup, {"role": "user", "content": "And https://youtu.be/aaaaaaaaaaa?"}]) is None
+    assert session_id(followup) == session_id(first, reply=ANALYSIS)
+    assert session_id(first) is None
+
+
+def test_chats_with_the_same_opener_keep_their_own_sessions():
+    """Test that two chats opening with the same request do not share or overwrite follow-up sessions."""
+    store = SessionStore(TieredCache(None))
+    opener = [{"role": "user", "content": f"Summarize {URL}"}]
+    other = ANALYSIS.replace("handwritten digits", "house prices")
+    store.remember(opener, VIDEO, ANALYSIS)
+    store.remember(opener, VIDEO, other)
+
+    def followup(reply: str, **ids) -> list[dict]:
+        return [*opener, {"role": "assistant", "content": reply}, {"role": "user", "content": "Who is it for?", **ids}]
+
+    assert "handwritten digits" in store.lookup(followup(ANALYSIS)).overview
+    assert "house prices" in store.lookup(followup(other)).overview
+
+    # A conversation id from the caller wins over the opening exchange
+    store.remember([{**opener[0], "context_id": "chat-1"}], VIDEO, other)
+    assert "house prices" in store.lookup(followup(ANALYSIS, context_id="chat-1")).overview
+    assert store.lookup(followup(ANALYSIS, context_id="chat-2")) is None
+
+
+async def test_followup_prompts_do_not_grow_with_the_conversation():
+    """Test that follow-ups are answered from the stored analysis with a constant-size prompt."""
+    index = TranscriptIndex(None)
+    lines = ["the chain rule multiplies local gradients", "momentum smooths the updates"] * 20
+    index.add(
+        VIDEO, CompactTranscript.from_snippets([TranscriptSnippet(t, i * 15.0, 15.0) for i, t in enumerate(lines)])
+    )
+    store = SessionStore(TieredCache(None))
+    followup_agent = MagicMock()
+    followup_agent.arun = AsyncMock(return_value=MagicMock(content="It is at 00:05:00.", status=None))
+    messages = [{"role": "user", "content": f"Summarize {URL}"}]
+
+    with (
+        patch("youtube_agent.main._initialized", True),
+        patch("youtube_agent.main.session_store", store),
+        patch("youtube_agent.main.transcript_index", index),
+        patch("youtube_agent.main.followup_agent", followup_agent),
+        patch("youtube_agent.main.scheduler", None),
+        patch("youtube_agent.main.run_agent", new_callable=AsyncMock) as mock_run,
+    ):
+        mock_run.return_value = MagicMock(content=ANALYSIS, status=None)
+        await handler(messages)
+        messages.append({"role": "assistant", "content": ANALYSIS})
+
+        prompt_sizes = []
+        for turn in range(8):
+            messages.append({"role": "user", "content": f"How does the chain rule relate to momentum? ({turn})"})
+            answer = await handler(messages)
+            messages.append({"role": "assistant", "content": answer.content * 40})
+            prompt_sizes.append(len(followup_agent.arun.await_args.args[0]))
+        stats = collect_stats()["sessions"]
+
+    mock_run.assert_awaited_once()
+    prompt = followup_agent.arun.await_args.args[0]
+    assert "Backpropagation and the chain rule" in prompt
+    assert "the chain rule multiplies local gradients" in prompt
+    assert max(prompt_sizes[1:]) - min(prompt_sizes[1:]) <= 2
+    assert stats["stored"] == 1
+    assert stats["followups"] == 8
@@ -0,0 +1,118 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from youtube_agent.main import handler
+from youtube_agent.singleflight import SingleFlight
+
+VIDEO_URL = "https://www.youtube.com/watch?v=zjkBMFhNj_g"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_make_one_upstream_call():
+    """Test that N concurrent requests for the same video run the agent once."""
+    n = 25
+    mock_response = MagicMock(content="analysis")
+
+    async def slow_run(messages):
+        await asyncio.sleep(0.05)
+        return mock_response
+
+    flight = SingleFlight()
+    with (
+        patch("youtube_agent.main._initialized", True),
+        patch("youtube_agent.main.result_cache", None),
+        patch("youtube_agent.main._inflight", flight),
+        patch("youtube_agent.main.run_agent", new_callable=AsyncMock, side_effect=slow_run) as mock_run,
+    ):
+        results = await asyncio.gather(
+            *(handler([{"role": "user", "content": f"Summarize {VIDEO_URL}"}]) for _ in range(n))
+        )
+
+    mock_run.assert_awaited_once()
+    assert all(result is mock_response for result in results)
+    assert flight.stats() == {"leaders": 1, "coalesced": n - 1, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_different_intents_are_not_coalesced():
+    """Test that a summary and a study guide for the same video run separately."""
+    with (
+        patch("youtube_agent.main._initialized", True),
+        patch("youtube_agent.main.result_cache", None),
+        patch("youtube_agent.main._inflight", SingleFlight()),
+        patch("youtube_agent.main.run_agent", new_callable=AsyncMock, return_value=MagicMock()) as mock_run,
+    ):
+        await asyncio.gather(
+            handler([{"role": "user", "content": f"Summarize {VIDEO_URL}"}]),
+            handler([{"role": "user", "content": f"Create a study guide from {VIDEO_URL}"}]),
+        )
+
+    assert mock_run.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_every_caller():
+    """Test that all coalesced callers see the upstream exception."""
+    flight = SingleFlight()
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        error_msg = "upstream 429"
+        raise RuntimeError(error_msg)
+
+    results = await asyncio.gather(*(flight.do("key", failing) for _ in range(5)), return_exceptions=True)
+
+    assert calls == 1
+    assert all(isinstance(r, RuntimeError) and str(r) == "upstream 429" for r in results)
+    assert flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    """Test that one caller going away leaves the shared call running for the rest."""
+    flight = SingleFlight()
+    upstream_done = asyncio.Event()
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        upstream_done.set()
+        return "ok"
+
+    first = asyncio.create_task(flight.do("key", slow))
+    second = asyncio.create_task(flight.do("key", slow))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "ok"
+    assert upstream_done.is_set()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.asyncio
+async def test_last_cancelled_caller_cancels_the_call():
+    """Test that the upstream call is cancelled once nobody waits for it."""
+    flight = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    callers = [asyncio.create_task(flight.do("key", slow)) for _ in range(3)]
+    await asyncio.sleep(0)
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert cancelled.is_set()
+    assert flight.in_flight() == 0
@@ -0,0 +1,54 @@
+from agno.agent import Agent
+
+from youtube_agent.cache import TieredCache
+from youtube_agent.metrics import MetricsRegistry, new_request_id
+from youtube_agent.models import InstrumentedOpenRouter
+from youtube_agent.spill import SpillStore
+from youtube_agent.standins import FakeTranscriptProvider, StandInLLMServer
+from youtube_agent.tools import CachedYouTubeTools
+from youtube_agent.transcripts import TranscriptCache
+
+
+def test_only_references_to_existing_outputs_are_restored(tmp_path):
+    """Test that restore swaps in spilled outputs and leaves everything else alone."""
+    store = SpillStore(tmp_path, max_chars=10)
+    reference = store.spill("get_video_segments", "x" * 50)
+
+    assert len(reference) < 100
+    assert store.restore(reference) == "x" * 50
+    assert store.restore("[spilled tool output by the user]") == "[spilled tool output by the user]"
+    assert store.restore(None) is None
+
+    store.release_references(["an answer", reference, None])
+    assert store.restore(reference) == reference
+    assert store.stats()["released"] == 1
+
+
+async def test_large_tool_outputs_stay_on_disk_during_a_run(tmp_path):
+    """Test that the run keeps only a reference to a large tool output while the model still sees all of it."""
+    metrics = MetricsRegistry()
+    store = SpillStore(tmp_path / "spill", max_chars=2000)
+    provider = FakeTranscriptProvider(latency=0.0, minutes=60)
+    tools = CachedYouTubeTools(TranscriptCache(provider, TieredCache(None)), enable_get_video_timestamps=False)
+
+    with StandInLLMServer(latency=0.0, tokens_per_second=10_000, completion_tokens=7) as server:
+        model = InstrumentedOpenRouter(
+            id="stand-in", api_key="stand-in", base_url=server.base_url, metrics=metrics, spill=store
+        )
+        agent = Agent(model=model, tools=[tools], tool_hooks=[metrics.tool_hook, store.tool_hook])
+        request = new_request_id()
+        with store.scope():
+            result = await agent.arun("Summarize https://www.youtube.com/watch?v=zjkBMFhNj_g")
+            assert len(list(store.directory.iterdir())) == 1
+
+    tool_message = next(message for message in result.messages if message.role == "tool")
+    assert tool_message.content.startswith("[spilled tool output ")
+    assert len(tool_message.content) < 200
+    # The answering call was sent the whole segmented transcript, read back from disk
+    answer = [span for span in metrics.recent_spans(request) if span["name"] == "model"][-1]
+    assert answer["prompt_tokens"] >= store.spilled_chars // 4
+    assert store.stats()["restored"] == 1
+    assert not list(store.directory.iterdir())
+
+    store.close()
+    assert not store.directory.exists()
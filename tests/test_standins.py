@@ -0,0 +1,57 @@
+from agno.agent import Agent
+from agno.models.openrouter import OpenRouter
+from openai import OpenAI
+
+from youtube_agent.cache import TieredCache
+from youtube_agent.standins import FakeTranscriptProvider, StandInLLMServer, synthetic_transcript
+from youtube_agent.tools import CachedYouTubeTools
+from youtube_agent.transcripts import TranscriptCache
+
+TOOLS = [{"type": "function", "function": {"name": "get_video_segments", "parameters": {"type": "object"}}}]
+
+
+def test_synthetic_transcript_is_deterministic():
+    """Test that the same seed gives the same captions and topic boundaries."""
+    snippets, boundaries = synthetic_transcript(20, seed=3)
+
+    assert (snippets, boundaries) == synthetic_transcript(20, seed=3)
+    assert boundaries[0] == 0.0
+    assert len(boundaries) == 4
+    assert snippets[-1].start < 20 * 60
+
+
+def test_stand_in_server_completions():
+    """Test the OpenAI-compatible completion, tool-call and streaming responses."""
+    with StandInLLMServer(latency=0.0, tokens_per_second=10_000, completion_tokens=12) as server:
+        client = OpenAI(base_url=server.base_url, api_key="stand-in")
+        messages = [{"role": "user", "content": "Summarize https://youtu.be/zjkBMFhNj_g"}]
+
+        plain = client.chat.completions.create(model="m", messages=messages)
+        call = client.chat.completions.create(model="m", messages=messages, tools=TOOLS)
+        chunks = list(client.chat.completions.create(model="m", messages=messages, stream=True))
+
+    assert len(plain.choices[0].message.content.split()) == 12
+    assert plain.usage.completion_tokens == 12
+    assert call.choices[0].message.tool_calls[0].function.name == "get_video_segments"
+    assert "zjkBMFhNj_g" in call.choices[0].message.tool_calls[0].function.arguments
+    assert (
+        "".join(chunk.choices[0].delta.content or "" for chunk in chunks).split()
+        == plain.choices[0].message.content.split()
+    )
+    assert server.requests == 3
+    assert server.call_times.count == 3
+
+
+async def test_agent_runs_end_to_end_against_stand_ins():
+    """Test that an agent calls the transcript tool on the stand-in model and gets the fake transcript."""
+    provider = FakeTranscriptProvider(latency=0.0, minutes=10)
+    tools = CachedYouTubeTools(TranscriptCache(provider, TieredCache(None)), enable_get_video_timestamps=False)
+
+    with StandInLLMServer(latency=0.0, tokens_per_second=10_000, completion_tokens=20) as server:
+        agent = Agent(model=OpenRouter(id="stand-in", api_key="stand-in", base_url=server.base_url), tools=[tools])
+        response = await agent.arun("Summarize https://www.youtube.com/watch?v=zjkBMFhNj_g")
+
+    assert len(str(response.content).split()) == 20
+    assert server.requests == 2  # tool call, then the answer
+    assert provider.fetch_times.count == 1
+    assert any(tool.tool_name == "get_video_segments" for tool in response.tools or [])
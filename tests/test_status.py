@@ -0,0 +1,49 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from youtube_agent.status import StatusServer, port_accepts_connections
+
+
+def _get(port: int, path: str) -> tuple[int, str]:
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=2) as response:
+            return response.status, response.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode()
+
+
+@pytest.fixture
+def status_server():
+    state = {"ready": False}
+    server = StatusServer("127.0.0.1", 0, lambda: state["ready"])
+    server.start()
+    yield server, state
+    server.stop()
+
+
+def test_ready_flips_after_warm_up(status_server):
+    """Test that /ready reports 503 until the readiness callback turns true."""
+    server, state = status_server
+
+    assert _get(server.port, "/ready") == (503, "warming up\n")
+    state["ready"] = True
+    assert _get(server.port, "/ready") == (200, "ready\n")
+
+
+def test_healthz_and_unknown_paths(status_server):
+    """Test liveness and 404 handling."""
+    server, _ = status_server
+
+    assert _get(server.port, "/healthz") == (200, "ok\n")
+    assert _get(server.port, "/nope")[0] == 404
+
+
+def test_port_accepts_connections(status_server):
+    """Test the listening-port probe."""
+    server, _ = status_server
+
+    assert port_accepts_connections("0.0.0.0", server.port)  # noqa: S104
+    server.stop()
+    assert not port_accepts_connections("127.0.0.1", server.port)
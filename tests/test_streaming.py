@@ -0,0 +1,126 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+from agno.run.agent import RunContentEvent, RunErrorEvent, RunOutput
+from bindu.server.workers.helpers.result_processor import ResultProcessor
+
+from youtube_agent.main import handler
+from youtube_agent.results import ResultCache, create_result_backend
+from youtube_agent.scheduler import AdmissionScheduler
+from youtube_agent.streaming import StreamedResult, StreamStats, streaming_enabled
+
+
+def _streaming_agent(*events, delay=0.0):
+    """Return a mock agent whose arun(stream=True) yields ``events``."""
+
+    async def arun(messages, stream=False, yield_run_output=False):
+        assert stream
+        assert yield_run_output
+        for event in events:
+            await asyncio.sleep(delay)
+            yield event
+
+    agent = MagicMock()
+    agent.arun = arun
+    return agent
+
+
+def test_streaming_enabled():
+    """Test the STREAM_RESPONSES switch values."""
+    assert streaming_enabled("true")
+    assert streaming_enabled(" 1 ")
+    assert not streaming_enabled("off")
+    assert not streaming_enabled(None)
+
+
+def test_streamed_result_is_skipped_by_sse_but_kept_by_send():
+    """Test that the final item is falsy yet normalizes to the full content."""
+    result = StreamedResult("full answer")
+
+    assert not result
+    assert ResultProcessor.normalize_result(result) == "full answer"
+
+
+@pytest.mark.asyncio
+async def test_stream_stats_measure_ttft_separately():
+    """Test that time-to-first-token is recorded apart from total latency."""
+    stats = StreamStats()
+
+    async def chunks():
+        await asyncio.sleep(0.01)
+        yield "a"
+        await asyncio.sleep(0.05)
+        yield "b"
+
+    assert [chunk async for chunk in stats.timed(chunks())] == ["a", "b"]
+
+    summary = stats.stats()
+    assert summary["streams"] == 1
+    assert 0.005 < summary["ttft_p50"] < summary["total_p50"]
+    assert summary["total_p50"] >= 0.06
+
+
+@pytest.mark.asyncio
+async def test_handler_streams_deltas_when_enabled(monkeypatch):
+    """Test that handler yields token deltas and then the full answer."""
+    monkeypatch.setenv("STREAM_RESPONSES", "true")
+    agent = _streaming_agent(
+        RunContentEvent(content="Hello"),
+        RunContentEvent(content=", world"),
+        RunOutput(content="Hello, world"),
+    )
+    scheduler = AdmissionScheduler(max_workers=1)
+
+    with (
+        patch("youtube_agent.main._initialized", True),
+        patch("youtube_agent.main.agent", agent),
+        patch("youtube_agent.main.scheduler", scheduler),
+        patch("youtube_agent.main.result_cache", None),
+    ):
+        stream = await handler([{"role": "user", "content": "hello"}])
+        items = [item async for item in stream]
+
+    assert items[:2] == ["Hello", ", world"]
+    assert isinstance(items[-1], StreamedResult)
+    assert items[-1].content == "Hello, world"
+    assert scheduler.stats()["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_streamed_analysis_is_cached(monkeypatch):
+    """Test that a finished stream populates the result cache for later requests."""
+    monkeypatch.setenv("STREAM_RESPONSES", "true")
+    agent = _streaming_agent(RunContentEvent(content="Summary"), RunOutput(content="Summary"))
+    cache = ResultCache(create_result_backend("memory", None), model_name="m", prompt_version="v1")
+    messages = [{"role": "user", "content": "Summarize https://youtu.be/dQw4w9WgXcQ"}]
+
+    with (
+        patch("youtube_agent.main._initialized", True),
+        patch("youtube_agent.main.agent", agent),
+        patch("youtube_agent.main.scheduler", None),
+        patch("youtube_agent.main.result_cache", cache),
+    ):
+        stream = await handler(messages)
+        assert [str(item) async for item in stream] == ["Summary", "Summary"]
+        assert await handler(messages) == "Summary"
+
+
+@pytest.mark.asyncio
+async def test_stream_error_releases_worker(monkeypatch):
+    """Test that a RunError event fails the stream and frees the admission slot."""
+    monkeypatch.setenv("STREAM_RESPONSES", "true")
+    agent = _streaming_agent(RunContentEvent(content="partial"), RunErrorEvent(content="rate limited"))
+    scheduler = AdmissionScheduler(max_workers=1)
+
+    with (
+        patch("youtube_agent.main._initialized", True),
+        patch("youtube_agent.main.agent", agent),
+        patch("youtube_agent.main.scheduler", scheduler),
+        patch("youtube_agent.main.result_cache", None),
+    ):
+        stream = await handler([{"role": "user", "content": "hello"}])
+        with pytest.raises(RuntimeError, match="rate limited"):
+            _ = [item async for item in stream]
+
+    assert scheduler.stats()["active"] == 0
@@ -0,0 +1,71 @@
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from youtube_agent.main import handler
+from youtube_agent.results import AnalysisRequest, OutputFormat, ResultCache, create_result_backend, output_format
+from youtube_agent.structured import Chapter, Segment, VideoSummary, as_summary, render_markdown
+
+VIDEO = "zjkBMFhNj_g"
+URL = f"https://youtu.be/{VIDEO}"
+
+SUMMARY = VideoSummary(
+    title="Neural Networks from Scratch",
+    video_type="lecture",
+    difficulty="intermediate",
+    overview="A lecture that builds a small neural network and trains it on handwritten digits.",
+    chapters=[
+        Chapter(
+            title="Foundations",
+            start_seconds=0,
+            end_seconds=750,
+            segments=[
+                Segment(start_seconds=0, end_seconds=300, title="Forward pass", summary="Layers and activations."),
+                Segment(start_seconds=300, end_seconds=750, title="Backpropagation", summary="The chain rule."),
+            ],
+        )
+    ],
+    key_points=["Gradients flow backwards through every layer"],
+)
+
+
+def test_summary_renders_as_timestamped_markdown():
+    """Test that a summary renders locally with chapter and segment timestamps, and round-trips as JSON."""
+    markdown = render_markdown(SUMMARY)
+
+    assert markdown.startswith("# Neural Networks from Scratch")
+    assert "### [00:00:00 - 00:12:30] Foundations" in markdown
+    assert "- [00:05:00 - 00:12:30] **Backpropagation**: The chain rule." in markdown
+    assert markdown.endswith("- Gradients flow backwards through every layer")
+    assert as_summary(SUMMARY.model_dump_json()) == SUMMARY
+    assert as_summary("# Just markdown") is None
+
+
+def test_output_format_reads_flag_and_tag():
+    """Test that the format comes from the message flag, then the #markdown tag, defaulting to JSON."""
+    assert output_format([{"role": "user", "content": f"Summarize {URL}"}]) is OutputFormat.JSON
+    assert output_format([{"role": "user", "content": f"Summarize {URL} #markdown"}]) is OutputFormat.MARKDOWN
+    assert output_format([{"role": "user", "content": URL, "format": "Markdown"}]) is OutputFormat.MARKDOWN
+    assert output_format([{"role": "user", "content": f"{URL} #markdown", "format": "json"}]) is OutputFormat.JSON
+
+
+async def test_handler_returns_compact_json_or_rendered_markdown(monkeypatch):
+    """Test that structured runs request the schema and return JSON, and cache hits render markdown locally."""
+    monkeypatch.setenv("STRUCTURED_OUTPUT", "true")
+    result_cache = ResultCache(create_result_backend("memory", None), model_name="m", prompt_version="v1")
+
+    with (
+        patch("youtube_agent.main._initialized", True),
+        patch("youtube_agent.main.result_cache", result_cache),
+        patch("youtube_agent.main.scheduler", None),
+        patch("youtube_agent.main.run_agent", new_callable=AsyncMock) as mock_run,
+    ):
+        mock_run.return_value = MagicMock(content=SUMMARY, status=None)
+        answer = await handler([{"role": "user", "content": f"Summarize {URL}"}])
+        markdown = await handler([{"role": "user", "content": f"Summarize {URL}", "format": "markdown"}])
+
+    mock_run.assert_awaited_once()
+    assert mock_run.await_args.kwargs["output_schema"] is VideoSummary
+    assert json.loads(answer)["chapters"][0]["segments"][1]["title"] == "Backpropagation"
+    assert '", "' not in answer
+    assert markdown == render_markdown(SUMMARY)
+    assert as_summary(result_cache.get(AnalysisRequest(VIDEO, "summary"))) == SUMMARY
@@ -0,0 +1,190 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from youtube_agent.cache import TieredCache
+from youtube_agent.main import _summarize_chunk, run_agent
+from youtube_agent.summarize import (
+    MapReduceSummarizer,
+    TranscriptChunk,
+    build_reduce_prompt,
+    chunk_transcript,
+    format_timestamp,
+    iter_chunks,
+)
+from youtube_agent.transcripts import TranscriptCache, TranscriptSnippet
+
+
+def _snippets(count: int, seconds: float = 5.0, text: str = "some words here") -> list[TranscriptSnippet]:
+    return [TranscriptSnippet(f"{text} {i}", i * seconds, seconds) for i in range(count)]
+
+
+def test_format_timestamp():
+    """Test HH:MM:SS formatting."""
+    assert format_timestamp(0) == "00:00:00"
+    assert format_timestamp(3725.9) == "01:02:05"
+
+
+def test_chunks_are_time_aligned():
+    """Test that chunks respect the time budget and never split a snippet."""
+    snippets = _snippets(120)  # 10 minutes of video
+    chunks = chunk_transcript(snippets, max_seconds=120)
+
+    assert len(chunks) == 5
+    assert [c.start for c in chunks] == [0, 120, 240, 360, 480]
+    assert chunks[-1].end == 600
+    assert " ".join(c.text for c in chunks) == " ".join(s.text for s in snippets)
+
+
+def test_chunks_respect_char_budget():
+    """Test that a chunk is closed once it would exceed max_chars."""
+    chunks = chunk_transcript(_snippets(10, text="x" * 95), max_seconds=10_000, max_chars=300)
+
+    assert all(len(c.text) <= 300 for c in chunks)
+    assert len(chunks) == 4
+
+
+@pytest.mark.asyncio
+async def test_map_is_bounded_and_parallel():
+    """Test that latency scales with chunks / concurrency, not chunk count."""
+    in_flight = 0
+    peak = 0
+
+    async def summarize(chunk: TranscriptChunk) -> str:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return f"summary {chunk.index}"
+
+    chunks = chunk_transcript(_snippets(80), max_seconds=50)
+    started = time.perf_counter()
+    summaries = await MapReduceSummarizer(summarize, max_concurrency=4).map(chunks)
+    elapsed = time.perf_counter() - started
+
+    assert len(chunks) == 8
+    assert peak == 4
+    assert elapsed < 0.2  # two waves of 50ms, not eight
+    assert [s.summary for s in summaries] == [f"summary {i}" for i in range(8)]
+
+
+@pytest.mark.asyncio
+async def test_map_stream_pulls_chunks_lazily_and_releases_their_text():
+    """Test that the streaming map step only draws a chunk when a slot is free and keeps no chunk text."""
+    drawn = 0
+    done = 0
+    peak_held = 0
+
+    def snippets():
+        nonlocal drawn
+        for snippet in _snippets(800):
+            drawn += 1
+            yield snippet
+
+    async def summarize(chunk: TranscriptChunk) -> str:
+        nonlocal done, peak_held
+        # Snippets drawn but not yet summarized; 10 per chunk
+        peak_held = max(peak_held, drawn - done * 10)
+        await asyncio.sleep(0.01)
+        done += 1
+        return f"summary {chunk.index}"
+
+    summaries = await MapReduceSummarizer(summarize, max_concurrency=4).map_stream(
+        iter_chunks(snippets(), max_seconds=50)
+    )
+
+    assert [s.summary for s in summaries] == [f"summary {i}" for i in range(80)]
+    assert all(s.chunk.text == "" for s in summaries)
+    assert summaries[-1].chunk.end == 4000
+    # Four chunks in flight plus the first snippet of the next, never the rest of the transcript
+    assert peak_held <= 41
+
+
+@pytest.mark.asyncio
+async def test_map_failure_cancels_remaining_chunks():
+    """Test that one failed chunk call cancels its siblings and propagates."""
+    cancelled = 0
+
+    async def summarize(chunk: TranscriptChunk) -> str:
+        nonlocal cancelled
+        if chunk.index == 0:
+            error_msg = "rate limited"
+            raise RuntimeError(error_msg)
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled += 1
+            raise
+        return "never"
+
+    chunks = chunk_transcript(_snippets(40), max_seconds=50)
+    with pytest.raises(ExceptionGroup):
+        await MapReduceSummarizer(summarize, max_concurrency=8).map(chunks)
+    assert cancelled == len(chunks) - 1
+
+
+def test_reduce_prompt_keeps_time_ranges():
+    """Test that the reduce prompt lists every section with its time range."""
+    chunks = chunk_transcript(_snippets(120), max_seconds=300)
+    prompt = build_reduce_prompt([MagicMock(chunk=chunk, summary=f"- point {chunk.index}") for chunk in chunks])
+
+    assert "[00:00:00 - 00:05:00]\n- point 0" in prompt
+    assert "[00:05:00 - 00:10:00]\n- point 1" in prompt
+
+
+class _LongTranscriptProvider:
+    def __init__(self):
+        self.calls = 0
+
+    def fetch(self, video_id, languages):
+        self.calls += 1
+        return _snippets(720, text="a fairly long caption line about the lecture topic")
+
+
+@pytest.mark.asyncio
+async def test_run_agent_map_reduces_long_transcripts():
+    """Test that run_agent summarizes sections before the final agent call."""
+    messages = [{"role": "user", "content": "Summarize https://youtu.be/zjkBMFhNj_g"}]
+    mock_agent = MagicMock()
+    mock_agent.arun = AsyncMock(return_value=MagicMock(content="outline"))
+    mock_chunk_agent = MagicMock()
+    mock_chunk_agent.arun = AsyncMock(return_value=MagicMock(content="- section summary"))
+
+    with (
+        patch("youtube_agent.main.agent", mock_agent),
+        patch("youtube_agent.main.chunk_agent", mock_chunk_agent),
+        patch("youtube_agent.main.transcript_cache", TranscriptCache(_LongTranscriptProvider(), TieredCache(None))),
+        patch("youtube_agent.main.summarizer", MapReduceSummarizer(_summarize_chunk, max_concurrency=3)),
+        patch.dict("os.environ", {"LONG_TRANSCRIPT_CHARS": "1000", "MAP_REDUCE_CHUNK_SECONDS": "600"}),
+    ):
+        result = await run_agent(messages)
+
+    assert result.content == "outline"
+    assert mock_chunk_agent.arun.await_count == 6  # one hour in 10-minute sections
+    final_messages = mock_agent.arun.await_args.args[0]
+    assert final_messages[0] == messages[0]
+    assert "[00:50:00 - 01:00:00]" in final_messages[-1]["content"]
+
+
+@pytest.mark.asyncio
+async def test_run_agent_short_transcript_goes_straight_to_agent():
+    """Test that short transcripts skip the map step."""
+    messages = [{"role": "user", "content": "Summarize https://youtu.be/zjkBMFhNj_g"}]
+    mock_agent = MagicMock()
+    mock_agent.arun = AsyncMock(return_value=MagicMock(content="outline"))
+    mock_chunk_agent = MagicMock()
+    mock_chunk_agent.arun = AsyncMock()
+
+    with (
+        patch("youtube_agent.main.agent", mock_agent),
+        patch("youtube_agent.main.chunk_agent", mock_chunk_agent),
+        patch("youtube_agent.main.transcript_cache", TranscriptCache(_LongTranscriptProvider(), TieredCache(None))),
+        patch("youtube_agent.main.summarizer", MapReduceSummarizer(_summarize_chunk)),
+    ):
+        await run_agent(messages)
+
+    mock_chunk_agent.arun.assert_not_awaited()
+    mock_agent.arun.assert_awaited_once_with(messages)
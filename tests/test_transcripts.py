@@ -0,0 +1,159 @@
+from collections.abc import Sequence
+
+import pytest
+
+from youtube_agent.cache import TieredCache
+from youtube_agent.transcripts import TranscriptCache, TranscriptSnippet, extract_video_id, find_video_ids
+
+VIDEO_ID = "zjkBMFhNj_g"
+
+
+class FakeTranscriptProvider:
+    """Local transcript provider that counts upstream fetches."""
+
+    def __init__(self, fail: bool = False):
+        self.calls: list[tuple[str, tuple[str, ...]]] = []
+        self.fail = fail
+
+    def fetch(self, video_id: str, languages: Sequence[str]) -> list[TranscriptSnippet]:
+        self.calls.append((video_id, tuple(languages)))
+        if self.fail:
+            error_msg = "transcripts disabled"
+            raise RuntimeError(error_msg)
+        return [
+            TranscriptSnippet("hello and welcome", 0.0, 2.5),
+            TranscriptSnippet("today we talk about caching", 2.5, 3.0),
+        ]
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        f"https://www.youtube.com/watch?v={VIDEO_ID}",
+        f"https://youtube.com/watch?v={VIDEO_ID}&t=42s",
+        f"https://m.youtube.com/watch?feature=share&v={VIDEO_ID}",
+        f"https://youtu.be/{VIDEO_ID}?si=abc",
+        f"https://www.youtube.com/embed/{VIDEO_ID}",
+        f"https://www.youtube.com/shorts/{VIDEO_ID}",
+        f"youtube.com/live/{VIDEO_ID}",
+        VIDEO_ID,
+    ],
+)
+def test_extract_video_id_normalizes_url_forms(url):
+    """Test that every URL spelling maps to the same video ID."""
+    assert extract_video_id(url) == VIDEO_ID
+
+
+def test_extract_video_id_rejects_other_urls():
+    """Test that non-YouTube URLs and malformed IDs are rejected."""
+    assert extract_video_id("https://vimeo.com/123456") is None
+    assert extract_video_id("https://www.youtube.com/watch?v=short") is None
+
+
+def test_find_video_ids_in_free_text():
+    """Test that video IDs are extracted from natural language messages."""
+    text = f"Compare https://youtu.be/{VIDEO_ID} with (https://www.youtube.com/watch?v=aaaaaaaaaaa)."
+    assert find_video_ids(text) == [VIDEO_ID, "aaaaaaaaaaa"]
+
+
+def test_warm_request_does_not_touch_provider():
+    """Test that a second lookup for the same video is served from cache."""
+    provider = FakeTranscriptProvider()
+    cache = TranscriptCache(provider, TieredCache(None))
+
+    first = cache.get(f"https://www.youtube.com/watch?v={VIDEO_ID}")
+    second = cache.get(f"https://youtu.be/{VIDEO_ID}")
+
+    assert first == second
+    assert provider.calls == [(VIDEO_ID, ("en",))]
+    assert cache.stats()["memory_hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_languages_are_part_of_the_key():
+    """Test that different caption languages are cached separately."""
+    provider = FakeTranscriptProvider()
+    cache = TranscriptCache(provider, TieredCache(None))
+
+    cache.get(VIDEO_ID, ["en"])
+    cache.get(VIDEO_ID, ["de"])
+
+    assert len(provider.calls) == 2
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    """Test that a fresh process is served from the SQLite tier."""
+    path = tmp_path / "transcripts.sqlite3"
+    provider = FakeTranscriptProvider()
+    TranscriptCache(provider, TieredCache(path)).get(VIDEO_ID)
+
+    restarted = TranscriptCache(provider, TieredCache(path))
+    snippets = restarted.get(VIDEO_ID)
+
+    assert len(provider.calls) == 1
+    assert snippets[1].text == "today we talk about caching"
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_expired_entries_are_refetched(tmp_path):
+    """Test that TTL expiry forces a new upstream fetch."""
+    provider = FakeTranscriptProvider()
+    cache = TranscriptCache(provider, TieredCache(tmp_path / "t.sqlite3", ttl_seconds=-1))
+
+    cache.get(VIDEO_ID)
+    cache.get(VIDEO_ID)
+
+    assert len(provider.calls) == 2
+    assert cache.stats()["expirations"] >= 1
+
+
+def test_provider_errors_are_not_cached():
+    """Test that a failed fetch is retried on the next request."""
+    provider = FakeTranscriptProvider(fail=True)
+    cache = TranscriptCache(provider, TieredCache(None))
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="transcripts disabled"):
+            cache.get(VIDEO_ID)
+
+    assert len(provider.calls) == 2
+
+
+def test_memory_tier_is_lru_bounded():
+    """Test that the memory tier evicts the least recently used entry."""
+    store = TieredCache(None, max_memory_items=2)
+    store.set("a", 1)
+    store.set("b", 2)
+    store.get("a")
+    store.set("c", 3)
+
+    assert store.get("b") is None
+    assert store.get("a") == 1
+    assert store.stats.evictions == 1
+
+
+def test_disk_tier_is_size_bounded(tmp_path):
+    """Test that the disk tier drops old entries once over its byte budget."""
+    store = TieredCache(tmp_path / "t.sqlite3", max_memory_items=1, max_disk_bytes=200)
+    for i in range(10):
+        store.set(f"key-{i}", "x" * 50)
+
+    assert store.get("key-0") is None
+    assert store.get("key-9") == "x" * 50
+    assert store.stats.evictions > 0
+
+
+def test_cached_youtube_tools_use_the_cache():
+    """Test that the agent tools read captions and timestamps through the cache."""
+    from youtube_agent.tools import CachedYouTubeTools
+
+    provider = FakeTranscriptProvider()
+    tools = CachedYouTubeTools(TranscriptCache(provider, TieredCache(None)))
+    url = f"https://www.youtube.com/watch?v={VIDEO_ID}"
+
+    assert tools.get_youtube_video_captions(url) == "[00:00:00] hello and welcome today we talk about caching"
+    assert tools.get_video_timestamps(url) == "0:00 - hello and welcome\n0:02 - today we talk about caching"
+    assert tools.get_youtube_video_captions("https://example.com") == (
+        "Error getting video ID from URL, please provide a valid YouTube url"
+    )
+    assert len(provider.calls) == 1
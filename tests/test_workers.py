@@ -0,0 +1,80 @@
+import json
+import os
+import signal
+import time
+import urllib.request
+from unittest.mock import MagicMock, patch
+
+from youtube_agent.cache import TieredCache
+from youtube_agent.main import is_ready
+from youtube_agent.workers import WorkerSupervisor, serve_app
+
+
+async def _pid_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": json.dumps({"pid": os.getpid()}).encode()})
+
+
+def _serve_pid(sock, index, ready):
+    serve_app(_pid_app, sock, ready=ready, lifespan="off", log_level="warning")
+
+
+def _get_pid(port: int) -> int:
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=5) as response:
+        return json.loads(response.read())["pid"]
+
+
+def _wait_for(condition, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+
+def test_workers_share_one_port_and_crashed_workers_are_restarted():
+    """Test that every worker serves the shared port and a killed worker is replaced."""
+    supervisor = WorkerSupervisor(_serve_pid, "127.0.0.1", 0, 2, restart_backoff=0.0)
+    supervisor.start()
+    try:
+        _wait_for(supervisor.ready)
+        pids = {worker.process.pid for worker in supervisor._workers.values()}
+        assert _get_pid(supervisor.port) in pids
+
+        victim = supervisor._workers[1].process.pid
+        os.kill(victim, signal.SIGKILL)
+        _wait_for(lambda: supervisor.check() == 1)
+        _wait_for(supervisor.ready)
+
+        assert supervisor._workers[1].process.pid != victim
+        assert supervisor.stats() == {"workers": 2, "alive": 2, "restarts": 1}
+        assert _get_pid(supervisor.port) != victim
+    finally:
+        supervisor.stop()
+
+    assert supervisor.alive() == 0
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    """Test that a value written by one cache instance (one worker) is a disk hit for another."""
+    writer = TieredCache(tmp_path / "shared.sqlite3", namespace="transcripts")
+    reader = TieredCache(tmp_path / "shared.sqlite3", namespace="transcripts")
+
+    writer.set("video", {"lines": ["hello"]})
+
+    assert reader.get("video") == {"lines": ["hello"]}
+    assert reader.stats.disk_hits == 1
+    writer.close()
+    reader.close()
+
+
+def test_is_ready_waits_for_every_worker():
+    """Test that under --workers readiness comes from the supervisor, not the supervisor's own agent."""
+    supervisor = MagicMock()
+    supervisor.ready.return_value = False
+    with (
+        patch("youtube_agent.main._supervisor", supervisor),
+        patch("youtube_agent.main.port_accepts_connections", return_value=True),
+    ):
+        assert not is_ready("127.0.0.1", 3773, warmup=False)
+        supervisor.ready.return_value = True
+        assert is_ready("127.0.0.1", 3773, warmup=True)
@@ -18,9 +18,11 @@ from youtube_agent.main import (
     main,
     run_agent,
 )
+from youtube_agent.scheduler import OverloadedError
 
 __all__ = [
     "APIKeyError",
+    "OverloadedError",
     "__version__",
     "cleanup",
     "handler",
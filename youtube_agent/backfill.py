@@ -0,0 +1,328 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Offline bulk analysis of local caption files (VTT, SRT, JSON) with resumable JSONL output."""
+
+import asyncio
+import functools
+import html
+import json
+import multiprocessing
+import re
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, TextIO
+
+from youtube_agent.batch import INTENT_PROMPTS
+from youtube_agent.packing import approximate_tokens, clean_transcript, fit_to_budget
+from youtube_agent.segmentation import format_segments, segment_transcript
+from youtube_agent.transcripts import CompactTranscript, TranscriptSnippet
+
+CAPTION_SUFFIXES = (".vtt", ".srt", ".json")
+
+# "00:01:02.500 --> 00:01:05.000" (VTT) or "00:01:02,500 --> 00:01:05,000" (SRT); hours are optional in VTT
+_CUE_TIMING_RE = re.compile(
+    r"(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{1,3})\s*-->\s*(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{1,3})"
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _seconds(hours: str | None, minutes: str, seconds: str, fraction: str) -> float:
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds) + int(fraction.ljust(3, "0")) / 1000
+
+
+def parse_cues(text: str) -> list[TranscriptSnippet]:
+    """Parse WebVTT or SRT captions: every timing line and the text lines under it.
+
+    Cue numbers, the WEBVTT header, NOTE and STYLE blocks have no timing line
+    above them and are skipped; inline tags such as ``<c>`` are removed.
+    """
+    snippets: list[TranscriptSnippet] = []
+    start = end = 0.0
+    lines: list[str] | None = None
+
+    def flush() -> None:
+        if lines:
+            snippets.append(TranscriptSnippet(html.unescape(" ".join(lines)), start, max(end - start, 0.0)))
+
+    for raw in text.splitlines():
+        line = raw.strip()
+        timing = _CUE_TIMING_RE.search(line)
+        if timing is not None:
+            flush()
+            start, end = _seconds(*timing.groups()[:4]), _seconds(*timing.groups()[4:])
+            lines = []
+        elif not line:
+            flush()
+            lines = None
+        elif lines is not None:
+            lines.append(_TAG_RE.sub("", line))
+    flush()
+    return snippets
+
+
+def parse_json_captions(text: str) -> list[TranscriptSnippet]:
+    """Parse JSON captions: a list (or ``snippets``/``segments`` list) of ``{text, start, duration|end}``.
+
+    This covers youtube-transcript-api's JSON output and Whisper's segments.
+    """
+    data = json.loads(text)
+    if isinstance(data, dict):
+        data = data.get("snippets") or data.get("segments") or []
+    if not isinstance(data, list):
+        error_msg = "JSON captions must be a list of {text, start, duration} objects"
+        raise TypeError(error_msg)
+    snippets = []
+    for item in data:
+        start = float(item["start"])
+        duration = float(item["duration"]) if "duration" in item else float(item.get("end", start)) - start
+        snippets.append(TranscriptSnippet(str(item["text"]).strip(), start, max(duration, 0.0)))
+    return snippets
+
+
+def load_captions(path: Path) -> list[TranscriptSnippet]:
+    """Read a .vtt, .srt or .json caption file."""
+    text = path.read_text(encoding="utf-8-sig")
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        return parse_json_captions(text)
+    if suffix in (".vtt", ".srt"):
+        return parse_cues(text)
+    error_msg = f"Unsupported caption file {path.name}; expected one of {', '.join(CAPTION_SUFFIXES)}"
+    raise ValueError(error_msg)
+
+
+def find_caption_files(root: Path) -> list[Path]:
+    """Return every caption file under ``root``, in a stable order."""
+    return sorted(path for path in root.rglob("*") if path.is_file() and path.suffix.lower() in CAPTION_SUFFIXES)
+
+
+@dataclass(frozen=True, slots=True)
+class PreparedDocument:
+    """One caption file turned into the prompt for its analysis."""
+
+    doc_id: str
+    path: str
+    prompt: str
+    captions: int
+    prompt_tokens: int
+
+
+def build_document_prompt(doc_id: str, intent: str, segments: str) -> str:
+    """Return the analysis prompt for a local transcript, already split into topic segments."""
+    return (
+        f"{INTENT_PROMPTS.get(intent, INTENT_PROMPTS['summary'])}: {doc_id}\n\n"
+        "This transcript comes from a local caption file, so there is no video URL and no tool to call. "
+        "It has already been split into topic segments with exact start and end times below; "
+        "use them as the video's chapters.\n\n"
+        f"{segments}"
+    )
+
+
+def prepare_document(
+    path: str,
+    doc_id: str,
+    intent: str,
+    *,
+    min_segment_seconds: float = 120.0,
+    max_segments: int | None = 24,
+    max_tokens: int | None = 20000,
+) -> PreparedDocument:
+    """Parse, clean and segment one caption file into its prompt; runs in a worker process.
+
+    The transcript is prepared exactly like ``get_video_segments`` prepares a
+    fetched one: filler and caption overlaps removed, split into topic
+    segments and fitted to ``max_tokens``.
+    """
+    snippets = load_captions(Path(path))
+    cleaned = clean_transcript(CompactTranscript.from_snippets(snippets))
+    if not len(cleaned):
+        error_msg = f"No captions found in {doc_id}"
+        raise ValueError(error_msg)
+    segments = segment_transcript(
+        cleaned.snippets(), min_segment_seconds=min_segment_seconds, max_segments=max_segments
+    )
+    text, _ = fit_to_budget(
+        [segment.text for segment in segments],
+        lambda texts: format_segments([
+            replace(segment, text=body) for segment, body in zip(segments, texts, strict=True)
+        ]),
+        max_tokens,
+        approximate_tokens,
+    )
+    prompt = build_document_prompt(doc_id, intent, text)
+    return PreparedDocument(doc_id, path, prompt, len(snippets), approximate_tokens(prompt))
+
+
+def completed_documents(output: Path) -> set[str]:
+    """Return the documents ``output`` already holds a successful result for.
+
+    Failed documents are not included, so a resumed run retries them; a last
+    line cut short by a crash is ignored.
+    """
+    if not output.exists():
+        return set()
+    done = set()
+    with output.open(encoding="utf-8") as lines:
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "ok":
+                done.add(record["id"])
+    return done
+
+
+@dataclass
+class BackfillReport:
+    """Counts and throughput of one backfill run."""
+
+    total: int
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    prepare_seconds: float = 0.0
+
+    @property
+    def docs_per_second(self) -> float:
+        """Documents analysed (or failed) per second of wall time; skipped documents do not count."""
+        done = self.succeeded + self.failed
+        return done / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the report as a JSON-ready dict."""
+        return {
+            "total": self.total,
+            "skipped": self.skipped,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "prepare_seconds": round(self.prepare_seconds, 3),
+            "docs_per_second": round(self.docs_per_second, 3),
+        }
+
+
+class _Pipeline:
+    """One backfill run: a process pool preparing documents ahead of a bounded set of analyses."""
+
+    def __init__(
+        self,
+        pending: list[tuple[str, Path]],
+        analyze: Callable[[PreparedDocument], Awaitable[str]],
+        prepare: Callable[[str, str], PreparedDocument],
+        report: BackfillReport,
+        *,
+        processes: int,
+        concurrency: int,
+    ) -> None:
+        self.pending = pending
+        self.analyze = analyze
+        self.prepare = prepare
+        self.report = report
+        self.processes = processes
+        self.concurrency = concurrency
+        # Preparation may run at most this far ahead of the analyses
+        self.prepared: asyncio.Queue[PreparedDocument | None] = asyncio.Queue(maxsize=concurrency * 2)
+        self.in_flight = asyncio.Semaphore(processes * 2)
+        self.started = time.perf_counter()
+        self.sink: TextIO | None = None
+        self.pool: ProcessPoolExecutor | None = None
+
+    def finish(self, doc_id: str, path: Path, record: dict[str, Any]) -> None:
+        """Append one result and flush it, so a crash loses at most the documents in flight."""
+        self.sink.write(json.dumps({"id": doc_id, "path": str(path), **record}, ensure_ascii=False) + "\n")  # type: ignore[union-attr]
+        self.sink.flush()  # type: ignore[union-attr]
+        ok = record["status"] == "ok"
+        self.report.succeeded += int(ok)
+        self.report.failed += int(not ok)
+        self.report.elapsed_seconds = time.perf_counter() - self.started
+        done = self.report.succeeded + self.report.failed
+        print(f"{'✅' if ok else '❌'} {doc_id} ({done}/{len(self.pending)}, {self.report.docs_per_second:.2f} docs/s)")
+
+    async def prepare_one(self, doc_id: str, path: Path) -> None:
+        try:
+            started = time.perf_counter()
+            document = await asyncio.get_running_loop().run_in_executor(self.pool, self.prepare, str(path), doc_id)
+            self.report.prepare_seconds += time.perf_counter() - started
+            await self.prepared.put(document)
+        except Exception as e:
+            self.finish(doc_id, path, {"status": "error", "error": str(e) or type(e).__name__})
+        finally:
+            self.in_flight.release()
+
+    async def produce(self) -> None:
+        tasks = []
+        for doc_id, path in self.pending:
+            await self.in_flight.acquire()
+            tasks.append(asyncio.ensure_future(self.prepare_one(doc_id, path)))
+        await asyncio.gather(*tasks)
+        for _ in range(self.concurrency):
+            await self.prepared.put(None)
+
+    async def consume(self) -> None:
+        while (document := await self.prepared.get()) is not None:
+            started = time.perf_counter()
+            try:
+                record = {"status": "ok", "content": await self.analyze(document)}
+            except Exception as e:
+                record = {"status": "error", "error": str(e) or type(e).__name__}
+            record["seconds"] = round(time.perf_counter() - started, 3)
+            record["prompt_tokens"] = document.prompt_tokens
+            self.finish(document.doc_id, Path(document.path), record)
+
+    async def run(self, output: Path) -> None:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        context = multiprocessing.get_context("spawn")
+        with (
+            ProcessPoolExecutor(self.processes, mp_context=context) as self.pool,
+            output.open("a", encoding="utf-8") as self.sink,
+        ):
+            await asyncio.gather(self.produce(), *(self.consume() for _ in range(self.concurrency)))
+        self.report.elapsed_seconds = time.perf_counter() - self.started
+
+
+async def run_backfill(
+    root: Path,
+    output: Path,
+    analyze: Callable[[PreparedDocument], Awaitable[str]],
+    *,
+    intent: str = "summary",
+    files: Sequence[Path] | None = None,
+    processes: int | None = None,
+    concurrency: int = 4,
+    prepare_options: dict[str, Any] | None = None,
+) -> BackfillReport:
+    """Analyse every caption file under ``root`` and append one JSON line per document to ``output``.
+
+    Files are parsed and segmented on a pool of ``processes`` worker
+    processes and handed to ``concurrency`` analyses through a bounded
+    queue, so preparation runs ahead of the LLM calls without piling up
+    prompts in memory. Documents ``output`` already has a result for are
+    skipped, so an interrupted run resumes where it stopped.
+    """
+    files = find_caption_files(root) if files is None else list(files)
+    done = completed_documents(output)
+    pending = [(path.relative_to(root).as_posix(), path) for path in files]
+    pending = [(doc_id, path) for doc_id, path in pending if doc_id not in done]
+    report = BackfillReport(total=len(files), skipped=len(files) - len(pending))
+    pipeline = _Pipeline(
+        pending,
+        analyze,
+        functools.partial(prepare_document, intent=intent, **(prepare_options or {})),
+        report,
+        processes=processes or multiprocessing.cpu_count(),
+        concurrency=concurrency,
+    )
+    await pipeline.run(output)
+    return report
@@ -0,0 +1,237 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Batch and playlist requests: parsing, bounded fan-out and progress reporting."""
+
+import asyncio
+import json
+import re
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from youtube_agent.results import detect_intent, latest_user_text
+
+INTENT_PROMPTS: dict[str, str] = {
+    "summary": "Summarize this video",
+    "key_points": "Extract the key points of this video with timestamps",
+    "chapters": "Break this video down into chapters with timestamps",
+    "study_guide": "Create a study guide from this video",
+}
+
+_PLAYLIST_ID_RE = re.compile(r"^(?:PL|UU|LL|FL|OL|RD)[A-Za-z0-9_-]{10,}$")
+_PLAYLIST_VIDEO_RE = re.compile(r'"playlistVideoRenderer":\{"videoId":"([A-Za-z0-9_-]{11})"')
+
+
+@dataclass(frozen=True, slots=True)
+class BatchRequest:
+    """Many videos (and/or one playlist) analysed with the same intent."""
+
+    videos: tuple[str, ...]
+    intent: str = "summary"
+    playlist_id: str | None = None
+
+
+def extract_playlist_id(value: str) -> str | None:
+    """Return the playlist ID of a playlist URL (``list=``) or a bare playlist ID."""
+    value = value.strip()
+    if _PLAYLIST_ID_RE.match(value):
+        return value
+    if "://" not in value:
+        value = f"https://{value}"
+    playlist_id = parse_qs(urlparse(value).query).get("list", [None])[0]
+    if playlist_id and _PLAYLIST_ID_RE.match(playlist_id):
+        return playlist_id
+    return None
+
+
+def parse_batch_request(messages: list[dict[str, Any]]) -> BatchRequest | None:
+    """Parse a JSON batch request from the latest user message.
+
+    The message must be a JSON object with a ``videos`` list of URLs or IDs,
+    a ``playlist`` URL or ID, or both; ``intent`` (or a free-text ``prompt``)
+    picks the analysis and defaults to a summary. Anything else returns None.
+    """
+    text = latest_user_text(messages).strip()
+    if not text.startswith("{"):
+        return None
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict) or not ("videos" in data or "playlist" in data):
+        return None
+
+    videos = data.get("videos") or []
+    if not isinstance(videos, list):
+        error_msg = "Batch 'videos' must be a list of YouTube URLs or video IDs"
+        raise TypeError(error_msg)
+
+    playlist_id = None
+    if data.get("playlist"):
+        playlist_id = extract_playlist_id(str(data["playlist"]))
+        if playlist_id is None:
+            error_msg = f"Not a valid YouTube playlist URL or ID: {data['playlist']}"
+            raise ValueError(error_msg)
+
+    intent = str(data.get("intent") or "")
+    if intent not in INTENT_PROMPTS:
+        intent = detect_intent(str(data.get("prompt") or intent)) or "summary"
+
+    unique = dict.fromkeys(str(video).strip() for video in videos if str(video).strip())
+    return BatchRequest(tuple(unique), intent, playlist_id)
+
+
+def parse_playlist_page(html: str) -> list[str]:
+    """Return the video IDs listed on a playlist page, in playlist order."""
+    return list(dict.fromkeys(_PLAYLIST_VIDEO_RE.findall(html)))
+
+
+def fetch_playlist_video_ids(playlist_id: str, session: Any = None, *, timeout: float = 15.0) -> list[str]:
+    """Fetch the videos of a public playlist (the first page, up to ~100 videos)."""
+    if session is None:
+        from requests import Session
+
+        with Session() as own_session:
+            return fetch_playlist_video_ids(playlist_id, own_session, timeout=timeout)
+
+    response = session.get(
+        "https://www.youtube.com/playlist",
+        params={"list": playlist_id},
+        headers={"Accept-Language": "en-US"},
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    video_ids = parse_playlist_page(response.text)
+    if not video_ids:
+        error_msg = f"Playlist {playlist_id} is empty, private or could not be read"
+        raise ValueError(error_msg)
+    return video_ids
+
+
+@dataclass
+class BatchItem:
+    """Outcome and timing (seconds) of one video in a batch."""
+
+    index: int
+    video: str
+    status: str = "pending"
+    content: str | None = None
+    error: str | None = None
+    timings: dict[str, float] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the item as a JSON-ready dict with rounded timings."""
+        data = asdict(self)
+        data["timings"] = {name: round(seconds, 3) for name, seconds in self.timings.items()}
+        return data
+
+
+class BatchProgress:
+    """Aggregate progress of a running batch."""
+
+    def __init__(self, total: int) -> None:
+        """Start tracking a batch of ``total`` videos."""
+        self.total = total
+        self.succeeded = 0
+        self.failed = 0
+        self._started = time.perf_counter()
+
+    def record(self, item: BatchItem) -> None:
+        """Count a finished item."""
+        if item.status == "ok":
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return done/total counts, elapsed time and throughput."""
+        done = self.succeeded + self.failed
+        elapsed = time.perf_counter() - self._started
+        return {
+            "done": done,
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "elapsed_seconds": round(elapsed, 3),
+            "videos_per_minute": round(done / elapsed * 60, 2) if elapsed > 0 else 0.0,
+        }
+
+
+def format_batch_event(item: BatchItem, progress: BatchProgress) -> str:
+    """Return one JSON line announcing a finished item and the batch progress."""
+    return json.dumps({"type": "item", **item.as_dict(), "progress": progress.as_dict()}) + "\n"
+
+
+def format_batch_report(items: list[BatchItem], progress: BatchProgress) -> str:
+    """Return the final JSON report with every item in request order."""
+    ordered = sorted(items, key=lambda item: item.index)
+    return json.dumps(
+        {"type": "batch", "progress": progress.as_dict(), "items": [item.as_dict() for item in ordered]},
+        indent=2,
+    )
+
+
+async def run_batch(
+    videos: list[str],
+    analyze: Callable[[str], Awaitable[str]],
+    *,
+    prefetch: Callable[[str], Awaitable[Any]] | None = None,
+    max_concurrency: int = 4,
+    prefetch_concurrency: int = 8,
+) -> AsyncIterator[BatchItem]:
+    """Analyse ``videos`` on a bounded pool and yield each item as it finishes.
+
+    Transcripts are prefetched ahead of the analysis pool with their own,
+    wider limit, so analyses never wait on a fetch that could have started
+    earlier. A failing video is reported as an error item and does not stop
+    the rest of the batch.
+    """
+    fetch_gate = asyncio.Semaphore(prefetch_concurrency)
+    pool = asyncio.Semaphore(max_concurrency)
+    finished: asyncio.Queue[BatchItem] = asyncio.Queue()
+
+    async def fetch(video: str) -> float:
+        async with fetch_gate:
+            started = time.perf_counter()
+            await prefetch(video)  # type: ignore[misc]
+            return time.perf_counter() - started
+
+    fetches = [asyncio.ensure_future(fetch(video)) for video in videos] if prefetch is not None else []
+
+    async def process(index: int, video: str) -> None:
+        item = BatchItem(index, video)
+        started = time.perf_counter()
+        try:
+            if fetches:
+                item.timings["fetch"] = await fetches[index]
+            ready = time.perf_counter()
+            async with pool:
+                item.timings["queued"] = time.perf_counter() - ready
+                analysis_started = time.perf_counter()
+                item.content = await analyze(video)
+                item.timings["analysis"] = time.perf_counter() - analysis_started
+            item.status = "ok"
+        except Exception as e:
+            item.status = "error"
+            item.error = str(e) or type(e).__name__
+        item.timings["total"] = time.perf_counter() - started
+        finished.put_nowait(item)
+
+    tasks = [asyncio.ensure_future(process(index, video)) for index, video in enumerate(videos)]
+    try:
+        for _ in tasks:
+            yield await finished.get()
+    finally:
+        pending = [task for task in (*fetches, *tasks) if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*fetches, *tasks, return_exceptions=True)
@@ -0,0 +1,225 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Two-tier cache: an in-memory LRU in front of a persistent SQLite store."""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "youtube-agent"
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a cache instance."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hits(self) -> int:
+        """Total hits across both tiers."""
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from either tier."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters plus derived totals as a plain dict."""
+        return {**asdict(self), "hits": self.hits, "hit_rate": round(self.hit_rate, 4)}
+
+
+class TieredCache:
+    """Key/value cache with an LRU memory tier backed by SQLite.
+
+    Values must be JSON-serializable. Entries expire ``ttl_seconds`` after they
+    were written; the disk tier is additionally trimmed, least recently used
+    first, whenever its payload grows past ``max_disk_bytes``. Passing
+    ``path=None`` keeps everything in memory, which is what tests use.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None,
+        *,
+        namespace: str = "default",
+        max_memory_items: int = 256,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: float | None = 7 * 24 * 3600,
+    ) -> None:
+        """Open (or create) the cache at ``path``."""
+        self.namespace = namespace
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+
+        self._memory: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+
+        if path is not None:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Worker processes (--workers) share the file; wait for another writer's lock rather than fail
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30.0)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+
+    def _expires_at(self, now: float) -> float | None:
+        return now + self.ttl_seconds if self.ttl_seconds is not None else None
+
+    def _remember(self, key: str, expires_at: float | None, value: Any) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def get(self, key: str, default: Any = None, *, track_stats: bool = True) -> Any:
+        """Return the cached value for ``key``, or ``default`` on a miss.
+
+        Pass ``track_stats=False`` for internal probes that should not count
+        as hits or misses.
+        """
+        stats = self.stats if track_stats else CacheStats()
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    stats.memory_hits += 1
+                    return value
+                del self._memory[key]
+                self.stats.expirations += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                ).fetchone()
+                if row is not None:
+                    raw, expires_at = row
+                    if expires_at is None or expires_at > now:
+                        self._db.execute(
+                            "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                            (now, self.namespace, key),
+                        )
+                        value = json.loads(raw)
+                        self._remember(key, expires_at, value)
+                        stats.disk_hits += 1
+                        return value
+                    self._db.execute(
+                        "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                        (self.namespace, key),
+                    )
+                    self.stats.expirations += 1
+
+            stats.misses += 1
+            return default
+
+    def set(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key`` in both tiers."""
+        now = time.time()
+        expires_at = self._expires_at(now)
+        with self._lock:
+            self._remember(key, expires_at, value)
+            self.stats.writes += 1
+            if self._db is not None:
+                raw = json.dumps(value, separators=(",", ":"))
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache_entries (namespace, key, value, size, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.namespace, key, raw, len(raw), expires_at, now),
+                )
+                self._trim_disk(now)
+
+    def delete(self, key: str) -> None:
+        """Drop ``key`` from both tiers."""
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._db is not None:
+                self._db.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                )
+
+    def clear(self) -> None:
+        """Drop every entry in this namespace."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+
+    def _trim_disk(self, now: float) -> None:
+        """Remove expired rows, then least recently used rows until under budget."""
+        if self._db is None:
+            return
+        expired = self._db.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND expires_at IS NOT NULL AND expires_at <= ?",
+            (self.namespace, now),
+        ).rowcount
+        self.stats.expirations += max(expired, 0)
+
+        (total,) = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?",
+            (self.namespace,),
+        ).fetchone()
+        if total <= self.max_disk_bytes:
+            return
+
+        rows = self._db.execute(
+            "SELECT key, size FROM cache_entries WHERE namespace = ? ORDER BY accessed_at ASC",
+            (self.namespace,),
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_disk_bytes:
+                break
+            self._db.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+            self._memory.pop(key, None)
+            total -= size
+            self.stats.evictions += 1
+
+    def close(self) -> None:
+        """Close the SQLite connection, if any."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,357 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Process-wide pooled HTTP connections shared by the model, transcript and memory backends."""
+
+import asyncio
+import contextlib
+import os
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlparse
+
+import httpx
+
+from youtube_agent.stats import LatencySamples
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Connection limits and timeouts of the shared pool."""
+
+    max_connections: int = 100
+    max_connections_per_host: int = 20
+    max_keepalive_connections: int = 40
+    keepalive_expiry: float = 60.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 300.0
+    http2: bool = True
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        """Read the HTTP_* environment variables, falling back to the defaults."""
+        defaults = cls()
+        return cls(
+            max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", str(defaults.max_connections))),
+            max_connections_per_host=int(
+                os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", str(defaults.max_connections_per_host))
+            ),
+            max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE", str(defaults.max_keepalive_connections))),
+            keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_SECONDS", str(defaults.keepalive_expiry))),
+            connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT", str(defaults.connect_timeout))),
+            read_timeout=float(os.getenv("HTTP_READ_TIMEOUT", str(defaults.read_timeout))),
+            http2=os.getenv("HTTP2", "true").strip().lower() in ("1", "true", "yes", "on"),
+        )
+
+
+class PoolStats:
+    """Per-host in-flight, waiting and wait-time counters, shared by every transport of a pool."""
+
+    def __init__(self, limit_per_host: int) -> None:
+        """Start with empty counters."""
+        self.limit_per_host = limit_per_host
+        self.waits = LatencySamples()
+        self.saturated = 0
+        self._hosts: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host: str) -> dict[str, int]:
+        counters = self._hosts.get(host)
+        if counters is None:
+            counters = self._hosts[host] = {"requests": 0, "in_flight": 0, "peak_in_flight": 0, "waiting": 0}
+        return counters
+
+    def queued(self, host: str) -> None:
+        """A request for ``host`` is waiting for a connection slot."""
+        with self._lock:
+            self._host(host)["waiting"] += 1
+
+    def started(self, host: str, waited: float) -> None:
+        """A request for ``host`` got its slot after ``waited`` seconds."""
+        with self._lock:
+            counters = self._host(host)
+            counters["waiting"] -= 1
+            counters["requests"] += 1
+            counters["in_flight"] += 1
+            counters["peak_in_flight"] = max(counters["peak_in_flight"], counters["in_flight"])
+            self.waits.add(waited)
+            # Waiting at all means every slot for the host was taken
+            self.saturated += int(waited > 0.001)
+
+    def finished(self, host: str) -> None:
+        """A request for ``host`` released its slot."""
+        with self._lock:
+            self._host(host)["in_flight"] -= 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return totals, wait percentiles and per-host counters."""
+        with self._lock:
+            hosts = {host: dict(counters) for host, counters in self._hosts.items()}
+        return {
+            "limit_per_host": self.limit_per_host,
+            "requests": sum(h["requests"] for h in hosts.values()),
+            "in_flight": sum(h["in_flight"] for h in hosts.values()),
+            "waiting": sum(h["waiting"] for h in hosts.values()),
+            "saturated": self.saturated,
+            **self.waits.summary("wait"),
+            "hosts": hosts,
+        }
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """Response body that releases its host slot once it is closed."""
+
+    def __init__(self, stream: httpx.SyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release: Callable[[], None] | None = release
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    """Async response body that releases its host slot once it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release: Callable[[], None] | None = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class _HostSlots:
+    """Per-host blocking slots for the thread-based clients."""
+
+    def __init__(self, stats: PoolStats) -> None:
+        self._stats = stats
+        self._slots: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, host: str) -> Callable[[], None]:
+        """Block until ``host`` has a free slot; return the function that releases it."""
+        with self._lock:
+            slot = self._slots.get(host)
+            if slot is None:
+                slot = self._slots[host] = threading.BoundedSemaphore(self._stats.limit_per_host)
+        self._stats.queued(host)
+        started = time.perf_counter()
+        slot.acquire()
+        self._stats.started(host, time.perf_counter() - started)
+
+        def release() -> None:
+            slot.release()
+            self._stats.finished(host)
+
+        return release
+
+
+class HostLimitedTransport(httpx.BaseTransport):
+    """Caps concurrent requests per host on top of a pooled transport.
+
+    A slot is held until the response body is closed, so streamed responses
+    count against the limit for as long as they are being read.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, stats: PoolStats) -> None:
+        """Wrap ``transport``; limits and counters live in ``stats``."""
+        self._transport = transport
+        self._slots = _HostSlots(stats)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Wait for a slot for the request's host, then send it."""
+        release = self._slots.acquire(request.url.host)
+        try:
+            response = self._transport.handle_request(request)
+        except BaseException:
+            release()
+            raise
+        response.stream = _ReleasingStream(response.stream, release)  # type: ignore[arg-type]
+        return response
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self._transport.close()
+
+
+class AsyncHostLimitedTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of HostLimitedTransport."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, stats: PoolStats) -> None:
+        """Wrap ``transport``; limits and counters live in ``stats``."""
+        self._transport = transport
+        self._stats = stats
+        self._slots: dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Wait for a slot for the request's host, then send it."""
+        host = request.url.host
+        slot = self._slots.get(host)
+        if slot is None:
+            slot = self._slots[host] = asyncio.Semaphore(self._stats.limit_per_host)
+        self._stats.queued(host)
+        started = time.perf_counter()
+        try:
+            await slot.acquire()
+        except BaseException:
+            self._stats.started(host, time.perf_counter() - started)
+            self._stats.finished(host)
+            raise
+        self._stats.started(host, time.perf_counter() - started)
+
+        def release() -> None:
+            slot.release()
+            self._stats.finished(host)
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        response.stream = _AsyncReleasingStream(response.stream, release)  # type: ignore[arg-type]
+        return response
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self._transport.aclose()
+
+
+class HttpPool:
+    """One set of pooled, keep-alive connections for the whole process.
+
+    - ``async_client()``: the shared ``httpx.AsyncClient`` (HTTP/2 when the
+      server supports it) used by the OpenRouter model.
+    - ``sync_client()``: a new ``httpx.Client`` over the shared sync transport,
+      for SDKs such as mem0 that set their own base URL and headers.
+    - ``requests_adapter()``: a shared ``requests`` adapter for
+      youtube-transcript-api, which only accepts a ``requests.Session``.
+
+    Each of the three caps its concurrent requests per host at
+    ``max_connections_per_host``; requests over the cap wait for a slot, and
+    those waits are what ``stats()`` reports as saturation.
+    """
+
+    def __init__(self, config: PoolConfig | None = None) -> None:
+        """Create the pool; connections are opened lazily."""
+        self.config = config or PoolConfig()
+        self.pool_stats = PoolStats(self.config.max_connections_per_host)
+        self._async_client: httpx.AsyncClient | None = None
+        self._sync_transport: HostLimitedTransport | None = None
+        self._sync_clients: list[httpx.Client] = []
+        self._adapter: Any = None
+        self._lock = threading.Lock()
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry=self.config.keepalive_expiry,
+        )
+
+    def _timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.config.read_timeout, connect=self.config.connect_timeout)
+
+    def _http2(self) -> bool:
+        if not self.config.http2:
+            return False
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def async_client(self) -> httpx.AsyncClient:
+        """Return the shared async client, creating it on first use."""
+        with self._lock:
+            if self._async_client is None or self._async_client.is_closed:
+                transport = httpx.AsyncHTTPTransport(limits=self._limits(), http2=self._http2())
+                self._async_client = httpx.AsyncClient(
+                    transport=AsyncHostLimitedTransport(transport, self.pool_stats),
+                    timeout=self._timeout(),
+                )
+            return self._async_client
+
+    def sync_client(self, **kwargs: Any) -> httpx.Client:
+        """Return a new client over the shared sync connection pool."""
+        with self._lock:
+            if self._sync_transport is None:
+                transport = httpx.HTTPTransport(limits=self._limits(), http2=self._http2())
+                self._sync_transport = HostLimitedTransport(transport, self.pool_stats)
+            client = httpx.Client(transport=self._sync_transport, timeout=self._timeout(), **kwargs)
+            self._sync_clients.append(client)
+            return client
+
+    def requests_adapter(self) -> Any:
+        """Return the shared ``requests`` adapter; mount it on every session that should use the pool."""
+        with self._lock:
+            if self._adapter is None:
+                self._adapter = _limited_adapter(self.config, _HostSlots(self.pool_stats))
+            return self._adapter
+
+    def stats(self) -> dict[str, Any]:
+        """Return the pool's saturation counters."""
+        return self.pool_stats.stats()
+
+    async def aclose(self) -> None:
+        """Close every client and pooled connection."""
+        with self._lock:
+            async_client, self._async_client = self._async_client, None
+            sync_transport, self._sync_transport = self._sync_transport, None
+            adapter, self._adapter = self._adapter, None
+            sync_clients, self._sync_clients = self._sync_clients, []
+        if async_client is not None:
+            # Connections opened on an event loop that has since closed die with it
+            with contextlib.suppress(RuntimeError):
+                await async_client.aclose()
+        for client in sync_clients:
+            client.close()
+        if sync_transport is not None:
+            sync_transport.close()
+        if adapter is not None:
+            adapter.close()
+
+
+def _limited_adapter(config: PoolConfig, slots: _HostSlots) -> Any:
+    """Return a ``requests`` adapter whose requests count against ``slots``."""
+    # requests costs ~150 ms to import and only the transcript provider needs it
+    from requests.adapters import HTTPAdapter
+
+    class HostLimitedAdapter(HTTPAdapter):
+        def send(self, request: Any, *args: Any, **kwargs: Any) -> Any:
+            release = slots.acquire(urlparse(request.url).hostname or "")
+            try:
+                return super().send(request, *args, **kwargs)
+            finally:
+                release()
+
+    return HostLimitedAdapter(
+        pool_connections=config.max_keepalive_connections,
+        pool_maxsize=config.max_connections_per_host,
+        pool_block=True,
+    )
@@ -11,32 +11,218 @@
 
 import argparse
 import asyncio
+import datetime
+import importlib
 import json
 import os
+import socket
+import time
+from collections.abc import AsyncIterator
+from contextlib import AbstractContextManager, asynccontextmanager, nullcontext
 from pathlib import Path
 from textwrap import dedent
-from typing import Any
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlparse
 
-from agno.agent import Agent
-from agno.models.openrouter import OpenRouter
-from agno.tools.mem0 import Mem0Tools
-from agno.tools.youtube import YouTubeTools
-from bindu.penguin.bindufy import bindufy
 from dotenv import load_dotenv
 
+from youtube_agent.batch import (
+    INTENT_PROMPTS,
+    BatchProgress,
+    BatchRequest,
+    fetch_playlist_video_ids,
+    format_batch_event,
+    format_batch_report,
+    parse_batch_request,
+    run_batch,
+)
+from youtube_agent.cache import DEFAULT_CACHE_DIR, TieredCache
+from youtube_agent.metrics import PROMETHEUS_CONTENT_TYPE, MetricsRegistry, new_request_id
+from youtube_agent.packing import PackedTranscript, PackingStats, clean_transcript, get_token_counter
+from youtube_agent.results import (
+    AnalysisRequest,
+    CacheMode,
+    OutputFormat,
+    ResultCache,
+    cache_mode,
+    create_result_backend,
+    detect_intent,
+    latest_user_text,
+    output_format,
+    parse_analysis_request,
+    prompt_fingerprint,
+)
+from youtube_agent.routing import ModelRouter, Route, RouteDecision, parse_routes
+from youtube_agent.scheduler import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+    AdmissionScheduler,
+    parse_tpm_budgets,
+)
+from youtube_agent.search import TranscriptIndex, TranscriptLookup, format_hits, parse_lookup
+from youtube_agent.sessions import FOLLOWUP_INSTRUCTIONS, SessionStore, build_followup_prompt
+from youtube_agent.singleflight import SingleFlight
+from youtube_agent.status import StatusServer, port_accepts_connections
+from youtube_agent.streaming import StreamedResult, StreamStats, streaming_enabled
+from youtube_agent.summarize import (
+    MapReduceSummarizer,
+    TranscriptChunk,
+    build_chunk_prompt,
+    build_reduce_prompt,
+    iter_chunks,
+    transcript_length,
+)
+from youtube_agent.transcripts import (
+    CompactTranscript,
+    TranscriptCache,
+    YouTubeTranscriptProvider,
+    extract_video_id,
+    find_video_ids,
+)
+
+# agno, bindu and mem0 take seconds to import; they are imported where first needed so the
+# process starts (and answers health checks) quickly, and mem0 is never loaded without MEM0_API_KEY
+if TYPE_CHECKING:
+    from agno.agent import Agent
+    from agno.run.agent import RunOutput
+
+    from youtube_agent.backfill import BackfillReport, PreparedDocument
+    from youtube_agent.http_pool import HttpPool
+    from youtube_agent.memory import CachedMem0Tools
+    from youtube_agent.models import InstrumentedOpenRouter
+    from youtube_agent.resilience import Upstream
+    from youtube_agent.spill import SpillStore
+    from youtube_agent.structured import VideoSummary
+    from youtube_agent.workers import WorkerSupervisor
+
 # Load environment variables from .env file
 load_dotenv()
 
 # Global instances
-agent: Agent | None = None
+agent: "Agent | None" = None
+chunk_agent: "Agent | None" = None
+followup_agent: "Agent | None" = None
+transcript_cache: TranscriptCache | None = None
+transcript_index: TranscriptIndex | None = None
+summarizer: MapReduceSummarizer | None = None
+result_cache: ResultCache | None = None
+session_store: SessionStore | None = None
+scheduler: AdmissionScheduler | None = None
+_model_name: str | None = None
 _initialized = False
 _init_lock = asyncio.Lock()
+_inflight = SingleFlight()
+_stream_stats = StreamStats()
+_packing_stats = PackingStats()
+_metrics = MetricsRegistry()
+_http_pool: "HttpPool | None" = None
+_memory_tools: "CachedMem0Tools | None" = None
+_supervisor: "WorkerSupervisor | None" = None
+_router: ModelRouter | None = None
+_agents: dict[str, "Agent"] = {}
+_upstreams: dict[str, "Upstream"] = {}
+_spill: "SpillStore | None" = None
+
+# Token estimate for a run whose transcript size is unknown (prompt + outline)
+DEFAULT_ESTIMATED_TOKENS = 4000
+
+# Name of the transcript backend's guard in _upstreams; models are guarded under their IDs
+TRANSCRIPT_UPSTREAM = "youtube"
 
 
 class APIKeyError(ValueError):
     """API key is missing."""
 
 
+AGENT_DESCRIPTION = dedent("""\
+    You are an expert YouTube content analyst with a keen eye for detail! 🎓
+
+    You specialize in analyzing YouTube videos and creating structured summaries
+    with accurate timestamps to make video content easily navigable and searchable.
+""")
+
+AGENT_INSTRUCTIONS = dedent("""\
+    YOUTUBE ANALYSIS PROCESS:
+
+    1. VIDEO OVERVIEW 📋
+       - Extract video metadata: title, duration, upload date
+       - Identify video type: tutorial, review, lecture, documentary, etc.
+       - Determine target audience and content difficulty level
+       - Note the presenter's style and approach
+
+    2. CONTENT EXTRACTION 🎬
+       - Call get_video_segments to fetch the transcript already split into topic segments
+       - To find where a specific topic is mentioned, call search_video_transcript instead
+       - Identify main themes and recurring topics
+       - Note key demonstrations, examples, and practical content
+       - Extract important references, resources, or links mentioned
+
+    3. TIMESTAMP CREATION ⏱️
+       - Use the segment boundaries from get_video_segments as the major topic transitions
+       - Give each segment a short title and summary; never invent other timestamps
+       - Highlight key moments: demonstrations, code examples, important explanations
+       - Format: [start_time, end_time, detailed_summary] using the segment times as given
+
+    4. STRUCTURED ORGANIZATION 🏗️
+       - Group related segments into logical sections
+       - Identify main themes and track topic progression
+       - Create hierarchical structure: Chapters → Sections → Key Points
+       - Include content type indicators with relevant emojis:
+         📚 Educational | 💻 Technical | 🎮 Gaming | 📱 Tech Review | 🎨 Creative
+         🧪 Science | 📈 Business | 🎭 Entertainment | 🏋️ Fitness | 🍳 Cooking
+
+    5. QUALITY ASSURANCE ✅
+       - Verify timestamp accuracy against transcript
+       - Ensure comprehensive coverage of video content
+       - Maintain consistent detail level throughout analysis
+       - Focus on valuable content markers and learning points
+       - Include practical takeaways and actionable insights
+
+    6. OUTPUT FORMATTING ✨
+       - Begin with comprehensive video overview
+       - Use clear, descriptive segment titles
+       - Include timestamps in HH:MM:SS format
+       - Highlight key learning points with bullet points
+       - Note practical demonstrations and important references
+       - Mark content difficulty and prerequisites when relevant
+
+    SPECIALIZED ANALYSIS GUIDELINES:
+    - For tutorials: Focus on step-by-step processes and code examples
+    - For lectures: Emphasize theoretical concepts and key arguments
+    - For reviews: Highlight product features, pros/cons, comparisons
+    - For documentaries: Track chronological events and key facts
+    - For vlogs/podcasts: Identify main discussion points and insights
+
+    ALWAYS:
+    - Respect content creators and provide accurate representations
+    - Note video length to help users plan their viewing
+    - Include content warnings if video contains sensitive material
+    - Acknowledge limitations when transcripts are incomplete
+""")
+
+# How the tool-calling steps above read for an agent without tools, which is given the segments in its prompt
+_TOOL_LESS_STEPS = {
+    "   - Call get_video_segments to fetch the transcript already split into topic segments\n": (
+        "   - Read the transcript given in the prompt, already split into topic segments\n"
+    ),
+    "   - To find where a specific topic is mentioned, call search_video_transcript instead\n": "",
+    "   - Use the segment boundaries from get_video_segments as the major topic transitions\n": (
+        "   - Use the given segment boundaries as the major topic transitions\n"
+    ),
+}
+
+
+def _analysis_instructions(tools: list) -> str:
+    """Return the analysis instructions, without the tool-calling steps for an agent that has no tools."""
+    if tools:
+        return AGENT_INSTRUCTIONS
+    instructions = AGENT_INSTRUCTIONS
+    for step, replacement in _TOOL_LESS_STEPS.items():
+        instructions = instructions.replace(step, replacement)
+    return instructions
+
+
 def load_config() -> dict:
     """Load agent configuration from project root."""
     possible_paths = [
@@ -94,8 +280,86 @@ def _get_api_keys() -> tuple[str | None, str | None, str]:
     return openrouter_api_key, mem0_api_key, model_name
 
 
-def _create_llm_model(openrouter_api_key: str, model_name: str) -> OpenRouter:
+def _get_http_pool() -> "HttpPool":
+    """Return the process-wide HTTP connection pool, creating it on first use."""
+    from youtube_agent.http_pool import HttpPool, PoolConfig
+
+    global _http_pool
+
+    if _http_pool is None:
+        _http_pool = HttpPool(PoolConfig.from_env())
+    return _http_pool
+
+
+def _get_spill_store() -> "SpillStore | None":
+    """Return the store large tool outputs are spilled to, or None with SPILL_TOOL_OUTPUT_CHARS=0."""
+    from youtube_agent.spill import SpillStore
+
+    global _spill
+
+    max_chars = int(os.getenv("SPILL_TOOL_OUTPUT_CHARS", "16000"))
+    if _spill is None and max_chars > 0:
+        _spill = SpillStore(max_chars=max_chars)
+    return _spill
+
+
+def _spill_scope() -> AbstractContextManager[None]:
+    """Return a context that deletes the tool outputs one agent run spilled once the run ends."""
+    return _spill.scope() if _spill is not None else nullcontext()
+
+
+def _upstream(name: str) -> "Upstream":
+    """Return the deadline, retry, hedging and circuit-breaker guard of one upstream.
+
+    Each model ID gets its own guard (so an open circuit sends routed
+    requests to the fallback model); TRANSCRIPT_UPSTREAM guards YouTube.
+    Only model calls are hedged.
+    """
+    from youtube_agent.resilience import CircuitBreaker, Hedger, RetryPolicy, Upstream
+
+    if name in _upstreams:
+        return _upstreams[name]
+
+    stage = "TRANSCRIPT" if name == TRANSCRIPT_UPSTREAM else "LLM"
+    hedger = None
+    hedge_percentile = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95"))
+    if stage == "LLM" and hedge_percentile:
+        hedger = Hedger(
+            percentile=hedge_percentile,
+            min_samples=int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20")),
+            min_delay=float(os.getenv("LLM_HEDGE_MIN_SECONDS", "1")),
+            max_ratio=float(os.getenv("LLM_HEDGE_MAX_RATIO", "0.1")),
+        )
+    _upstreams[name] = Upstream(
+        name,
+        breaker=CircuitBreaker(
+            name,
+            failure_threshold=int(os.getenv("CIRCUIT_FAILURES", "5")),
+            reset_seconds=float(os.getenv("CIRCUIT_RESET_SECONDS", "30")),
+        ),
+        retry=RetryPolicy(
+            attempts=int(os.getenv(f"{stage}_RETRIES", "2")) + 1,
+            base_delay=float(os.getenv("RETRY_BASE_SECONDS", "0.25")),
+        ),
+        hedger=hedger,
+        deadline=float(os.getenv(f"{stage}_DEADLINE_SECONDS", "120" if stage == "LLM" else "30")) or None,
+    )
+    return _upstreams[name]
+
+
+def _volatile_context() -> str:
+    """Return the per-call context appended after the static system prompt.
+
+    Only the date is given, not the time, so the whole prompt is identical
+    for a day and its cached prefix covers every earlier message too.
+    """
+    return f"The current date is {datetime.date.today().isoformat()}."
+
+
+def _create_llm_model(openrouter_api_key: str, model_name: str) -> "InstrumentedOpenRouter":
     """Create and return the OpenRouter model."""
+    from youtube_agent.models import InstrumentedOpenRouter
+
     if not openrouter_api_key:
         error_msg = (
             "OpenRouter API key is required. Set OPENROUTER_API_KEY environment variable.\n"
@@ -103,23 +367,180 @@ def _create_llm_model(openrouter_api_key: str, model_name: str) -> OpenRouter:
         )
         raise APIKeyError(error_msg)
 
-    return OpenRouter(
+    return InstrumentedOpenRouter(
         id=model_name,
         api_key=openrouter_api_key,
-        cache_response=True,
+        base_url=os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
+        # No agno response cache: with a stable prompt it would answer every repeat from disk, forever,
+        # ignoring the result cache's refresh/bypass modes
         supports_native_structured_outputs=True,
+        metrics=_metrics,
+        upstream=_upstream(model_name),
+        volatile_context=_volatile_context,
+        spill=_get_spill_store(),
+        # The upstream guard retries with jitter and counts failures towards the circuit
+        max_retries=0,
+        http_client=_get_http_pool().async_client(),
     )
 
 
-def _setup_tools(mem0_api_key: str | None) -> list:
+def _create_router(model_name: str) -> ModelRouter | None:
+    """Create the model router from MODEL_ROUTES and FALLBACK_MODEL, or None when neither is set."""
+    routes = parse_routes(os.getenv("MODEL_ROUTES"))
+    fallback = os.getenv("FALLBACK_MODEL") or None
+    if not routes and fallback is None:
+        return None
+    # MODEL_NAME takes whatever no configured route accepts
+    return ModelRouter(
+        [*routes, Route(model_name)],
+        fallback=fallback,
+        slow_seconds=float(os.getenv("MODEL_SLOW_SECONDS", "60")) or None,
+        max_error_rate=float(os.getenv("MODEL_MAX_ERROR_RATE", "0.5")),
+        probe_seconds=float(os.getenv("MODEL_PROBE_SECONDS", "30")),
+    )
+
+
+def _cache_dir() -> Path:
+    """Return the directory holding the on-disk caches."""
+    return Path(os.getenv("YOUTUBE_AGENT_CACHE_DIR", str(DEFAULT_CACHE_DIR))).expanduser()
+
+
+def _create_transcript_cache() -> TranscriptCache:
+    """Create the transcript cache that sits in front of youtube-transcript-api."""
+    store = TieredCache(
+        _cache_dir() / "transcripts.sqlite3",
+        namespace="transcripts",
+        max_memory_items=int(os.getenv("TRANSCRIPT_CACHE_MEMORY_ITEMS", "128")),
+        max_disk_bytes=int(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "512")) * 1024 * 1024,
+        ttl_seconds=float(os.getenv("TRANSCRIPT_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+    )
+    return TranscriptCache(
+        YouTubeTranscriptProvider(adapter=_get_http_pool().requests_adapter()),
+        store,
+        on_load=_index_transcript if transcript_index is not None else None,
+        upstream=_upstream(TRANSCRIPT_UPSTREAM),
+    )
+
+
+def _create_transcript_index() -> TranscriptIndex | None:
+    """Create the full-text index of fetched transcripts, or None when TRANSCRIPT_INDEX=false."""
+    if os.getenv("TRANSCRIPT_INDEX", "true").strip().lower() not in ("1", "true", "yes", "on"):
+        return None
+    return TranscriptIndex(
+        _cache_dir() / "transcript_index.sqlite3",
+        passage_seconds=float(os.getenv("TRANSCRIPT_INDEX_PASSAGE_SECONDS", "20")),
+    )
+
+
+def _index_transcript(video_id: str, transcript: CompactTranscript) -> None:
+    """Add a loaded transcript to the full-text index; indexing errors never fail the fetch."""
+    if transcript_index is None:
+        return
+    try:
+        added = transcript_index.add(video_id, transcript)
+    except Exception as e:
+        print(f"⚠️  Could not index transcript of {video_id}: {e}")
+        return
+    if added:
+        print(f"🔎 Indexed {added} passages of {video_id}")
+
+
+def _structured_output() -> bool:
+    """Return True when analyses are generated as a typed VideoSummary (STRUCTURED_OUTPUT=true)."""
+    return os.getenv("STRUCTURED_OUTPUT", "false").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _as_structured(content: Any) -> "VideoSummary | None":
+    """Return ``content`` as a VideoSummary in structured-output mode, otherwise None."""
+    if not _structured_output():
+        return None
+    from youtube_agent.structured import as_summary
+
+    return as_summary(content)
+
+
+def _create_result_cache(model_name: str) -> ResultCache | None:
+    """Create the final-result cache, or None when RESULT_CACHE_BACKEND=off."""
+    backend = create_result_backend(
+        os.getenv("RESULT_CACHE_BACKEND", "sqlite"),
+        _cache_dir(),
+        ttl_seconds=float(os.getenv("RESULT_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+    )
+    if backend is None:
+        return None
+    schema = None
+    if _structured_output():
+        from youtube_agent.structured import VideoSummary
+
+        # Structured and markdown analyses of the same video are different results
+        schema = json.dumps(VideoSummary.model_json_schema(), sort_keys=True)
+    return ResultCache(
+        backend,
+        model_name=model_name,
+        prompt_version=prompt_fingerprint(AGENT_DESCRIPTION, AGENT_INSTRUCTIONS, schema),
+    )
+
+
+def _create_session_store() -> SessionStore | None:
+    """Create the per-conversation analysis store, or None when FOLLOWUP_ANSWERS=false."""
+    if os.getenv("FOLLOWUP_ANSWERS", "true").strip().lower() not in ("1", "true", "yes", "on"):
+        return None
+    return SessionStore(
+        TieredCache(
+            _cache_dir() / "sessions.sqlite3",
+            namespace="sessions",
+            max_memory_items=int(os.getenv("SESSION_MEMORY_ITEMS", "256")),
+            ttl_seconds=float(os.getenv("SESSION_TTL_SECONDS", str(24 * 3600))),
+        )
+    )
+
+
+def _is_cacheable_result(result: Any) -> bool:
+    """Return True for runs with non-empty content that did not error, pause or get cancelled."""
+    status = getattr(result, "status", None)
+    if str(getattr(status, "value", status)).upper() in ("ERROR", "CANCELLED", "PAUSED"):
+        return False
+    return bool(getattr(result, "content", None))
+
+
+def _record_packing(url: str, packed: PackedTranscript) -> None:
+    """Report the prompt tokens a transcript tool call saved."""
+    _packing_stats.record(packed.tokens_before, packed.tokens_after, truncated=packed.truncated)
+    print(
+        f"🗜️  Packed transcript for {url}: {packed.tokens_before} → {packed.tokens_after} tokens "
+        f"({packed.tokens_saved} saved{', truncated to budget' if packed.truncated else ''})"
+    )
+
+
+def _setup_tools(mem0_api_key: str | None, model_name: str | None = None) -> list:
     """Set up all tools for the YouTube agent."""
+    from youtube_agent.tools import CachedYouTubeTools
+
+    global transcript_cache, transcript_index, _memory_tools
+
     tools = []
 
-    # YouTubeTools for video analysis
+    # YouTubeTools for video analysis, served through the transcript cache
     try:
-        youtube_tools = YouTubeTools()
+        transcript_index = _create_transcript_index()
+        transcript_cache = _create_transcript_cache()
+        youtube_tools = CachedYouTubeTools(
+            transcript_cache,
+            # Segments carry exact chapter times, so the per-line timestamp dump is not offered
+            enable_get_video_timestamps=False,
+            min_segment_seconds=float(os.getenv("SEGMENT_MIN_SECONDS", "120")),
+            max_segments=int(os.getenv("SEGMENT_MAX_COUNT", "24")),
+            max_prompt_tokens=int(os.getenv("TRANSCRIPT_MAX_TOKENS", "20000")) or None,
+            count_tokens=get_token_counter(model_name),
+            on_pack=_record_packing,
+            transcript_index=transcript_index,
+            search_hits=int(os.getenv("TRANSCRIPT_SEARCH_HITS", "5")),
+        )
         tools.append(youtube_tools)
         print("🎬 YouTube analysis enabled for video transcripts and metadata")
+        print(f"🗄️  Transcript cache enabled at {_cache_dir()}")
+        if transcript_index is not None:
+            print("🔎 Transcript search enabled for where-is-it-mentioned questions")
     except Exception as e:
         print(f"❌ Failed to initialize YouTubeTools: {e}")
         raise
@@ -127,18 +548,46 @@ def _setup_tools(mem0_api_key: str | None) -> list:
     # Mem0 is optional for conversation memory
     if mem0_api_key:
         try:
-            mem0_tools = Mem0Tools(api_key=mem0_api_key)
-            tools.append(mem0_tools)
-            print("🧠 Mem0 memory system enabled for conversation context")
+            from youtube_agent.memory import CachedMem0Tools, RecallCache, create_mem0_backend
+
+            # Writes are queued and sent in the background; repeat searches are answered locally
+            _memory_tools = CachedMem0Tools(
+                create_mem0_backend(mem0_api_key, _get_http_pool().sync_client()),
+                recall=RecallCache(min_score=float(os.getenv("MEMORY_RECALL_MIN_SCORE", "0.5"))),
+                max_batch=int(os.getenv("MEMORY_WRITE_BATCH", "16")),
+                flush_interval=float(os.getenv("MEMORY_FLUSH_SECONDS", "0.5")),
+            )
+            tools.append(_memory_tools)
+            print("🧠 Mem0 memory system enabled for conversation context (write-behind, local recall)")
         except Exception as e:
             print(f"⚠️  Mem0 initialization issue: {e}")
 
     return tools
 
 
+def _create_analysis_agent(model: "InstrumentedOpenRouter", tools: list) -> "Agent":
+    """Create a YouTube analysis agent on ``model``; routed models share one set of tools."""
+    from agno.agent import Agent
+
+    return Agent(
+        name="YouTube Video Analyst",
+        model=model,
+        tools=tools,
+        # Times every YouTube and Mem0 tool call as a "tool" stage; the model reads spilled results back
+        tool_hooks=[_metrics.tool_hook, *([model.spill.tool_hook] if model.spill is not None else [])],
+        # No timestamp in here: the system message stays byte-stable, so providers can cache it.
+        # The model appends the current date after it (see _volatile_context).
+        description=AGENT_DESCRIPTION,
+        instructions=_analysis_instructions(tools),
+        markdown=True,
+    )
+
+
 async def initialize_agent() -> None:
     """Initialize the YouTube analysis agent."""
-    global agent
+    from agno.agent import Agent
+
+    global agent, chunk_agent, followup_agent, summarizer, result_cache, session_store, scheduler, _model_name, _router
 
     openrouter_api_key, mem0_api_key, model_name = _get_api_keys()
 
@@ -151,80 +600,49 @@ async def initialize_agent() -> None:
         raise APIKeyError(error_msg)
 
     model = _create_llm_model(openrouter_api_key, model_name)
-    tools = _setup_tools(mem0_api_key)
-
-    # Create the YouTube analysis agent
-    agent = Agent(
-        name="YouTube Video Analyst",
+    tools = _setup_tools(mem0_api_key, model_name)
+
+    # Create the YouTube analysis agent, plus one per routed model so routing never builds one mid-request
+    agent = _create_analysis_agent(model, tools)
+    _agents[model_name] = agent
+    _router = _create_router(model_name)
+    if _router is not None:
+        for routed_model in _router.models:
+            if routed_model not in _agents:
+                _agents[routed_model] = _create_analysis_agent(
+                    _create_llm_model(openrouter_api_key, routed_model), tools
+                )
+        print(f"🧭 Model routing across {', '.join(_router.models)}")
+
+    # Tool-less agent for the map step of long transcripts
+    chunk_agent = Agent(
+        name="YouTube Transcript Section Summarizer",
         model=model,
-        tools=tools,
-        description=dedent("""\
-            You are an expert YouTube content analyst with a keen eye for detail! 🎓
-
-            You specialize in analyzing YouTube videos and creating structured summaries
-            with accurate timestamps to make video content easily navigable and searchable.
-        """),
-        instructions=dedent("""\
-            YOUTUBE ANALYSIS PROCESS:
-
-            1. VIDEO OVERVIEW 📋
-               - Extract video metadata: title, duration, upload date
-               - Identify video type: tutorial, review, lecture, documentary, etc.
-               - Determine target audience and content difficulty level
-               - Note the presenter's style and approach
-
-            2. CONTENT EXTRACTION 🎬
-               - Fetch and analyze full video transcript
-               - Identify main themes and recurring topics
-               - Note key demonstrations, examples, and practical content
-               - Extract important references, resources, or links mentioned
-
-            3. TIMESTAMP CREATION ⏱️
-               - Create precise, meaningful timestamps for major topic transitions
-               - Focus on content that provides educational or practical value
-               - Highlight key moments: demonstrations, code examples, important explanations
-               - Format: [start_time, end_time, detailed_summary]
-               - Ensure timestamp accuracy and avoid hallucination
-
-            4. STRUCTURED ORGANIZATION 🏗️
-               - Group related segments into logical sections
-               - Identify main themes and track topic progression
-               - Create hierarchical structure: Chapters → Sections → Key Points
-               - Include content type indicators with relevant emojis:
-                 📚 Educational | 💻 Technical | 🎮 Gaming | 📱 Tech Review | 🎨 Creative
-                 🧪 Science | 📈 Business | 🎭 Entertainment | 🏋️ Fitness | 🍳 Cooking
-
-            5. QUALITY ASSURANCE ✅
-               - Verify timestamp accuracy against transcript
-               - Ensure comprehensive coverage of video content
-               - Maintain consistent detail level throughout analysis
-               - Focus on valuable content markers and learning points
-               - Include practical takeaways and actionable insights
-
-            6. OUTPUT FORMATTING ✨
-               - Begin with comprehensive video overview
-               - Use clear, descriptive segment titles
-               - Include timestamps in HH:MM:SS format
-               - Highlight key learning points with bullet points
-               - Note practical demonstrations and important references
-               - Mark content difficulty and prerequisites when relevant
-
-            SPECIALIZED ANALYSIS GUIDELINES:
-            - For tutorials: Focus on step-by-step processes and code examples
-            - For lectures: Emphasize theoretical concepts and key arguments
-            - For reviews: Highlight product features, pros/cons, comparisons
-            - For documentaries: Track chronological events and key facts
-            - For vlogs/podcasts: Identify main discussion points and insights
-
-            ALWAYS:
-            - Respect content creators and provide accurate representations
-            - Note video length to help users plan their viewing
-            - Include content warnings if video contains sensitive material
-            - Acknowledge limitations when transcripts are incomplete
-        """),
-        add_datetime_to_context=True,
+        description="You summarize one time-aligned section of a YouTube video transcript.",
+        instructions="Be concise and factual. Only describe what is said in the given section.",
+        markdown=False,
+    )
+    # Tool-less agent for follow-ups, answered from the stored analysis and a few transcript excerpts
+    followup_agent = Agent(
+        name="YouTube Follow-up Answerer",
+        model=model,
+        instructions=FOLLOWUP_INSTRUCTIONS,
         markdown=True,
     )
+    session_store = _create_session_store()
+    summarizer = MapReduceSummarizer(
+        _summarize_chunk,
+        max_concurrency=int(os.getenv("MAP_REDUCE_CONCURRENCY", "4")),
+    )
+
+    # Routed answers may come from any model in the pool, so the pool is part of the cache key
+    result_cache = _create_result_cache(model_name if _router is None else ",".join(_router.models))
+    scheduler = AdmissionScheduler(
+        max_workers=int(os.getenv("MAX_CONCURRENT_RUNS", "8")),
+        max_queue_depth=int(os.getenv("MAX_QUEUE_DEPTH", "64")),
+        tpm_budgets=parse_tpm_budgets(os.getenv("MODEL_TPM_BUDGETS")),
+    )
+    _model_name = model_name
 
     print(f"✅ YouTube analysis agent initialized using {model_name}")
     print("🎬 YouTube video analysis enabled")
@@ -232,34 +650,714 @@ async def initialize_agent() -> None:
         print("🧠 Memory system enabled for conversation context")
 
 
-async def run_agent(messages: list[dict[str, str]]) -> Any:
-    """Run the agent with the given messages."""
-    global agent
+async def _summarize_chunk(chunk: TranscriptChunk) -> str:
+    """Summarize one transcript chunk with the map-step agent."""
+    if not chunk_agent:
+        error_msg = "Agent not initialized"
+        raise RuntimeError(error_msg)
+
+    response = await chunk_agent.arun(build_chunk_prompt(chunk))  # type: ignore[invalid-await]
+    return str(response.content or "")
+
+
+async def _fetch_transcript(video: str) -> CompactTranscript:
+    """Fetch a transcript through the transcript cache, within the transcript stage's deadline."""
+    from youtube_agent.resilience import within
+
+    if transcript_cache is None:
+        error_msg = "Transcript cache not initialized"
+        raise RuntimeError(error_msg)
+    with _metrics.span("transcript_fetch"):
+        return await within(
+            asyncio.to_thread(transcript_cache.get_compact, video),
+            _upstream(TRANSCRIPT_UPSTREAM).deadline,
+            "transcript fetch",
+        )
+
+
+async def _prepare_long_transcript(messages: list[dict[str, str]]) -> list[dict[str, str]] | None:
+    """Map-summarize the requested video if its transcript is too long for one prompt.
+
+    Returns the messages for the reduce step, or None when the request should go
+    straight to the agent (no single video, short transcript, or fetch error that
+    the agent's own tools should report).
+    """
+    if transcript_cache is None or summarizer is None:
+        return None
+
+    video_ids = find_video_ids(latest_user_text(messages))
+    if len(video_ids) != 1:
+        return None
+
+    try:
+        transcript = await _fetch_transcript(video_ids[0])
+    except Exception:
+        return None
+
+    # Map prompts get the same filler and overlap cleanup as the agent's tools, off the event loop like the fetch
+    cleaned = await asyncio.to_thread(clean_transcript, transcript)
+    length = await asyncio.to_thread(transcript_length, cleaned.iter_snippets())
+    if length <= int(os.getenv("LONG_TRANSCRIPT_CHARS", "60000")):
+        return None
+
+    # Snippets and sections are generated as the map step asks for them, and each section's text is
+    # released once it is summarized, so a ten-hour stream needs no more memory than a one-hour video
+    chunks = iter_chunks(cleaned.iter_snippets(), max_seconds=float(os.getenv("MAP_REDUCE_CHUNK_SECONDS", "600")))
+    with _metrics.span("map"):
+        summaries = await summarizer.map_stream(chunks)
+    print(f"🧩 Long transcript: summarized {len(summaries)} sections in parallel")
+    return [*messages, {"role": "user", "content": build_reduce_prompt(summaries)}]
+
+
+def _cleaned_length(transcript: CompactTranscript) -> int:
+    """Return the length of the transcript the agent's tools will send, after cleanup."""
+    return transcript_length(clean_transcript(transcript).iter_snippets())
+
+
+async def _route(messages: list[dict[str, str]]) -> RouteDecision | None:
+    """Pick the model for a request from its transcript length and intent; None without a router.
+
+    The transcript is fetched here so routing sees its real length; the
+    agent's tools then read it from the transcript cache.
+    """
+    if _router is None:
+        return None
+
+    text = latest_user_text(messages)
+    video_ids = find_video_ids(text)
+    transcript_chars = None
+    if transcript_cache is not None and len(video_ids) == 1:
+        try:
+            transcript = await _fetch_transcript(video_ids[0])
+            transcript_chars = await asyncio.to_thread(_cleaned_length, transcript)
+        except Exception:
+            # Let the agent's own tools report the fetch error
+            transcript_chars = None
+
+    decision = _router.choose(transcript_chars, detect_intent(text))
+    print(f"🧭 Routed {video_ids[0] if len(video_ids) == 1 else 'request'} to {decision.model} ({decision.reason})")
+    return decision
+
+
+def _run_failed(result: Any) -> bool:
+    """Return True if an agent run reported an error instead of raising it."""
+    status = getattr(result, "status", None)
+    return str(getattr(status, "value", status)).upper() == "ERROR"
+
+
+def _routed_agents(route: RouteDecision | None) -> list[tuple[str | None, "Agent"]]:
+    """Return the (model, agent) pairs to try for a request, the fallback last."""
+    if route is None:
+        return [(None, agent)]  # type: ignore[list-item]
+    models = [route.model] if route.fallback is None else [route.model, route.fallback]
+    return [(model, _agents.get(model, agent)) for model in models]  # type: ignore[misc]
+
+
+def _record_route(route: RouteDecision | None, model: str | None, started: float, *, failed: bool) -> None:
+    """Feed a routed run's latency and outcome back into the router and log it."""
+    if _router is None or route is None or model is None:
+        return
+    seconds = time.perf_counter() - started
+    _router.record(route, model, seconds, error=failed)
+    print(f"🧭 {model} {'failed' if failed else 'answered'} in {seconds:.2f}s")
+
+
+async def run_agent(
+    messages: list[dict[str, str]], route: RouteDecision | None = None, *, output_schema: Any = None
+) -> Any:
+    """Run the agent with the given messages, on the routed model when ``route`` is given.
+
+    A routed run that raises or reports an error is retried once on the
+    route's fallback model, as is one that misses the AGENT_DEADLINE_SECONDS
+    deadline. With ``output_schema`` the run's content is an instance of that
+    schema instead of markdown.
+    """
+    from youtube_agent.resilience import within
 
     if not agent:
         error_msg = "Agent not initialized"
         raise RuntimeError(error_msg)
 
-    return await agent.arun(messages)  # type: ignore[invalid-await]
+    reduce_messages = await _prepare_long_transcript(messages)
+    candidates = _routed_agents(route)
+    for attempt, (model, routed_agent) in enumerate(candidates):
+        last = attempt == len(candidates) - 1
+        started = time.perf_counter()
+        try:
+            with _metrics.span("agent_run", **({"model": model} if model else {})), _spill_scope():
+                result = await within(
+                    routed_agent.arun(  # type: ignore[arg-type]
+                        reduce_messages or messages, **({"output_schema": output_schema} if output_schema else {})
+                    ),
+                    float(os.getenv("AGENT_DEADLINE_SECONDS", "600")) or None,
+                    "agent run",
+                )
+        except Exception:
+            _record_route(route, model, started, failed=True)
+            if last:
+                raise
+            continue
+        _record_route(route, model, started, failed=_run_failed(result))
+        if last or not _run_failed(result):
+            return result
+    error_msg = "No agent to run"
+    raise RuntimeError(error_msg)
+
+
+async def _stream_events(routed_agent: "Agent", messages: list[dict[str, str]]) -> AsyncIterator["str | RunOutput"]:
+    """Yield one streamed run's content deltas and then its RunOutput."""
+    from agno.run.agent import RunEvent, RunOutput
+
+    async for event in routed_agent.arun(messages, stream=True, yield_run_output=True):
+        if isinstance(event, RunOutput):
+            if _spill is not None:
+                # A spill scope cannot stay open across the yields, so the run's outputs are released by reference
+                _spill.release_references(message.content for message in event.messages or [])
+            yield event
+        elif event.event == RunEvent.run_error.value:
+            error_msg = f"Agent run failed: {event.content}"
+            raise RuntimeError(error_msg)
+        elif event.event == RunEvent.run_content.value and isinstance(event.content, str) and event.content:
+            yield event.content
+
+
+async def run_agent_stream(
+    messages: list[dict[str, str]], route: RouteDecision | None = None
+) -> AsyncIterator["str | RunOutput"]:
+    """Run the agent with streaming, yielding content deltas and then the final RunOutput.
+
+    A routed run that fails before its first token is retried on the
+    route's fallback model; once tokens have been sent it cannot be.
+    """
+    if not agent:
+        error_msg = "Agent not initialized"
+        raise RuntimeError(error_msg)
 
+    reduce_messages = await _prepare_long_transcript(messages)
+    candidates = _routed_agents(route)
+    for attempt, (model, routed_agent) in enumerate(candidates):
+        started = time.perf_counter()
+        streamed = False
+        try:
+            async for item in _stream_events(routed_agent, reduce_messages or messages):
+                streamed = streamed or isinstance(item, str)
+                yield item
+        except Exception:
+            _record_route(route, model, started, failed=True)
+            if streamed or attempt == len(candidates) - 1:
+                raise
+            continue
+        _record_route(route, model, started, failed=False)
+        return
+
+
+def _cached_transcript_length(video_id: str) -> int | None:
+    """Return the length of the cached transcript of ``video_id``, or None if it is not cached."""
+    snippets = transcript_cache.peek(video_id) if transcript_cache is not None else None
+    return transcript_length(snippets) if snippets is not None else None
+
+
+async def _request_priority(messages: list[dict[str, str]]) -> tuple[int, int]:
+    """Return (priority, estimated tokens) for a request.
+
+    Videos whose transcript is already cached and short go first; videos that
+    still need a transcript fetch, or are long, go last.
+    """
+    video_ids = find_video_ids(latest_user_text(messages))
+    if transcript_cache is None or len(video_ids) != 1:
+        return PRIORITY_NORMAL, DEFAULT_ESTIMATED_TOKENS
+
+    # Reading and decoding a cached multi-hour transcript would stall every other connection
+    length = await asyncio.to_thread(_cached_transcript_length, video_ids[0])
+    if length is None:
+        return PRIORITY_LOW, DEFAULT_ESTIMATED_TOKENS
+
+    estimated_tokens = length // 4 + DEFAULT_ESTIMATED_TOKENS
+    if length <= int(os.getenv("LONG_TRANSCRIPT_CHARS", "60000")):
+        return PRIORITY_HIGH, estimated_tokens
+    return PRIORITY_LOW, estimated_tokens
+
+
+def _total_tokens(result: Any) -> int | None:
+    """Return the tokens a run actually used, if the run reports them."""
+    total = getattr(getattr(result, "metrics", None), "total_tokens", None)
+    return total if isinstance(total, int) else None
+
+
+async def _run_admitted(messages: list[dict[str, str]], *, output_schema: Any = None) -> Any:
+    """Route the request, then run the agent through the admission scheduler."""
+    route = await _route(messages)
+    options: dict[str, Any] = {}
+    if route is not None:
+        options["route"] = route
+    if output_schema is not None:
+        options["output_schema"] = output_schema
+    if scheduler is None:
+        return await run_agent(messages, **options)
+
+    priority, estimated_tokens = await _request_priority(messages)
+    queued = time.perf_counter()
+
+    async def start() -> Any:
+        _metrics.record_span("queue_wait", time.perf_counter() - queued)
+        return await run_agent(messages, **options)
+
+    return await scheduler.run(
+        start,
+        priority=priority,
+        model=route.model if route is not None else _model_name,
+        estimated_tokens=estimated_tokens,
+        actual_tokens=_total_tokens,
+    )
 
-async def handler(messages: list[dict[str, str]]) -> Any:
-    """Handle incoming agent messages with lazy initialization."""
+
+@asynccontextmanager
+async def _admitted(messages: list[dict[str, str]], model: str | None = None) -> AsyncIterator[Any]:
+    """Hold an admission slot for a streamed run; yields the token settle callback."""
+    if scheduler is None:
+        yield lambda _tokens: None
+        return
+
+    priority, estimated_tokens = await _request_priority(messages)
+    queued = time.perf_counter()
+    async with scheduler.admitted(
+        priority=priority, model=model or _model_name, estimated_tokens=estimated_tokens
+    ) as settle:
+        _metrics.record_span("queue_wait", time.perf_counter() - queued)
+        yield settle
+
+
+async def _stream_response(
+    messages: list[dict[str, str]],
+    request: AnalysisRequest | None,
+    mode: CacheMode,
+) -> AsyncIterator[str | StreamedResult]:
+    """Stream the agent's answer, then yield the full answer as a StreamedResult.
+
+    Streamed runs hold their admission slot until the last token and store the
+    full answer in the result cache like a regular run.
+    """
+    deltas: list[str] = []
+    run_output: RunOutput | None = None
+
+    route = await _route(messages)
+    async with _admitted(messages, route.model if route is not None else None) as settle:
+        # Timed by hand: a span's context must not stay open across the yields
+        started = time.perf_counter()
+        async for item in run_agent_stream(messages) if route is None else run_agent_stream(messages, route):
+            if isinstance(item, str):
+                deltas.append(item)
+                yield item
+            else:
+                run_output = item
+        _metrics.record_span("agent_run", time.perf_counter() - started, streamed=True)
+        settle(_total_tokens(run_output))
+
+    content = "".join(deltas)
+    if run_output is not None and isinstance(run_output.content, str) and run_output.content:
+        content = run_output.content
+
+    cacheable = bool(content) and (run_output is None or _is_cacheable_result(run_output))
+    if result_cache is not None and request is not None and mode is not CacheMode.BYPASS and cacheable:
+        result_cache.set(request, content)
+    if cacheable:
+        _remember_analysis(messages, content)
+    yield StreamedResult(content, run_output)
+
+
+async def _analyze(messages: list[dict[str, str]], request: AnalysisRequest, mode: CacheMode) -> Any:
+    """Run the agent for a cacheable request and store its result.
+
+    In structured-output mode the run returns a VideoSummary, cached as JSON.
+    """
+    output_schema = None
+    if _structured_output():
+        from youtube_agent.structured import VideoSummary
+
+        output_schema = VideoSummary
+    result = await _run_admitted(messages, output_schema=output_schema)
+
+    if result_cache is not None and mode is not CacheMode.BYPASS and _is_cacheable_result(result):
+        summary = _as_structured(result.content)
+        result_cache.set(request, result.content if summary is None else summary.model_dump_json())
+
+    return result
+
+
+async def _ensure_initialized() -> None:
+    """Initialize the agent exactly once.
+
+    Double-checked: once initialized, callers return without touching the lock.
+    """
     global _initialized
 
+    if _initialized:
+        return
+
     async with _init_lock:
         if not _initialized:
             print("🔧 Initializing YouTube Analysis Agent...")
-            await initialize_agent()
+            with _metrics.span("initialize"):
+                await initialize_agent()
             _initialized = True
 
-    return await run_agent(messages)
+
+async def warm_up() -> None:
+    """Build the agent, tools and clients before the server accepts traffic."""
+    await _ensure_initialized()
+
+
+def is_ready(host: str, port: int, *, warmup: bool = True) -> bool:
+    """Return True once the agent is warm (if required) and bindufy is listening.
+
+    Under ``--workers`` the supervisor has no agent of its own; it is ready once
+    every worker has warmed up and started serving.
+    """
+    if _supervisor is not None:
+        return _supervisor.ready() and port_accepts_connections(host, port)
+    if warmup and not _initialized:
+        return False
+    return port_accepts_connections(host, port)
+
+
+def _cached_result(request: AnalysisRequest | None, mode: CacheMode) -> str | None:
+    """Return the cached analysis for ``request`` when the cache may be read."""
+    if result_cache is None or request is None or mode is not CacheMode.USE:
+        return None
+    cached = result_cache.get(request)
+    if cached is not None:
+        print(f"⚡ Result cache hit for {request.video_id} ({request.intent})")
+    return cached
+
+
+async def _run_request(messages: list[dict[str, str]], request: AnalysisRequest | None, mode: CacheMode) -> Any:
+    """Run a non-streaming request, coalescing concurrent identical analyses."""
+    if request is None:
+        return await _run_admitted(messages)
+
+    # Concurrent requests for the same video, intent and question share one agent run
+    return await _inflight.do(
+        (request.video_id, request.intent, request.question),
+        lambda: _analyze(messages, request, mode),
+    )
+
+
+async def _answer_lookup(lookup: TranscriptLookup) -> str | None:
+    """Answer a "where is X mentioned" question from the transcript index.
+
+    Returns None, leaving the question to the agent, when there is no index,
+    the transcript cannot be fetched or nothing in it matches.
+    """
+    if transcript_index is None or transcript_cache is None:
+        return None
+
+    if not transcript_index.contains(lookup.video_id):
+        try:
+            transcript = await _fetch_transcript(lookup.video_id)
+            await asyncio.to_thread(_index_transcript, lookup.video_id, transcript)
+        except Exception:
+            return None
+
+    with _metrics.span("index_search"):
+        hits = await asyncio.to_thread(
+            transcript_index.search,
+            lookup.query,
+            video_id=lookup.video_id,
+            limit=int(os.getenv("TRANSCRIPT_SEARCH_HITS", "5")),
+        )
+    if not hits:
+        return None
+    print(f"🔎 Answered lookup for {lookup.query!r} in {lookup.video_id} from the transcript index")
+    return format_hits(lookup.video_id, lookup.query, hits)
+
+
+def _present(messages: list[dict[str, str]], content: Any) -> Any:
+    """Return an analysis in the form the request asked for and keep it for follow-ups.
+
+    A structured analysis (a VideoSummary or its cached JSON) is returned as
+    compact JSON, or as markdown rendered locally when the request asks for
+    it; any other content is returned unchanged.
+    """
+    summary = _as_structured(content)
+    if summary is None:
+        _remember_analysis(messages, content)
+        return content
+
+    from youtube_agent.structured import render_markdown
+
+    markdown = render_markdown(summary)
+    reply = markdown if output_format(messages) is OutputFormat.MARKDOWN else summary.model_dump_json()
+    _remember_analysis(messages, markdown, reply=reply)
+    return reply
+
+
+def _remember_analysis(messages: list[dict[str, str]], content: Any, *, reply: str | None = None) -> None:
+    """Keep the compact form of an answer about one video for this conversation's follow-ups.
+
+    ``reply`` is the text returned to the client, when it differs from ``content``.
+    """
+    if session_store is None:
+        return
+    video_ids = find_video_ids(latest_user_text(messages))
+    if len(video_ids) != 1:
+        return
+    try:
+        session_store.remember(messages, video_ids[0], content, reply=reply)
+    except Exception as e:
+        print(f"⚠️  Could not store the analysis of {video_ids[0]}: {e}")
+
+
+async def _answer_followup(messages: list[dict[str, str]]) -> Any:
+    """Answer a follow-up from the conversation's stored analysis instead of its full history.
+
+    The prompt is the compact analysis, the transcript passages that best
+    match the question and the previous exchange, so it stays the same size
+    however long the conversation gets. Returns None when the message is not
+    a follow-up or no analysis of its video was stored.
+    """
+    if session_store is None or followup_agent is None:
+        return None
+    analysis = session_store.lookup(messages)
+    if analysis is None:
+        return None
+
+    excerpts = []
+    if transcript_index is not None:
+        with _metrics.span("index_search"):
+            excerpts = await asyncio.to_thread(
+                transcript_index.search,
+                latest_user_text(messages),
+                video_id=analysis.video_id,
+                limit=int(os.getenv("FOLLOWUP_EXCERPTS", "3")),
+            )
+    prompt = build_followup_prompt(analysis, messages, excerpts)
+    session_store.record_prompt(prompt)
+    print(f"💬 Follow-up about {analysis.video_id} answered from its stored analysis ({len(prompt)} prompt chars)")
+
+    async def answer() -> Any:
+        with _metrics.span("agent_run", followup=True):
+            return await followup_agent.arun(prompt)  # type: ignore[invalid-await]
+
+    if scheduler is None:
+        return await answer()
+    return await scheduler.run(
+        answer,
+        priority=PRIORITY_HIGH,
+        model=_model_name,
+        estimated_tokens=len(prompt) // 4 + DEFAULT_ESTIMATED_TOKENS // 4,
+        actual_tokens=_total_tokens,
+    )
+
+
+async def _resolve_batch(batch: BatchRequest) -> list[str]:
+    """Return the batch's videos followed by the playlist's, without duplicates."""
+    videos = list(batch.videos)
+    if batch.playlist_id is not None:
+        provider = transcript_cache.provider if transcript_cache is not None else None
+
+        def fetch_playlist() -> list[str]:
+            session = provider.session() if isinstance(provider, YouTubeTranscriptProvider) else None
+            return fetch_playlist_video_ids(batch.playlist_id, session)  # type: ignore[arg-type]
+
+        videos.extend(await asyncio.to_thread(fetch_playlist))
+        videos = list(dict.fromkeys(videos))
+
+    max_videos = int(os.getenv("BATCH_MAX_VIDEOS", "200"))
+    if not videos:
+        error_msg = "Batch request contains no videos"
+        raise ValueError(error_msg)
+    if len(videos) > max_videos:
+        error_msg = f"Batch has {len(videos)} videos; at most {max_videos} are allowed (BATCH_MAX_VIDEOS)"
+        raise ValueError(error_msg)
+    return videos
+
+
+async def _prefetch_transcript(video: str) -> None:
+    """Load a batch video's transcript into the transcript cache."""
+    if transcript_cache is not None:
+        await _fetch_transcript(video)
+
+
+async def _analyze_batch_video(video: str, intent: str, mode: CacheMode) -> str:
+    """Analyse one batch video through the same cache, coalescing and admission path as chat."""
+    video_id = extract_video_id(video)
+    if video_id is None:
+        error_msg = f"Not a valid YouTube URL or video ID: {video}"
+        raise ValueError(error_msg)
+
+    request = AnalysisRequest(video_id, intent)
+    cached = _cached_result(request, mode)
+    if cached is not None:
+        return cached
+
+    messages = [{"role": "user", "content": f"{INTENT_PROMPTS[intent]}: https://www.youtube.com/watch?v={video_id}"}]
+    result = await _run_request(messages, request, mode)
+    if not _is_cacheable_result(result):
+        error_msg = f"Analysis of {video_id} returned no content"
+        raise RuntimeError(error_msg)
+    summary = _as_structured(result.content)
+    return str(result.content) if summary is None else summary.model_dump_json()
+
+
+async def _stream_batch(batch: BatchRequest, mode: CacheMode) -> AsyncIterator[str | StreamedResult]:
+    """Yield one JSON line per finished video, then the full report as a StreamedResult."""
+    videos = await _resolve_batch(batch)
+    progress = BatchProgress(len(videos))
+    items = []
+    print(f"📦 Batch of {len(videos)} videos ({batch.intent})")
+
+    async for item in run_batch(
+        videos,
+        lambda video: _analyze_batch_video(video, batch.intent, mode),
+        prefetch=_prefetch_transcript if transcript_cache is not None else None,
+        max_concurrency=int(os.getenv("BATCH_CONCURRENCY", "4")),
+        prefetch_concurrency=int(os.getenv("BATCH_FETCH_CONCURRENCY", "8")),
+    ):
+        progress.record(item)
+        items.append(item)
+        yield format_batch_event(item, progress)
+
+    yield StreamedResult(format_batch_report(items, progress))
+
+
+def _report_prompt_cache(request_id: str) -> None:
+    """Log how much of one request's prompts the provider served from its prompt cache."""
+    usage = _metrics.prompt_cache(request_id)
+    if usage["prompt_tokens"]:
+        print(
+            f"🧊 Prompt cache: {usage['cached_tokens']} of {usage['prompt_tokens']} prompt tokens cached "
+            f"({usage['hit_ratio']:.0%}), {usage['uncached_tokens']} uncached"
+        )
+
+
+async def handler(messages: list[dict[str, str]]) -> Any:
+    """Handle incoming agent messages, initializing the agent if warm-up was skipped."""
+    # Every span recorded while serving this request carries its ID
+    request_id = new_request_id()
+    await _ensure_initialized()
+
+    mode = cache_mode(messages)
+    batch = parse_batch_request(messages)
+    if batch is not None:
+        _metrics.requests.inc(path="batch")
+        return _stream_batch(batch, mode)
+
+    # "Where do they mention X?" is answered from the transcript index without a model call
+    lookup = parse_lookup(messages)
+    if lookup is not None:
+        answer = await _answer_lookup(lookup)
+        if answer is not None:
+            _metrics.requests.inc(path="lookup")
+            return answer
+
+    followup = await _answer_followup(messages)
+    if followup is not None:
+        _metrics.requests.inc(path="followup")
+        return followup
+
+    request = parse_analysis_request(messages)
+    cached = _cached_result(request, mode)
+    if cached is not None:
+        _metrics.requests.inc(path="cached")
+        return _present(messages, cached)
+
+    # A structured analysis is only useful once complete, so it is never streamed
+    structured = request is not None and not request.question and _structured_output()
+    if streaming_enabled(os.getenv("STREAM_RESPONSES")) and not structured:
+        # Streams are not coalesced: every caller gets its own token stream
+        _metrics.requests.inc(path="stream")
+        return _stream_stats.timed(_stream_response(messages, request, mode))
+
+    _metrics.requests.inc(path="run")
+    with _metrics.span("request"):
+        result = await _run_request(messages, request, mode)
+    _report_prompt_cache(request_id)
+    if not _is_cacheable_result(result):
+        return result
+    if structured:
+        return _present(messages, result.content)
+    _remember_analysis(messages, result.content)
+    return result
+
+
+def _model_stats() -> dict[str, Any]:
+    """Return the routing decisions and the per-upstream retry, hedging and circuit counters."""
+    stats: dict[str, Any] = {}
+    if _router is not None:
+        stats["routing"] = _router.stats()
+    if _upstreams:
+        stats["upstreams"] = {name: upstream.stats() for name, upstream in _upstreams.items()}
+    return stats
+
+
+def collect_stats() -> dict[str, Any]:
+    """Return the counters of every cache, coalescing and scheduling layer."""
+    stats: dict[str, Any] = {"coalescing": _inflight.stats()}
+    if transcript_cache is not None:
+        stats["transcript_cache"] = transcript_cache.stats()
+    if transcript_index is not None:
+        stats["transcript_index"] = transcript_index.stats()
+    if result_cache is not None:
+        stats["result_cache"] = result_cache.stats()
+    if session_store is not None:
+        stats["sessions"] = session_store.stats()
+    if scheduler is not None:
+        stats["scheduler"] = scheduler.stats()
+    stats["streaming"] = _stream_stats.stats()
+    stats["packing"] = _packing_stats.stats()
+    if _http_pool is not None:
+        stats["http_pool"] = _http_pool.stats()
+    if _memory_tools is not None:
+        stats["memory"] = _memory_tools.stats()
+    if _supervisor is not None:
+        stats["workers"] = _supervisor.stats()
+    if _spill is not None:
+        stats["spill"] = _spill.stats()
+    stats.update(_model_stats())
+    stats["prompt_cache"] = _metrics.prompt_cache()
+    return stats
+
+
+def _close_local_stores() -> None:
+    """Report and close the SQLite-backed transcript cache, transcript index and session store."""
+    if transcript_cache is not None:
+        print(f"🗄️  Transcript cache stats: {transcript_cache.stats()}")
+        transcript_cache.store.close()
+    if transcript_index is not None:
+        print(f"🔎 Transcript index stats: {transcript_index.stats()}")
+        transcript_index.close()
+    if session_store is not None:
+        print(f"💬 Follow-up stats: {session_store.stats()}")
+        session_store.store.close()
 
 
 async def cleanup() -> None:
     """Clean up any resources."""
     print("🧹 Cleaning up YouTube Analysis Agent resources...")
 
+    _close_local_stores()
+    if result_cache is not None:
+        print(f"⚡ Result cache stats: {result_cache.stats()}")
+    print(f"🔗 Coalesced request stats: {_inflight.stats()}")
+    if scheduler is not None:
+        print(f"🚦 Scheduler stats: {scheduler.stats()}")
+    if _packing_stats.requests:
+        print(f"🗜️  Transcript packing stats: {_packing_stats.stats()}")
+    if _stream_stats.total_latency.count:
+        print(f"📡 Streaming stats: {_stream_stats.stats()}")
+    if _router is not None:
+        print(f"🧭 Routing stats: {_router.stats()}")
+    if _memory_tools is not None:
+        # Queued memory writes go out through the pool, so flush them before it closes
+        flushed = await asyncio.to_thread(_memory_tools.close)
+        print(f"🧠 Memory stats: {_memory_tools.stats()}{'' if flushed else ' (flush timed out)'}")
+    if _spill is not None:
+        print(f"💾 Tool output spill stats: {_spill.stats()}")
+        _spill.close()
+    if _http_pool is not None:
+        print(f"🔌 HTTP pool stats: {_http_pool.stats()}")
+        await _http_pool.aclose()
+
 
 def _setup_environment_variables(args: argparse.Namespace) -> None:
     """Set environment variables from command line arguments."""
@@ -269,6 +1367,8 @@ def _setup_environment_variables(args: argparse.Namespace) -> None:
         os.environ["MEM0_API_KEY"] = args.mem0_api_key
     if args.model:
         os.environ["MODEL_NAME"] = args.model
+    if args.stream:
+        os.environ["STREAM_RESPONSES"] = "true"
 
 
 def _display_configuration_info() -> None:
@@ -300,8 +1400,182 @@ def _display_configuration_info() -> None:
     print("=" * 60)
 
 
-def main() -> None:
+def _start_status_server(config: dict, port: int | None, *, warmup: bool) -> StatusServer | None:
+    """Start the readiness/liveness side-car when a status port is configured."""
+    if not port:
+        return None
+
+    host, agent_port = _deployment_address(config)
+    status_server = StatusServer(host, port, lambda: is_ready(host, agent_port, warmup=warmup))
+    status_server.routes["/stats"] = lambda: (200, "application/json", json.dumps(collect_stats()))
+    status_server.routes["/metrics"] = lambda: (200, PROMETHEUS_CONTENT_TYPE, _metrics.render(collect_stats()))
+    status_server.routes["/spans"] = lambda: (200, "application/json", json.dumps(_metrics.recent_spans()))
+    status_server.start()
+    print(f"🩺 Health checks at http://{host}:{status_server.port}/healthz, /ready, /stats, /metrics and /spans")
+    return status_server
+
+
+def _deployment_address(config: dict) -> tuple[str, int]:
+    """Return the host and port bindufy serves on."""
+    deployment_url = urlparse(config.get("deployment", {}).get("url", "http://127.0.0.1:3773"))
+    return deployment_url.hostname or "127.0.0.1", deployment_url.port or 3773
+
+
+def _run_worker(sock: socket.socket, index: int, ready: Any, config: dict, warmup: bool) -> None:
+    """Worker process: warm up, then serve bindufy's app on the supervisor's socket."""
+    from youtube_agent.workers import serve_app
+
+    try:
+        if warmup:
+            asyncio.run(warm_up())
+        # bindufy builds its app and then hands it to start_uvicorn_server, which would bind the
+        # port itself; serve the app on the shared socket instead
+        bindufy_module = importlib.import_module("bindu.penguin.bindufy")
+        bindufy_module.start_uvicorn_server = lambda app, host, port, display_info=True: serve_app(
+            app, sock, ready=ready, host=host, port=port
+        )
+        print(f"👷 Worker {index} (pid {os.getpid()}) starting")
+        bindufy_module.bindufy(config, handler)
+    except KeyboardInterrupt:
+        # uvicorn re-raises the shutdown signal once it has drained its connections
+        print(f"🛑 Worker {index} stopped")
+    finally:
+        asyncio.run(cleanup())
+
+
+def _serve_workers(config: dict, args: argparse.Namespace) -> None:
+    """Run ``args.workers`` agent processes behind the configured port until interrupted."""
+    from youtube_agent.workers import WorkerSupervisor
+
+    global _supervisor
+
+    if os.getenv("STORAGE_TYPE", "memory") == "memory" and "storage" not in config:
+        print(
+            "⚠️  Each worker keeps its own in-memory task store; clients that poll tasks/get "
+            "need STORAGE_TYPE=postgres (and SCHEDULER_TYPE=redis) so every worker sees every task"
+        )
+    if os.getenv("RESULT_CACHE_BACKEND", "sqlite").lower() == "memory":
+        print("⚠️  RESULT_CACHE_BACKEND=memory is per worker; use sqlite to share results between workers")
+
+    host, port = _deployment_address(config)
+    _supervisor = WorkerSupervisor(_run_worker, host, port, args.workers, args=(config, not args.no_warmup))
+    status_server = _start_status_server(config, args.status_port, warmup=False)
+    print(f"\n🚀 Starting {args.workers} YouTube Analysis Agent workers...")
+    print(f"🌐 Access at: {config.get('deployment', {}).get('url', 'http://127.0.0.1:3773')}")
+    try:
+        _supervisor.run()
+    finally:
+        if status_server is not None:
+            status_server.stop()
+        print(f"👷 Worker stats: {_supervisor.stats()}")
+
+
+async def _backfill(args: argparse.Namespace) -> "BackfillReport":
+    """Analyse a directory of caption files with a tool-less copy of the analysis agent."""
+    from youtube_agent.backfill import run_backfill
+    from youtube_agent.resilience import within
+
+    openrouter_api_key, _, model_name = _get_api_keys()
+    backfill_agent = _create_analysis_agent(_create_llm_model(openrouter_api_key or "", model_name), [])
+    options: dict[str, Any] = {}
+    if _structured_output():
+        from youtube_agent.structured import VideoSummary
+
+        options["output_schema"] = VideoSummary
+
+    async def analyze(document: "PreparedDocument") -> str:
+        result = await within(
+            backfill_agent.arun(document.prompt, **options),  # type: ignore[arg-type]
+            float(os.getenv("AGENT_DEADLINE_SECONDS", "600")) or None,
+            "agent run",
+        )
+        if _run_failed(result) or not _is_cacheable_result(result):
+            error_msg = f"Analysis of {document.doc_id} failed: {getattr(result, 'content', None)}"
+            raise RuntimeError(error_msg)
+        summary = _as_structured(result.content)
+        return str(result.content) if summary is None else summary.model_dump_json()
+
+    try:
+        return await run_backfill(
+            Path(args.input),
+            Path(args.output),
+            analyze,
+            intent=args.intent,
+            processes=args.processes,
+            concurrency=args.concurrency,
+            prepare_options={
+                "min_segment_seconds": float(os.getenv("SEGMENT_MIN_SECONDS", "120")),
+                "max_segments": int(os.getenv("SEGMENT_MAX_COUNT", "24")),
+                "max_tokens": int(os.getenv("TRANSCRIPT_MAX_TOKENS", "20000")) or None,
+            },
+        )
+    finally:
+        if _spill is not None:
+            _spill.close()
+        if _http_pool is not None:
+            await _http_pool.aclose()
+
+
+def batch_main(argv: list[str]) -> None:
+    """Run ``python -m youtube_agent batch``: analyse local caption files into a JSONL file."""
+    parser = argparse.ArgumentParser(
+        prog="python -m youtube_agent batch",
+        description="Analyze a directory of VTT/SRT/JSON caption files offline and write one JSON line per file",
+    )
+    parser.add_argument("input", help="Directory of .vtt, .srt and .json caption files (searched recursively)")
+    parser.add_argument(
+        "--output",
+        default="backfill.jsonl",
+        help="JSONL file to append results to; files it already has a result for are skipped",
+    )
+    parser.add_argument("--intent", choices=sorted(INTENT_PROMPTS), default="summary", help="Analysis to run")
+    parser.add_argument(
+        "--base-url",
+        default=os.getenv("OPENROUTER_BASE_URL"),
+        help="Any OpenAI-compatible endpoint (env: OPENROUTER_BASE_URL, default: OpenRouter)",
+    )
+    parser.add_argument(
+        "--api-key", default=os.getenv("OPENROUTER_API_KEY"), help="API key for the endpoint (env: OPENROUTER_API_KEY)"
+    )
+    parser.add_argument("--model", default=os.getenv("MODEL_NAME", "openai/gpt-4o"), help="Model ID (env: MODEL_NAME)")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("BACKFILL_CONCURRENCY", "4")),
+        help="Analyses in flight at once (env: BACKFILL_CONCURRENCY)",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=int(os.getenv("BACKFILL_PROCESSES", "0")) or None,
+        help="Processes parsing and segmenting caption files (env: BACKFILL_PROCESSES, default: one per CPU)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.base_url:
+        os.environ["OPENROUTER_BASE_URL"] = args.base_url
+    if args.api_key:
+        os.environ["OPENROUTER_API_KEY"] = args.api_key
+    os.environ["MODEL_NAME"] = args.model
+
+    print(f"📚 Analyzing caption files in {args.input} with {args.model} into {args.output}")
+    report = asyncio.run(_backfill(args))
+    print(
+        f"📊 {report.succeeded} analyzed, {report.failed} failed, {report.skipped} already done "
+        f"in {report.elapsed_seconds:.1f}s ({report.docs_per_second:.2f} docs/s)"
+    )
+    print(json.dumps(report.as_dict()))
+
+
+def main(argv: list[str] | None = None) -> None:
     """Run the main entry point for the YouTube Analysis Agent."""
+    import sys
+
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["batch"]:
+        batch_main(argv[1:])
+        return
+
     parser = argparse.ArgumentParser(
         description="YouTube Analysis Agent - Create structured summaries from YouTube videos"
     )
@@ -323,17 +1597,50 @@ def main() -> None:
         default=os.getenv("MODEL_NAME", "openai/gpt-4o"),
         help="Model ID for OpenRouter (env: MODEL_NAME)",
     )
+    parser.add_argument(
+        "--no-warmup",
+        action="store_true",
+        help="Initialize lazily on the first request instead of before the server starts",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream tokens as they are generated (env: STREAM_RESPONSES)",
+    )
+    parser.add_argument(
+        "--status-port",
+        type=int,
+        default=int(os.getenv("STATUS_PORT", "0")) or None,
+        help="Port for /healthz and /ready probes (env: STATUS_PORT, disabled by default)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("WORKERS", "1")),
+        help="Agent processes serving the same port, restarted if they crash (env: WORKERS)",
+    )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     _setup_environment_variables(args)
     _display_configuration_info()
 
     config = load_config()
+    if args.workers > 1:
+        _serve_workers(config, args)
+        return
+
+    status_server = _start_status_server(config, args.status_port, warmup=not args.no_warmup)
 
     try:
+        if not args.no_warmup:
+            print("🔥 Warming up agent, tools and HTTP clients...")
+            asyncio.run(warm_up())
+
         print("\n🚀 Starting YouTube Analysis Agent server...")
         print(f"🌐 Access at: {config.get('deployment', {}).get('url', 'http://127.0.0.1:3773')}")
+        from bindu.penguin.bindufy import bindufy
+
         bindufy(config, handler)
     except KeyboardInterrupt:
         print("\n🛑 YouTube Analysis Agent stopped")
@@ -342,10 +1649,10 @@ def main() -> None:
         import traceback
 
         traceback.print_exc()
-        import sys
-
         sys.exit(1)
     finally:
+        if status_server is not None:
+            status_server.stop()
         asyncio.run(cleanup())
 
 
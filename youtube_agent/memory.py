@@ -0,0 +1,436 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Conversation memory for the agent: write-behind Mem0 writes and a local recall cache."""
+
+import json
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Any, Protocol
+
+import numpy as np
+from agno.run import RunContext
+from agno.tools import Toolkit
+
+from youtube_agent.segmentation import STOPWORDS
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9']+")
+
+Memory = dict[str, Any]
+
+
+class MemoryBackend(Protocol):
+    """The subset of mem0's ``MemoryClient`` the toolkit uses."""
+
+    def add(self, messages: list[dict[str, str]], **kwargs: Any) -> Any:
+        """Store ``messages`` for ``user_id``."""
+        ...
+
+    def search(self, query: str, **kwargs: Any) -> Any:
+        """Return the memories of ``user_id`` that match ``query``."""
+        ...
+
+    def get_all(self, **kwargs: Any) -> Any:
+        """Return every memory of ``user_id``."""
+        ...
+
+    def delete_all(self, **kwargs: Any) -> Any:
+        """Delete every memory of ``user_id``."""
+        ...
+
+
+def create_mem0_backend(
+    api_key: str,
+    http_client: Any = None,
+    org_id: str | None = None,
+    project_id: str | None = None,
+) -> MemoryBackend:
+    """Return a Mem0 platform client, sending its requests through ``http_client`` when given.
+
+    ``http_client`` should come from ``HttpPool.sync_client()``; MemoryClient sets
+    its base URL and auth headers on it. ``org_id`` and ``project_id`` default to
+    ``MEM0_ORG_ID`` and ``MEM0_PROJECT_ID``, which MemoryClient does not read itself.
+    """
+    from mem0.client.main import MemoryClient
+
+    org_id = org_id or os.getenv("MEM0_ORG_ID")
+    project_id = project_id or os.getenv("MEM0_PROJECT_ID")
+    try:
+        return MemoryClient(api_key=api_key, org_id=org_id, project_id=project_id, client=http_client)
+    except Exception as e:
+        error_msg = "Failed to initialize Mem0 client. Ensure API keys/config are set."
+        raise ConnectionError(error_msg) from e
+
+
+def _results(response: Any) -> list[Memory]:
+    """Return the memory list of a search/get_all response (a list or ``{"results": [...]}``)."""
+    if isinstance(response, dict):
+        return list(response.get("results") or [])
+    return list(response) if isinstance(response, list) else []
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def embed(text: str, dims: int = 512) -> np.ndarray:
+    """Return the L2-normalized hashed bag-of-words vector of ``text``."""
+    vector = np.zeros(dims, dtype=np.float32)
+    for word in _WORD_RE.findall(text.lower()):
+        if word not in STOPWORDS:
+            vector[zlib.crc32(word.encode()) % dims] += 1.0
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+class RecallCache:
+    """Per-user local recall in front of Mem0 search.
+
+    Two layers: an LRU of recent search results keyed by the normalized query,
+    and a small vector index (hashed bag-of-words, cosine similarity) over the
+    memories seen recently, either written through the toolkit or returned by
+    Mem0. A follow-up that asks about a recently analyzed video again is
+    answered from either layer without a round trip.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_queries: int = 256,
+        max_memories: int = 512,
+        min_score: float = 0.5,
+        limit: int = 5,
+        dims: int = 512,
+    ) -> None:
+        """Create an empty cache; vector hits need a cosine similarity of at least ``min_score``."""
+        self.max_queries = max_queries
+        self.max_memories = max_memories
+        self.min_score = min_score
+        self.limit = limit
+        self.dims = dims
+        self.query_hits = 0
+        self.vector_hits = 0
+        self.misses = 0
+        self._queries: OrderedDict[tuple[str, str], list[Memory]] = OrderedDict()
+        self._memories: dict[str, OrderedDict[str, tuple[np.ndarray, Memory]]] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, user_id: str, query: str) -> list[Memory] | None:
+        """Return cached results for ``query``, or None when Mem0 has to be asked."""
+        key = (user_id, _normalize_query(query))
+        with self._lock:
+            cached = self._queries.get(key)
+            if cached is not None:
+                self._queries.move_to_end(key)
+                self.query_hits += 1
+                return cached
+            memories = self._memories.get(user_id)
+            if memories:
+                vectors = np.stack([vector for vector, _ in memories.values()])
+                scores = vectors @ embed(query, self.dims)
+                best = [int(i) for i in np.argsort(-scores)[: self.limit] if scores[i] >= self.min_score]
+                if best:
+                    entries = list(memories.values())
+                    self.vector_hits += 1
+                    return [{**entries[i][1], "score": round(float(scores[i]), 4)} for i in best]
+            self.misses += 1
+            return None
+
+    def store_search(self, user_id: str, query: str, results: list[Memory]) -> None:
+        """Remember Mem0's ``results`` for ``query`` and index the memories in them."""
+        with self._lock:
+            self._queries[(user_id, _normalize_query(query))] = results
+            while len(self._queries) > self.max_queries:
+                self._queries.popitem(last=False)
+        self.remember(user_id, results)
+
+    def remember(self, user_id: str, memories: Iterable[Memory]) -> None:
+        """Add ``memories`` (dicts with a ``memory`` text) to the user's vector index."""
+        with self._lock:
+            index = self._memories.setdefault(user_id, OrderedDict())
+            for memory in memories:
+                text = str(memory.get("memory") or "")
+                if not text:
+                    continue
+                index[text] = (embed(text, self.dims), {key: value for key, value in memory.items() if key != "score"})
+                index.move_to_end(text)
+            while len(index) > self.max_memories:
+                index.popitem(last=False)
+
+    def invalidate_queries(self, user_id: str) -> None:
+        """Drop the user's cached search results, which may be missing a newer memory."""
+        with self._lock:
+            for key in [key for key in self._queries if key[0] == user_id]:
+                del self._queries[key]
+
+    def forget(self, user_id: str) -> None:
+        """Drop everything cached for ``user_id``."""
+        self.invalidate_queries(user_id)
+        with self._lock:
+            self._memories.pop(user_id, None)
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and sizes."""
+        lookups = self.query_hits + self.vector_hits + self.misses
+        with self._lock:
+            queries = len(self._queries)
+            memories = sum(len(index) for index in self._memories.values())
+        return {
+            "query_hits": self.query_hits,
+            "vector_hits": self.vector_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.query_hits + self.vector_hits) / lookups, 4) if lookups else 0.0,
+            "queries": queries,
+            "memories": memories,
+        }
+
+
+class WriteBehindQueue:
+    """Batches memory writes and sends them from a background thread.
+
+    ``put`` returns immediately. The writer thread waits up to
+    ``flush_interval`` for ``max_batch`` writes to collect, then merges the
+    messages of each user into one ``write`` call. A failed write is counted
+    and dropped; memory is best-effort and must never fail an agent run.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[str, list[dict[str, str]], bool], Any],
+        *,
+        max_batch: int = 16,
+        flush_interval: float = 0.5,
+        max_pending: int = 1000,
+    ) -> None:
+        """Create the queue; the writer thread starts with the first write."""
+        self.write = write
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        self.dropped = 0
+        self._pending: list[tuple[str, list[dict[str, str]], bool]] = []
+        self._sending: list[tuple[str, list[dict[str, str]], bool]] = []
+        self._flush_requested = False
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        self._cond = threading.Condition()
+
+    def put(self, user_id: str, messages: list[dict[str, str]], infer: bool = True) -> bool:
+        """Queue ``messages`` for ``user_id``; returns False when the queue is full and they were dropped."""
+        with self._cond:
+            if self._closed or len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return False
+            self._pending.append((user_id, messages, infer))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="memory-write-behind", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+        return True
+
+    def pending(self, user_id: str) -> list[dict[str, str]]:
+        """Return the queued messages of ``user_id`` that have not been sent yet."""
+        with self._cond:
+            entries = [*self._sending, *self._pending]
+            return [message for user, messages, _ in entries if user == user_id for message in messages]
+
+    def discard(self, user_id: str) -> int:
+        """Drop the queued writes of ``user_id``; returns how many were dropped.
+
+        Writes of ``user_id`` already being sent cannot be recalled, so this
+        waits for them to finish; a delete that follows is then not undone by them.
+        """
+        with self._cond:
+            kept = [entry for entry in self._pending if entry[0] != user_id]
+            discarded = len(self._pending) - len(kept)
+            self._pending = kept
+            self._cond.wait_for(lambda: all(entry[0] != user_id for entry in self._sending))
+            return discarded
+
+    def _take_batch(self) -> list[tuple[str, list[dict[str, str]], bool]] | None:
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending or self._closed)
+            if not self._pending:
+                return None
+            # Give a burst of writes the chance to share one request per user
+            self._cond.wait_for(
+                lambda: len(self._pending) >= self.max_batch or self._flush_requested or self._closed,
+                timeout=self.flush_interval,
+            )
+            self._sending, self._pending = self._pending[: self.max_batch], self._pending[self.max_batch :]
+            return self._sending
+
+    def _run(self) -> None:
+        while (batch := self._take_batch()) is not None:
+            groups: dict[tuple[str, bool], list[dict[str, str]]] = {}
+            for user_id, messages, infer in batch:
+                groups.setdefault((user_id, infer), []).extend(messages)
+            failed = 0
+            for (user_id, infer), messages in groups.items():
+                try:
+                    self.write(user_id, messages, infer)
+                except Exception as e:
+                    failed += 1
+                    print(f"⚠️  Memory write for {user_id} failed: {e}")
+            with self._cond:
+                self.batches += len(groups)
+                self.failed += failed
+                self.written += len(batch)
+                self._sending = []
+                self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Send every queued write now; returns False if they were not all sent within ``timeout``."""
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            flushed = self._cond.wait_for(lambda: not self._pending and not self._sending, timeout=timeout)
+            self._flush_requested = False
+            return flushed
+
+    def close(self, timeout: float | None = 10.0) -> bool:
+        """Flush, then stop the writer thread; later writes are dropped."""
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return flushed
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue depth and write counters."""
+        with self._cond:
+            return {
+                "pending": len(self._pending) + len(self._sending),
+                "written": self.written,
+                "batches": self.batches,
+                "failed": self.failed,
+                "dropped": self.dropped,
+            }
+
+
+class CachedMem0Tools(Toolkit):
+    """Mem0 memory tools that keep remote round trips off the agent's critical path.
+
+    Offers the same tools as agno's ``Mem0Tools``. ``add_memory`` queues the
+    write on a WriteBehindQueue and returns at once; ``search_memory`` is
+    answered by the RecallCache when it can. ``backend`` is a mem0
+    ``MemoryClient`` (see ``create_mem0_backend``) or any MemoryBackend, such
+    as the stand-in used in tests.
+    """
+
+    def __init__(
+        self,
+        backend: MemoryBackend,
+        *,
+        user_id: str | None = None,
+        infer: bool = True,
+        recall: RecallCache | None = None,
+        max_batch: int = 16,
+        flush_interval: float = 0.5,
+        **kwargs: Any,
+    ) -> None:
+        """Create the toolkit; remaining kwargs are passed to Toolkit."""
+        self.backend = backend
+        self.user_id = user_id
+        self.infer = infer
+        self.recall = recall if recall is not None else RecallCache()
+        self.writer = WriteBehindQueue(self._write, max_batch=max_batch, flush_interval=flush_interval)
+        super().__init__(
+            name="mem0_tools",
+            tools=[self.add_memory, self.search_memory, self.get_all_memories, self.delete_all_memories],
+            **kwargs,
+        )
+
+    def _write(self, user_id: str, messages: list[dict[str, str]], infer: bool) -> None:
+        self.backend.add(messages, user_id=user_id, infer=infer)
+
+    def _user(self, run_context: RunContext | None) -> str | None:
+        return self.user_id or getattr(run_context, "user_id", None)
+
+    def add_memory(self, run_context: RunContext, content: str | dict[str, str]) -> str:
+        """Add facts to the user's memory.
+
+        Args:
+            content: The facts that should be stored, e.g. "I live in NYC" or {"Name": "John", "Location": "NYC"}.
+
+        Returns:
+            str: JSON-encoded status or an error message.
+        """
+        user_id = self._user(run_context)
+        if not user_id:
+            return "Error in add_memory: A user_id must be provided in the method call."
+        text = json.dumps(content) if isinstance(content, dict) else str(content)
+        if not self.writer.put(user_id, [{"role": "user", "content": text}], self.infer):
+            return "Error adding memory: the memory write queue is full"
+        # Later searches in this process see the new fact before Mem0 has stored it
+        self.recall.invalidate_queries(user_id)
+        self.recall.remember(user_id, [{"memory": text, "pending": True}])
+        return json.dumps({"status": "queued", "memory": text})
+
+    def search_memory(self, run_context: RunContext, query: str) -> str:
+        """Semantic search for *query* across the user's stored memories."""
+        user_id = self._user(run_context)
+        if not user_id:
+            return "Error in search_memory: A user_id must be provided in the method call."
+        cached = self.recall.lookup(user_id, query)
+        if cached is not None:
+            return json.dumps(cached)
+        try:
+            results = _results(self.backend.search(query=query, user_id=user_id))
+        except Exception as e:
+            return f"Error searching memory: {e}"
+        self.recall.store_search(user_id, query, results)
+        return json.dumps(results)
+
+    def get_all_memories(self, run_context: RunContext) -> str:
+        """Return **all** memories for the current user as a JSON string."""
+        user_id = self._user(run_context)
+        if not user_id:
+            return "Error in get_all_memories: A user_id must be provided in the method call."
+        try:
+            memories = _results(self.backend.get_all(user_id=user_id))
+        except Exception as e:
+            return f"Error getting all memories: {e}"
+        self.recall.remember(user_id, memories)
+        pending = [{"memory": message["content"], "pending": True} for message in self.writer.pending(user_id)]
+        return json.dumps(memories + pending)
+
+    def delete_all_memories(self, run_context: RunContext) -> str:
+        """Delete *all* memories associated with the current user."""
+        user_id = self._user(run_context)
+        if not user_id:
+            return "Error deleting all memories: A user_id must be provided in the method call."
+        self.writer.discard(user_id)
+        self.recall.forget(user_id)
+        try:
+            self.backend.delete_all(user_id=user_id)
+        except Exception as e:
+            return f"Error deleting all memories: {e}"
+        return f"Successfully deleted all memories for user_id: {user_id}."
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Send every queued memory write now."""
+        return self.writer.flush(timeout)
+
+    def close(self, timeout: float | None = 10.0) -> bool:
+        """Flush the queued writes and stop the writer thread."""
+        return self.writer.close(timeout)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the write queue and recall cache counters."""
+        return {"writes": self.writer.stats(), "recall": self.recall.stats()}
@@ -0,0 +1,319 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Per-stage timing histograms, token counters and request-scoped spans, rendered for Prometheus."""
+
+import bisect
+import inspect
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover - opentelemetry ships with bindu
+    otel_trace = None
+
+# A proxy tracer: spans go to whichever tracer provider bindu configures later, or nowhere
+_tracer = otel_trace.get_tracer("youtube_agent") if otel_trace is not None else None
+
+# Seconds; covers cache hits (ms) through long map-reduce runs (minutes)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = tuple[tuple[str, str], ...]
+
+request_id: ContextVar[str | None] = ContextVar("youtube_agent_request_id", default=None)
+_current_span: ContextVar[str | None] = ContextVar("youtube_agent_span_id", default=None)
+
+
+def _labels(labels: dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+    pairs = [*labels, extra] if extra else list(labels)
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped, strict=True)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    def __init__(self, name: str, help_text: str) -> None:
+        """Create an empty counter."""
+        self.name = name
+        self.help_text = help_text
+        self._values: dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        """Add ``amount`` to the series for ``labels``."""
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Return the current value for ``labels``."""
+        return self._values.get(_labels(labels), 0.0)
+
+    def total(self, **labels: Any) -> float:
+        """Return the sum of every series that has ``labels`` (and any others)."""
+        wanted = set(_labels(labels))
+        with self._lock:
+            return sum(value for key, value in self._values.items() if wanted <= set(key))
+
+    def render(self) -> list[str]:
+        """Return the Prometheus exposition lines."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            lines.extend(f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in sorted(self._values.items()))
+        return lines
+
+
+class Histogram:
+    """Fixed-bucket histogram with optional labels; observing is a bisect and three additions."""
+
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """Create an empty histogram with upper bounds ``buckets``."""
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[Labels, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Record one observation for ``labels``."""
+        key = _labels(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels: Any) -> int:
+        """Return the number of observations for ``labels``."""
+        series = self._series.get(_labels(labels))
+        return series[2] if series else 0
+
+    def render(self) -> list[str]:
+        """Return the Prometheus exposition lines (cumulative buckets, sum and count)."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = sorted((key, list(counts), total, n) for key, (counts, total, n) in self._series.items())
+        for key, counts, total, n in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip([*self.buckets, float("inf")], counts, strict=True):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', le))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {n}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds the metrics and the recent spans, and renders everything as Prometheus text."""
+
+    def __init__(self, prefix: str = "youtube_agent", max_spans: int = 256) -> None:
+        """Create the standard stage, model, token and tool metrics."""
+        self.prefix = prefix
+        self.stage_seconds = Histogram(f"{prefix}_stage_duration_seconds", "Time spent per request stage.")
+        self.stage_errors = Counter(f"{prefix}_stage_errors_total", "Stages that raised an exception.")
+        self.model_seconds = Histogram(f"{prefix}_model_request_duration_seconds", "Duration of each model call.")
+        self.model_ttft = Histogram(f"{prefix}_model_time_to_first_token_seconds", "Model time to first token.")
+        self.tokens = Counter(f"{prefix}_tokens_total", "Model tokens by model and kind (input, output, cached).")
+        self.requests = Counter(f"{prefix}_requests_total", "Handler requests by outcome.")
+        self.spans: deque[dict[str, Any]] = deque(maxlen=max_spans)
+        # The status server's thread reads the spans while the event loop appends to them
+        self._spans_lock = threading.Lock()
+        self._metrics: list[Counter | Histogram] = [
+            self.stage_seconds,
+            self.stage_errors,
+            self.model_seconds,
+            self.model_ttft,
+            self.tokens,
+            self.requests,
+        ]
+
+    def record_span(
+        self,
+        name: str,
+        duration: float,
+        *,
+        error: BaseException | None = None,
+        span_id: str | None = None,
+        parent_id: str | None = None,
+        **attributes: Any,
+    ) -> None:
+        """Record a finished stage: its histogram sample and an entry in the recent-span buffer."""
+        if span_id is None:
+            # A stage timed by hand belongs to the enclosing span
+            span_id, parent_id = uuid.uuid4().hex[:16], _current_span.get()
+        self.stage_seconds.observe(duration, stage=name)
+        if error is not None:
+            self.stage_errors.inc(stage=name, error=type(error).__name__)
+        span = {
+            "request_id": request_id.get(),
+            "span_id": span_id,
+            "parent_id": parent_id,
+            "name": name,
+            "duration": round(duration, 6),
+            "error": type(error).__name__ if error is not None else None,
+            **attributes,
+        }
+        with self._spans_lock:
+            self.spans.append(span)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[None]:
+        """Time the enclosed block as stage ``name``, nested under the current span.
+
+        Also opens an OpenTelemetry span, so the stages show up in Phoenix or any
+        other configured exporter (a no-op when no tracer provider is set up).
+        """
+        span_id = uuid.uuid4().hex[:16]
+        parent_id = _current_span.get()
+        token = _current_span.set(span_id)
+        started = time.perf_counter()
+        error: BaseException | None = None
+        try:
+            with ExitStack() as stack:
+                if _tracer is not None:
+                    otel_attributes = {"request_id": request_id.get() or "", **_otel_attributes(attributes)}
+                    stack.enter_context(_tracer.start_as_current_span(name, attributes=otel_attributes))
+                yield
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _current_span.reset(token)
+            duration = time.perf_counter() - started
+            self.record_span(name, duration, error=error, span_id=span_id, parent_id=parent_id, **attributes)
+
+    async def tool_hook(self, function_name: str, function_call: Callable, arguments: dict[str, Any]) -> Any:
+        """agno ``tool_hooks`` middleware that times every tool call as a ``tool`` stage."""
+        with self.span("tool", tool=function_name):
+            result = function_call(**arguments)
+            if inspect.isawaitable(result):
+                result = await result
+        return result
+
+    def record_model_call(
+        self,
+        model: str,
+        duration: float,
+        *,
+        usage: Any = None,
+        time_to_first_token: float | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Record one model call: a ``model`` stage span, its duration, time to first token and tokens.
+
+        The span carries the call's prompt tokens and how many of them the
+        provider read from its prompt cache.
+        """
+        self.record_span(
+            "model",
+            duration,
+            error=error,
+            model=model,
+            prompt_tokens=getattr(usage, "input_tokens", None) or 0,
+            cached_tokens=getattr(usage, "cache_read_tokens", None) or 0,
+        )
+        self.model_seconds.observe(duration, model=model)
+        if time_to_first_token is not None:
+            self.model_ttft.observe(time_to_first_token, model=model)
+        for kind, attribute in (
+            ("input", "input_tokens"),
+            ("output", "output_tokens"),
+            ("cached", "cache_read_tokens"),
+        ):
+            value = getattr(usage, attribute, None)
+            if value:
+                self.tokens.inc(value, model=model, kind=kind)
+
+    def prompt_cache(self, request: str | None = None) -> dict[str, Any]:
+        """Return how many prompt tokens were read from the provider's prompt cache and how many were not.
+
+        With ``request``, only that request's model calls are counted (from the
+        recent-span buffer); otherwise every call so far.
+        """
+        if request is None:
+            prompt, cached = self.tokens.total(kind="input"), self.tokens.total(kind="cached")
+        else:
+            calls = [span for span in self.recent_spans(request) if span["name"] == "model"]
+            prompt = sum(span.get("prompt_tokens", 0) for span in calls)
+            cached = sum(span.get("cached_tokens", 0) for span in calls)
+        return {
+            "prompt_tokens": int(prompt),
+            "cached_tokens": int(cached),
+            "uncached_tokens": int(prompt - cached),
+            "hit_ratio": round(cached / prompt, 4) if prompt else 0.0,
+        }
+
+    def recent_spans(self, request: str | None = None) -> list[dict[str, Any]]:
+        """Return the buffered spans, optionally only those of one request ID."""
+        with self._spans_lock:
+            spans = list(self.spans)
+        return [span for span in spans if request is None or span["request_id"] == request]
+
+    def render(self, gauges: dict[str, Any] | None = None) -> str:
+        """Return all metrics in the Prometheus text format.
+
+        ``gauges`` is a nested dict of numbers (such as ``collect_stats()``),
+        exported as gauges named ``<prefix>_<section>_<key>``.
+        """
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for name, value in sorted(_flatten(gauges or {}, self.prefix).items()):
+            lines.extend((f"# TYPE {name} gauge", f"{name} {_format_value(value)}"))
+        return "\n".join(lines) + "\n"
+
+
+def _otel_attributes(attributes: dict[str, Any]) -> dict[str, Any]:
+    return {
+        key: value if isinstance(value, str | bool | int | float) else str(value) for key, value in attributes.items()
+    }
+
+
+def _flatten(stats: dict[str, Any], prefix: str) -> dict[str, float]:
+    """Flatten nested numeric stats into metric names; non-numeric values are skipped."""
+    flat: dict[str, float] = {}
+    for key, value in stats.items():
+        name = re.sub(r"[^a-zA-Z0-9_]", "_", f"{prefix}_{key}")
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name))
+        elif isinstance(value, int | float) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def new_request_id() -> str:
+    """Return a fresh request ID and make it current for this task."""
+    value = uuid.uuid4().hex
+    request_id.set(value)
+    return value
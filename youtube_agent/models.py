@@ -0,0 +1,114 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Model classes for the agent, instrumented for youtube_agent.metrics."""
+
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from agno.models.message import Message
+from agno.models.openrouter import OpenRouter
+from agno.models.response import ModelResponse
+
+from youtube_agent.metrics import MetricsRegistry
+from youtube_agent.resilience import Upstream
+from youtube_agent.spill import SpillStore
+
+
+@dataclass
+class InstrumentedOpenRouter(OpenRouter):
+    """OpenRouter model that reports every model call (not cache hits) to a MetricsRegistry.
+
+    With an ``upstream``, every model call goes through its circuit breaker,
+    deadline, hedging and retries; each attempt, hedges included, is reported
+    as a call of its own. Streams are only guarded by the circuit breaker,
+    since tokens already sent cannot be taken back.
+
+    With ``volatile_context``, its text (such as the current date) is
+    appended to the system message of every call. The agent's own system
+    message then stays byte-identical from call to call, so providers can
+    serve it from their prompt cache.
+
+    With a ``spill`` store, tool results it replaced with a reference are
+    read back from disk for each call, so the model sees them in full while
+    the run's message history only holds the reference.
+    """
+
+    metrics: MetricsRegistry | None = None
+    upstream: Upstream | None = None
+    volatile_context: Callable[[], str] | None = None
+    spill: SpillStore | None = None
+
+    def _restore(self, message: Message) -> Message:
+        if self.spill is None or message.role != "tool":
+            return message
+        content = self.spill.restore(message.content)
+        return message if content is message.content else message.model_copy(update={"content": content})
+
+    def _prepare_messages(self, kwargs: dict[str, Any]) -> dict[str, Any]:
+        """Return call arguments with spilled tool results restored and the volatile context appended.
+
+        Changed messages are copies, so the messages agno keeps for the run
+        (and resends on the next turn) are left unchanged.
+        """
+        messages: list[Message] | None = kwargs.get("messages")
+        if not messages or (self.volatile_context is None and self.spill is None):
+            return kwargs
+        prepared = [self._restore(message) for message in messages]
+        if self.volatile_context is not None and prepared[0].role == "system":
+            system = prepared[0]
+            prepared[0] = system.model_copy(update={"content": f"{system.content}\n{self.volatile_context()}"})
+        return {**kwargs, "messages": prepared}
+
+    async def _timed_ainvoke(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        started = time.perf_counter()
+        response = None
+        error: BaseException | None = None
+        try:
+            response = await super().ainvoke(*args, **kwargs)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            if self.metrics is not None:
+                usage = getattr(response, "response_usage", None)
+                self.metrics.record_model_call(self.id, time.perf_counter() - started, usage=usage, error=error)
+        return response
+
+    async def ainvoke(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        """Call the model and record its duration and token usage."""
+        kwargs = self._prepare_messages(kwargs)
+        if self.upstream is None:
+            return await self._timed_ainvoke(*args, **kwargs)
+        return await self.upstream.call(lambda: self._timed_ainvoke(*args, **kwargs))
+
+    async def ainvoke_stream(self, *args: Any, **kwargs: Any) -> AsyncIterator[ModelResponse]:
+        """Stream from the model and record its duration, time to first token and token usage."""
+        probe = self.upstream.breaker.check() if self.upstream is not None else False
+        started = time.perf_counter()
+        first: float | None = None
+        usage = None
+        error: BaseException | None = None
+        try:
+            async for chunk in super().ainvoke_stream(*args, **self._prepare_messages(kwargs)):
+                if first is None:
+                    first = time.perf_counter() - started
+                usage = getattr(chunk, "response_usage", None) or usage
+                yield chunk
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            if self.upstream is not None:
+                self.upstream.record(error, probe=probe)
+            if self.metrics is not None:
+                duration = time.perf_counter() - started
+                self.metrics.record_model_call(self.id, duration, usage=usage, time_to_first_token=first, error=error)
@@ -0,0 +1,203 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Token-budgeted prompt packing for transcripts: cleanup, merging and a local tokenizer."""
+
+import itertools
+import math
+import re
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from youtube_agent.summarize import format_timestamp
+from youtube_agent.transcripts import CompactTranscript
+
+TokenCounter = Callable[[str], int]
+
+_FILLER_RE = re.compile(
+    r"\[(?:music|applause|laughter|inaudible|silence|noise)\]|\b(?:um+|uh+|uhm|erm|hmm+)\b[,.]?",
+    re.IGNORECASE,
+)
+_REPEATED_WORD_RE = re.compile(r"\b(\w+)(?:\s+\1\b)+", re.IGNORECASE)
+
+
+def approximate_tokens(text: str) -> int:
+    """Estimate tokens as one per four characters (close to BPE tokenizers on English)."""
+    return math.ceil(len(text) / 4)
+
+
+def get_token_counter(model_name: str | None = None) -> TokenCounter:
+    """Return a local token counter for ``model_name``.
+
+    Uses tiktoken when it is installed (exact for OpenAI models, close for
+    others) and falls back to the four-characters-per-token estimate, also
+    when tiktoken cannot download its encoding (e.g. on an offline host).
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return approximate_tokens
+
+    try:
+        name = tiktoken.encoding_name_for_model((model_name or "").rsplit("/", 1)[-1])
+    except KeyError:
+        name = "o200k_base"
+    try:
+        encoding = tiktoken.get_encoding(name)
+    except Exception as e:
+        print(f"⚠️  Could not load the {name} tokenizer ({e}); estimating token counts instead")
+        return approximate_tokens
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def clean_caption(text: str) -> str:
+    """Drop filler words and sound tags, collapse stutters ("the the") and whitespace."""
+    text = _FILLER_RE.sub(" ", text)
+    text = _REPEATED_WORD_RE.sub(r"\1", text)
+    return " ".join(text.split())
+
+
+def _overlap(previous: list[str], words: list[str]) -> int:
+    """Length of the longest suffix of ``previous`` that ``words`` starts with."""
+    for size in range(min(len(previous), len(words)), 0, -1):
+        if previous[-size:] == words[:size]:
+            return size
+    return 0
+
+
+def clean_transcript(transcript: CompactTranscript) -> CompactTranscript:
+    """Remove filler, rolling auto-caption overlaps and empty or repeated lines.
+
+    Auto-generated captions often repeat the tail of the previous line at the
+    start of the next one; only the new words are kept.
+    """
+    lines: list[str] = []
+    keep: list[int] = []
+    previous: list[str] = []
+    for index, line in enumerate(transcript.lines()):
+        words = clean_caption(line).split()
+        new_words = words[_overlap(previous, words) :]
+        previous = words
+        if not new_words:
+            continue
+        lines.append(" ".join(new_words))
+        keep.append(index)
+
+    indices = np.asarray(keep, dtype=np.intp)
+    return CompactTranscript.from_lines(lines, transcript.starts[indices], transcript.durations[indices])
+
+
+def fit_to_budget(
+    bodies: Sequence[str],
+    render: Callable[[list[str]], str],
+    max_tokens: int | None,
+    count_tokens: TokenCounter,
+) -> tuple[str, bool]:
+    """Render ``bodies``, shortening every body by the same fraction until it fits.
+
+    Returns the rendered text and whether anything was cut. Every body keeps at
+    least one word, so coverage across the whole video is preserved.
+    """
+    text = render(list(bodies))
+    if max_tokens is None or count_tokens(text) <= max_tokens:
+        return text, False
+
+    words = [body.split() for body in bodies]
+    word_counts = np.fromiter((len(w) for w in words), dtype=np.int64, count=len(words))
+    ratio = 1.0
+    for _ in range(6):
+        ratio *= 0.95 * max_tokens / max(count_tokens(text), 1)
+        keep = np.maximum(1, np.floor(word_counts * ratio)).astype(np.int64).tolist()
+        text = render([" ".join(w[:k]) + (" …" if k < len(w) else "") for w, k in zip(words, keep, strict=True)])
+        if count_tokens(text) <= max_tokens:
+            break
+    return text, True
+
+
+@dataclass(frozen=True, slots=True)
+class PackedTranscript:
+    """Prompt-ready transcript text and how many tokens packing saved."""
+
+    text: str
+    lines: int
+    tokens_before: int
+    tokens_after: int
+    truncated: bool
+
+    @property
+    def tokens_saved(self) -> int:
+        """Tokens saved compared with the unpacked text."""
+        return max(self.tokens_before - self.tokens_after, 0)
+
+
+def pack_transcript(
+    transcript: CompactTranscript,
+    *,
+    max_tokens: int | None = None,
+    merge_seconds: float = 20.0,
+    count_tokens: TokenCounter = approximate_tokens,
+    baseline: str | None = None,
+) -> PackedTranscript:
+    """Clean the transcript, merge captions into ``merge_seconds`` lines and fit it to the budget.
+
+    Each merged line is prefixed with its exact start time. ``baseline`` is the
+    text that would have been sent without packing (default: the raw captions
+    joined with spaces) and is only used to report the tokens saved.
+    """
+    tokens_before = count_tokens(baseline if baseline is not None else " ".join(transcript.lines()))
+    cleaned = clean_transcript(transcript)
+    if not len(cleaned):
+        return PackedTranscript("", 0, tokens_before, 0, False)
+
+    # Captions whose start falls in the same merge window share one line
+    windows = np.maximum.accumulate(np.floor((cleaned.starts - cleaned.starts[0]) / merge_seconds).astype(np.int64))
+    firsts = np.flatnonzero(np.diff(windows, prepend=-1))
+    bounds = [*firsts.tolist(), len(cleaned)]
+    lines = cleaned.lines()
+    bodies = [" ".join(lines[first:last]) for first, last in itertools.pairwise(bounds)]
+    headers = [f"[{format_timestamp(start)}] " for start in cleaned.starts[firsts].tolist()]
+
+    def render(texts: list[str]) -> str:
+        return "\n".join(header + body for header, body in zip(headers, texts, strict=True))
+
+    text, truncated = fit_to_budget(bodies, render, max_tokens, count_tokens)
+    return PackedTranscript(text, len(bodies), tokens_before, count_tokens(text), truncated)
+
+
+class PackingStats:
+    """Running totals of tokens saved by transcript packing."""
+
+    def __init__(self) -> None:
+        """Start with empty totals."""
+        self.requests = 0
+        self.truncated = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+
+    def record(self, tokens_before: int, tokens_after: int, *, truncated: bool = False) -> None:
+        """Add one packed tool output."""
+        self.requests += 1
+        self.truncated += int(truncated)
+        self.tokens_before += tokens_before
+        self.tokens_after += tokens_after
+
+    def stats(self) -> dict[str, Any]:
+        """Return totals and the overall fraction of tokens saved."""
+        saved = max(self.tokens_before - self.tokens_after, 0)
+        return {
+            "requests": self.requests,
+            "truncated": self.truncated,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "tokens_saved": saved,
+            "saved_ratio": round(saved / self.tokens_before, 4) if self.tokens_before else 0.0,
+        }
@@ -0,0 +1,338 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Deadlines, hedged requests, jittered retries and circuit breakers for upstream calls."""
+
+import asyncio
+import random
+import sys
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from youtube_agent.stats import LatencySamples
+
+# Rate limits, timeouts and server errors are worth another try; other 4xx are not
+TRANSIENT_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class DeadlineExceeded(TimeoutError):
+    """An upstream call did not finish within its stage's deadline."""
+
+
+class CircuitOpenError(RuntimeError):
+    """An upstream's circuit is open: calls fail fast until it is probed again."""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        """Record which upstream is open and for how much longer."""
+        super().__init__(f"{name} is failing; not calling it for another {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def is_transient(error: BaseException) -> bool:
+    """Return True for errors a retry may fix: timeouts, dropped connections, 408/429/5xx responses."""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError, httpx.TransportError)):
+        return True
+    # requests, openai and agno are only loaded by the backends; without them no error can come from them
+    requests_errors = sys.modules.get("requests.exceptions")
+    if requests_errors is not None and isinstance(error, (requests_errors.ConnectionError, requests_errors.Timeout)):
+        return True
+    openai = sys.modules.get("openai")
+    if openai is not None and isinstance(error, openai.APIConnectionError):
+        return True
+    agno_errors = sys.modules.get("agno.exceptions")
+    if agno_errors is not None and isinstance(error, agno_errors.ModelProviderError):
+        if isinstance(error, agno_errors.ModelRateLimitError):
+            return True
+        # agno reports 502 for any provider error without a status of its own (bad requests, context
+        # length, auth), so only the HTTP or transport error it wraps tells whether a retry may help
+        return error.__cause__ is not None and is_transient(error.__cause__)
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status in TRANSIENT_STATUS_CODES
+
+
+async def within(awaitable: Awaitable[Any], seconds: float | None, stage: str) -> Any:
+    """Await ``awaitable``, raising DeadlineExceeded if ``stage`` takes longer than ``seconds``."""
+    deadline = asyncio.timeout(seconds)
+    try:
+        async with deadline:
+            return await awaitable
+    except TimeoutError as e:
+        if not deadline.expired():
+            raise
+        error_msg = f"{stage} did not finish within {seconds:g}s"
+        raise DeadlineExceeded(error_msg) from e
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Up to ``attempts`` tries, waiting a random 0..min(max_delay, base_delay * 2**n) between them."""
+
+    attempts: int = 3
+    base_delay: float = 0.25
+    max_delay: float = 4.0
+
+    def delay(self, attempt: int) -> float:
+        """Return the wait before retry number ``attempt`` (0-based), with full jitter."""
+        ceiling = min(self.max_delay, self.base_delay * 2**attempt)
+        return random.uniform(0.0, ceiling)  # noqa: S311 - jitter, not security sensitive
+
+
+class CircuitBreaker:
+    """Fails fast while an upstream keeps failing.
+
+    After ``failure_threshold`` consecutive transient failures the circuit
+    opens and calls raise CircuitOpenError without reaching the upstream.
+    After ``reset_seconds`` one call is let through as a probe: its success
+    closes the circuit, its failure opens it again. A probe that ends any
+    other way (a non-transient error, cancellation) must be handed back with
+    ``release_probe`` so the next call probes instead. Thread-safe, so the
+    transcript provider's worker threads can share one breaker.
+    """
+
+    def __init__(self, name: str, *, failure_threshold: int = 5, reset_seconds: float = 30.0) -> None:
+        """Start closed."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Return "closed", "open" or "half_open"."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half_open" if self._probing else "open"
+
+    def check(self) -> bool:
+        """Raise CircuitOpenError unless a call may go through now; return True if that call is the probe."""
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            remaining = self._opened_at + self.reset_seconds - time.monotonic()
+            if remaining <= 0 and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+        raise CircuitOpenError(self.name, max(remaining, 0.0))
+
+    def release_probe(self) -> None:
+        """Hand back a probe that neither succeeded nor failed transiently, so the next call probes."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a transient failure; open the circuit at the threshold or when a probe fails."""
+        with self._lock:
+            self.failures += 1
+            if self._probing or (self._opened_at is None and self.failures >= self.failure_threshold):
+                self.opened += int(self._opened_at is None)
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def stats(self) -> dict[str, Any]:
+        """Return the state, consecutive failures, times opened and calls rejected."""
+        return {"state": self.state, "failures": self.failures, "opened": self.opened, "rejected": self.rejected}
+
+
+class Hedger:
+    """Sends a duplicate request when the first is slower than usual; the first answer wins.
+
+    The hedge fires once a call has taken longer than the ``percentile`` of
+    recent call latencies (never sooner than ``min_delay``), and only after
+    ``min_samples`` calls have been seen. At most ``max_ratio`` of calls are
+    hedged, which bounds the extra load. The losing request is cancelled.
+    """
+
+    def __init__(
+        self, *, percentile: float = 0.95, min_samples: int = 20, min_delay: float = 1.0, max_ratio: float = 0.1
+    ) -> None:
+        """Start with no latency samples, so nothing is hedged at first."""
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_ratio = max_ratio
+        self.latency = LatencySamples(maxlen=256)
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def delay(self) -> float | None:
+        """Return how long to wait before hedging the next call, or None to not hedge it."""
+        if self.latency.count < self.min_samples or self.hedged >= self.max_ratio * max(self.calls, 1):
+            return None
+        return max(self.min_delay, self.latency.percentile(self.percentile))
+
+    async def run(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``call()``, racing a second ``call()`` against it if it is slow."""
+        self.calls += 1
+        started = time.perf_counter()
+        delay = self.delay()
+        tasks = [asyncio.ensure_future(call())]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                self.hedged += 1
+                tasks.append(asyncio.ensure_future(call()))
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in tasks if task in done and task.exception() is None), None)
+                if winner is not None:
+                    self.hedge_wins += int(winner is not tasks[0])
+                    self.latency.add(time.perf_counter() - started)
+                    return winner.result()
+                if not pending:
+                    # Every request failed; report the last error
+                    raise next(task for task in reversed(tasks) if task in done).exception()  # type: ignore[misc]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> dict[str, Any]:
+        """Return call and hedge counts, the current hedge delay and call latency."""
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_delay": self.delay(),
+            **self.latency.summary("latency"),
+        }
+
+
+class Upstream:
+    """Everything that guards the calls to one upstream backend.
+
+    Each attempt checks the circuit breaker, runs under the stage
+    ``deadline`` (async calls only) and, with a ``hedger``, is hedged.
+    Transient failures are retried with jittered backoff; other errors are
+    raised at once and do not count against the circuit.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        breaker: CircuitBreaker | None = None,
+        retry: RetryPolicy | None = None,
+        hedger: Hedger | None = None,
+        deadline: float | None = None,
+    ) -> None:
+        """Guard calls to ``name``."""
+        self.name = name
+        self.breaker = breaker or CircuitBreaker(name)
+        self.retry = retry or RetryPolicy()
+        self.hedger = hedger
+        self.deadline = deadline
+        self.retries = 0
+        self.deadlines_exceeded = 0
+
+    def _failed(self, error: Exception, attempt: int, *, probe: bool) -> float:
+        """Account for a failed attempt; return the wait before retrying, or raise ``error``."""
+        if not is_transient(error):
+            if probe:
+                self.breaker.release_probe()
+            raise error
+        self.breaker.record_failure()
+        if attempt + 1 >= self.retry.attempts:
+            raise error
+        self.retries += 1
+        return self.retry.delay(attempt)
+
+    async def _attempt(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            return await within(self.hedger.run(call) if self.hedger is not None else call(), self.deadline, self.name)
+        except DeadlineExceeded:
+            self.deadlines_exceeded += 1
+            raise
+
+    async def call(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``call()`` with the breaker, deadline, hedging and retries applied."""
+        for attempt in range(self.retry.attempts):
+            probe = self.breaker.check()
+            settled = False
+            try:
+                result = await self._attempt(call)
+            except Exception as e:
+                settled = True
+                wait = self._failed(e, attempt, probe=probe)
+            else:
+                settled = True
+                self.breaker.record_success()
+                return result
+            finally:
+                # Cancelled mid-attempt: the probe proved nothing either way
+                if probe and not settled:
+                    self.breaker.release_probe()
+            await asyncio.sleep(wait)
+        error_msg = f"{self.name} has no attempts configured"
+        raise RuntimeError(error_msg)
+
+    def call_sync(self, call: Callable[[], Any]) -> Any:
+        """Call ``call()`` (from a worker thread) with the breaker and retries applied."""
+        for attempt in range(self.retry.attempts):
+            probe = self.breaker.check()
+            settled = False
+            try:
+                result = call()
+            except Exception as e:
+                settled = True
+                wait = self._failed(e, attempt, probe=probe)
+            else:
+                settled = True
+                self.breaker.record_success()
+                return result
+            finally:
+                if probe and not settled:
+                    self.breaker.release_probe()
+            time.sleep(wait)
+        error_msg = f"{self.name} has no attempts configured"
+        raise RuntimeError(error_msg)
+
+    def record(self, error: BaseException | None, *, probe: bool = False) -> None:
+        """Feed the outcome of a call made without ``call()`` (such as a stream) into the breaker.
+
+        ``probe`` is what ``breaker.check()`` returned for the call; a probe
+        that ended without a verdict (closed early, cancelled) is handed back.
+        """
+        if error is None:
+            self.breaker.record_success()
+        elif isinstance(error, Exception) and is_transient(error):
+            self.breaker.record_failure()
+        elif probe:
+            self.breaker.release_probe()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the circuit, retry, deadline and hedging counters."""
+        return {
+            "circuit": self.breaker.stats(),
+            "retries": self.retries,
+            "deadlines_exceeded": self.deadlines_exceeded,
+            **({"hedging": self.hedger.stats()} if self.hedger is not None else {}),
+        }
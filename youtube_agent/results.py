@@ -0,0 +1,259 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Final-result cache keyed by video, analysis intent, model and prompt version."""
+
+import hashlib
+import re
+import time
+from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
+from typing import Any, Protocol
+
+from youtube_agent.cache import TieredCache
+from youtube_agent.transcripts import find_video_ids, strip_video_urls
+
+# Ordered from most to least specific; the first matching intent wins.
+_INTENT_PATTERNS: tuple[tuple[str, re.Pattern[str]], ...] = (
+    ("study_guide", re.compile(r"\bstudy[\s-]*guide|\bflash ?cards?\b|\bquiz\b", re.IGNORECASE)),
+    ("key_points", re.compile(r"\bkey (?:points|takeaways|insights)\b|\btakeaways\b|\bhighlights\b", re.IGNORECASE)),
+    ("chapters", re.compile(r"\bchapters?\b|\btimestamps?\b|\bsections?\b|\bbreak(?:\s+it)?\s+down\b", re.IGNORECASE)),
+    (
+        "summary",
+        re.compile(r"\bsummar(?:y|ize|ise)\b|\banaly[sz]e\b|\banalysis\b|\boverview\b|\btl;?dr\b", re.IGNORECASE),
+    ),
+)
+
+_REFRESH_TAG = re.compile(r"(?:^|\s)#refresh\b", re.IGNORECASE)
+_BYPASS_TAG = re.compile(r"(?:^|\s)#no-?cache\b", re.IGNORECASE)
+_MARKDOWN_TAG = re.compile(r"(?:^|\s)#markdown\b", re.IGNORECASE)
+
+_WORD_RE = re.compile(r"[\w']+")
+# Words that only restate an analysis request, as in "please give me a short summary of this video"
+_FILLER_WORDS = frozenset(
+    """
+    a an and the this that these those it its of from into in on to with for about me my us our please pls
+    can could would will you i want need like give make create write extract generate produce provide get
+    do show list break main short brief quick detailed full complete concise down up video videos clip
+    lecture talk tutorial podcast episode stream link here thanks thank hi hey
+    """.split()  # noqa: SIM905 - easier to read and extend as prose
+)
+
+
+class CacheMode(StrEnum):
+    """How a single request interacts with the result cache."""
+
+    USE = "use"
+    REFRESH = "refresh"  # skip the lookup, store the fresh result
+    BYPASS = "bypass"  # neither read nor write
+
+
+class OutputFormat(StrEnum):
+    """How a structured analysis is returned to the client."""
+
+    JSON = "json"
+    MARKDOWN = "markdown"  # rendered locally from the structured analysis
+
+
+@dataclass(frozen=True, slots=True)
+class AnalysisRequest:
+    """The cacheable identity of a request: one video, one analysis intent and anything else it asks."""
+
+    video_id: str
+    intent: str
+    question: str = ""  # normalized words left beside the URL, intent and tags; "" for a plain analysis
+
+
+def latest_user_text(messages: list[dict[str, Any]]) -> str:
+    """Return the content of the most recent user message."""
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return str(message.get("content") or "")
+    return ""
+
+
+def detect_intent(text: str) -> str | None:
+    """Classify the analysis a message asks for, or None for free-form questions."""
+    for intent, pattern in _INTENT_PATTERNS:
+        if pattern.search(text):
+            return intent
+    return None
+
+
+def request_question(text: str) -> str:
+    """Return what ``text`` asks beyond its video URLs, analysis intents and tags, normalized.
+
+    "Summarize this video: <url>" leaves "", while "what does the section at
+    12:30 of <url> say about X?" leaves "what does at 12 30 say x".
+    """
+    text = strip_video_urls(text)
+    for pattern in (_REFRESH_TAG, _BYPASS_TAG, _MARKDOWN_TAG, *(pattern for _, pattern in _INTENT_PATTERNS)):
+        text = pattern.sub(" ", text)
+    return " ".join(word for word in _WORD_RE.findall(text.lower()) if word not in _FILLER_WORDS)
+
+
+def parse_analysis_request(messages: list[dict[str, Any]]) -> AnalysisRequest | None:
+    """Extract the video, intent and any further question from the latest user message.
+
+    Only requests about exactly one video with a recognised intent are
+    cacheable; anything else (follow-ups, comparisons, chit-chat) returns None.
+    A message that also asks something else ("what does the overview of <url>
+    say about X?") keeps that question in its identity, so it never shares a
+    cached generic analysis.
+    """
+    text = latest_user_text(messages)
+    video_ids = find_video_ids(text)
+    if len(video_ids) != 1:
+        return None
+    intent = detect_intent(text)
+    if intent is None:
+        return None
+    return AnalysisRequest(video_ids[0], intent, request_question(text))
+
+
+def cache_mode(messages: list[dict[str, Any]]) -> CacheMode:
+    """Read the per-request cache flag (default: use).
+
+    Clients can set ``"cache": "refresh" | "bypass"`` on the latest message, or
+    put ``#refresh`` / ``#nocache`` in the text when they only control the prompt.
+    """
+    if not messages:
+        return CacheMode.USE
+    flag = messages[-1].get("cache")
+    if flag is not None:
+        try:
+            return CacheMode(str(flag).lower())
+        except ValueError:
+            return CacheMode.USE
+    text = latest_user_text(messages)
+    if _BYPASS_TAG.search(text):
+        return CacheMode.BYPASS
+    if _REFRESH_TAG.search(text):
+        return CacheMode.REFRESH
+    return CacheMode.USE
+
+
+def output_format(messages: list[dict[str, Any]]) -> OutputFormat:
+    """Read the per-request output format of a structured analysis (default: JSON).
+
+    Clients can set ``"format": "markdown" | "json"`` on the latest message, or
+    put ``#markdown`` in the text when they only control the prompt.
+    """
+    if not messages:
+        return OutputFormat.JSON
+    flag = messages[-1].get("format")
+    if flag is not None:
+        try:
+            return OutputFormat(str(flag).lower())
+        except ValueError:
+            return OutputFormat.JSON
+    if _MARKDOWN_TAG.search(latest_user_text(messages)):
+        return OutputFormat.MARKDOWN
+    return OutputFormat.JSON
+
+
+def prompt_fingerprint(*parts: str | None) -> str:
+    """Return a short stable hash of the prompt parts (the "prompt version")."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update((part or "").encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+class ResultBackend(Protocol):
+    """Storage used by ResultCache; TieredCache satisfies this protocol."""
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the stored value or ``default``."""
+        ...
+
+    def set(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key``."""
+        ...
+
+    def delete(self, key: str) -> None:
+        """Remove ``key``."""
+        ...
+
+
+def create_result_backend(
+    kind: str,
+    cache_dir: Path,
+    *,
+    ttl_seconds: float | None = 7 * 24 * 3600,
+    max_items: int = 512,
+) -> ResultBackend | None:
+    """Build a local result backend: ``sqlite``, ``memory`` or ``off`` (returns None)."""
+    kind = kind.lower()
+    if kind == "off":
+        return None
+    if kind == "memory":
+        return TieredCache(None, namespace="results", max_memory_items=max_items, ttl_seconds=ttl_seconds)
+    if kind == "sqlite":
+        return TieredCache(
+            cache_dir / "results.sqlite3",
+            namespace="results",
+            max_memory_items=max_items,
+            ttl_seconds=ttl_seconds,
+        )
+    error_msg = f"Unknown result cache backend: {kind!r} (expected sqlite, memory or off)"
+    raise ValueError(error_msg)
+
+
+class ResultCache:
+    """Cache of final analyses keyed by (video ID, intent, model, prompt version).
+
+    Changing ``MODEL_NAME`` or the agent instructions changes the key, so stale
+    analyses are never served after a prompt or model change.
+    """
+
+    def __init__(self, backend: ResultBackend, *, model_name: str, prompt_version: str) -> None:
+        """Create the cache for one model and prompt version."""
+        self.backend = backend
+        self.model_name = model_name
+        self.prompt_version = prompt_version
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, request: AnalysisRequest) -> str:
+        """Return the backend key for ``request``."""
+        raw = f"{request.video_id}|{request.intent}|{self.model_name}|{self.prompt_version}"
+        if request.question:
+            raw += f"|{request.question}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, request: AnalysisRequest) -> Any:
+        """Return the cached analysis content for ``request``, or None."""
+        entry = self.backend.get(self.key(request))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["content"]
+
+    def set(self, request: AnalysisRequest, content: Any) -> None:
+        """Store the analysis content for ``request``."""
+        self.backend.set(
+            self.key(request),
+            {
+                "video_id": request.video_id,
+                "intent": request.intent,
+                "question": request.question,
+                "model": self.model_name,
+                "prompt_version": self.prompt_version,
+                "created_at": time.time(),
+                "content": content,
+            },
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters."""
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,226 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Latency-aware model routing by transcript size and intent, with a fallback model."""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class Route:
+    """A model and the requests it takes: transcripts up to ``max_chars``, and only ``intents`` if set."""
+
+    model: str
+    max_chars: int | None = None
+    intents: frozenset[str] | None = None
+
+    def accepts(self, transcript_chars: int | None, intent: str | None) -> bool:
+        """Return True if a request of this size and intent fits the route.
+
+        A transcript of unknown length only fits unbounded routes.
+        """
+        if self.intents is not None and intent not in self.intents:
+            return False
+        if self.max_chars is None:
+            return True
+        return transcript_chars is not None and transcript_chars <= self.max_chars
+
+
+@dataclass(frozen=True, slots=True)
+class RouteDecision:
+    """The model chosen for one request and why."""
+
+    model: str
+    reason: str
+    fallback: str | None = None
+
+
+def parse_routes(spec: str | None) -> list[Route]:
+    """Parse ``"model<=chars:intent+intent,model"`` into routes, in order of preference.
+
+    ``<=chars`` and ``:intents`` are optional, e.g.
+    ``openai/gpt-4o-mini<=20000:summary+key_points,openai/gpt-4o``.
+    """
+    routes: list[Route] = []
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        head, _, intents = item.partition(":")
+        model, _, max_chars = head.partition("<=")
+        if not model.strip() or (max_chars and not max_chars.strip().isdigit()):
+            error_msg = f"Invalid model route {item!r}, expected model[<=max_chars][:intent+intent]"
+            raise ValueError(error_msg)
+        routes.append(
+            Route(
+                model.strip(),
+                int(max_chars) if max_chars else None,
+                frozenset(i.strip() for i in intents.split("+") if i.strip()) or None,
+            )
+        )
+    return routes
+
+
+class ModelHealth:
+    """Exponentially weighted latency and error rate of one model."""
+
+    def __init__(self, alpha: float) -> None:
+        """Start with no observations."""
+        self.alpha = alpha
+        self.latency: float | None = None
+        self.error_rate = 0.0
+        self.calls = 0
+        self.errors = 0
+        self.last_used = 0.0
+
+    def record(self, seconds: float, *, error: bool) -> None:
+        """Fold one run into the averages; failed runs only count towards the error rate."""
+        self.calls += 1
+        self.errors += int(error)
+        self.last_used = time.monotonic()
+        self.error_rate += self.alpha * (float(error) - self.error_rate)
+        if not error:
+            self.latency = seconds if self.latency is None else self.latency + self.alpha * (seconds - self.latency)
+
+
+class ModelRouter:
+    """Picks a model per request from transcript length, intent and observed health.
+
+    The first route that accepts the request is preferred. It is skipped while
+    its latency EWMA is above ``slow_seconds`` or its error rate above
+    ``max_error_rate``, in favour of the next accepting route and finally the
+    ``fallback`` model. A skipped model still gets one request every
+    ``probe_seconds`` so it can recover. The fallback is also returned with
+    each decision, for the caller to retry a failed run on.
+    """
+
+    def __init__(
+        self,
+        routes: Sequence[Route],
+        *,
+        fallback: str | None = None,
+        slow_seconds: float | None = None,
+        max_error_rate: float = 0.5,
+        alpha: float = 0.3,
+        probe_seconds: float = 30.0,
+        history: int = 128,
+    ) -> None:
+        """Create the router; the last route should accept every request."""
+        if not routes:
+            error_msg = "At least one model route is required"
+            raise ValueError(error_msg)
+        self.routes = list(routes)
+        self.fallback = fallback
+        self.slow_seconds = slow_seconds
+        self.max_error_rate = max_error_rate
+        self.alpha = alpha
+        self.probe_seconds = probe_seconds
+        self.decisions: deque[dict[str, Any]] = deque(maxlen=history)
+        self.routed: dict[str, int] = {}
+        self.fallbacks = 0
+        self._health: dict[str, ModelHealth] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def models(self) -> list[str]:
+        """Every model a request can be routed to, without duplicates."""
+        models = [route.model for route in self.routes]
+        if self.fallback is not None:
+            models.append(self.fallback)
+        return list(dict.fromkeys(models))
+
+    def health(self, model: str) -> ModelHealth:
+        """Return the health record of ``model``."""
+        with self._lock:
+            health = self._health.get(model)
+            if health is None:
+                health = self._health[model] = ModelHealth(self.alpha)
+            return health
+
+    def _unhealthy(self, model: str) -> str | None:
+        """Return why ``model`` should be skipped right now, or None (granting a probe when one is due)."""
+        health = self.health(model)
+        problem = None
+        if health.error_rate > self.max_error_rate:
+            problem = f"error rate {health.error_rate:.2f}"
+        elif self.slow_seconds is not None and health.latency is not None and health.latency > self.slow_seconds:
+            problem = f"latency EWMA {health.latency:.1f}s"
+        if problem is None:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            if now - health.last_used < self.probe_seconds:
+                return problem
+            # Stamped now rather than when the probe completes, so only this request probes
+            health.last_used = now
+        return None
+
+    def choose(self, transcript_chars: int | None, intent: str | None) -> RouteDecision:
+        """Return the model for a request with this transcript length and intent."""
+        candidates = [route.model for route in self.routes if route.accepts(transcript_chars, intent)]
+        candidates = list(dict.fromkeys(candidates or [self.routes[-1].model]))
+        skipped: list[str] = []
+        for model in candidates:
+            problem = self._unhealthy(model)
+            if problem is None:
+                reason = f"{transcript_chars if transcript_chars is not None else '?'} chars, {intent or 'free-form'}"
+                if skipped:
+                    reason += f"; skipped {', '.join(skipped)}"
+                return self._decide(model, reason)
+            skipped.append(f"{model} ({problem})")
+        if self.fallback is not None and self._unhealthy(self.fallback) is None:
+            return self._decide(self.fallback, f"fallback; skipped {', '.join(skipped)}")
+        # Everything looks unhealthy: stay on the preferred model rather than refuse the request
+        return self._decide(candidates[0], f"all models unhealthy; skipped {', '.join(skipped)}")
+
+    def _decide(self, model: str, reason: str) -> RouteDecision:
+        with self._lock:
+            self.routed[model] = self.routed.get(model, 0) + 1
+        fallback = self.fallback if self.fallback != model else None
+        return RouteDecision(model, reason, fallback)
+
+    def record(self, decision: RouteDecision, model: str, seconds: float, *, error: bool) -> None:
+        """Record the outcome of running ``decision`` on ``model`` (the fallback after a retry)."""
+        self.health(model).record(seconds, error=error)
+        with self._lock:
+            if model != decision.model:
+                self.fallbacks += 1
+            self.decisions.append({
+                "model": model,
+                "routed_to": decision.model,
+                "reason": decision.reason,
+                "seconds": round(seconds, 3),
+                "error": error,
+            })
+
+    def stats(self) -> dict[str, Any]:
+        """Return per-model routing counts, latency EWMA and error rate, and the latest decisions."""
+        with self._lock:
+            health = dict(self._health)
+            routed = dict(self.routed)
+            recent = list(self.decisions)[-10:]
+        return {
+            "fallbacks": self.fallbacks,
+            "recent": recent,
+            "models": {
+                model: {
+                    "routed": routed.get(model, 0),
+                    "calls": health[model].calls if model in health else 0,
+                    "errors": health[model].errors if model in health else 0,
+                    "latency_ewma": round(health[model].latency or 0.0, 4) if model in health else 0.0,
+                    "error_rate": round(health[model].error_rate, 4) if model in health else 0.0,
+                }
+                for model in self.models
+            },
+        }
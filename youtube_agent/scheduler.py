@@ -0,0 +1,218 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Admission control: bounded workers, a priority queue, token budgets and load shedding."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from youtube_agent.stats import LatencySamples
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+
+class OverloadedError(RuntimeError):
+    """The request was shed because the admission queue is full."""
+
+
+def parse_tpm_budgets(spec: str | None) -> dict[str, int]:
+    """Parse ``"model=tokens,model=tokens"`` into a per-model tokens-per-minute map."""
+    budgets: dict[str, int] = {}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        model, _, tokens = item.rpartition("=")
+        if not model or not tokens.strip().isdigit():
+            error_msg = f"Invalid token budget {item!r}, expected model=tokens_per_minute"
+            raise ValueError(error_msg)
+        budgets[model.strip()] = int(tokens)
+    return budgets
+
+
+class TokenBudget:
+    """Token bucket refilled continuously at ``tokens_per_minute``."""
+
+    def __init__(self, tokens_per_minute: int) -> None:
+        """Create a full bucket."""
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self.available = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: int) -> float:
+        """Wait until ``tokens`` are available, take them and return the seconds waited."""
+        tokens = min(float(tokens), self.capacity)
+        waited = 0.0
+        async with self._lock:  # first come, first served among waiters
+            self._refill()
+            while self.available < tokens:
+                delay = (tokens - self.available) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+                self._refill()
+            self.available -= tokens
+        return waited
+
+    def adjust(self, tokens: int) -> None:
+        """Charge (or refund, if negative) the difference between estimated and actual usage."""
+        self._refill()
+        self.available = min(self.capacity, self.available - tokens)
+
+
+class AdmissionScheduler:
+    """Run agent calls on a bounded pool, highest priority (lowest number) first.
+
+    When all workers are busy and ``max_queue_depth`` requests are already
+    waiting, new requests are rejected with OverloadedError instead of piling
+    up. Calls for a model with a tokens-per-minute budget first wait for
+    budget and only then for a worker, so a throttled model does not hold
+    workers idle while calls for other models queue behind it.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 8,
+        max_queue_depth: int = 64,
+        tpm_budgets: dict[str, int] | None = None,
+    ) -> None:
+        """Create the scheduler."""
+        if max_workers < 1:
+            error_msg = "max_workers must be at least 1"
+            raise ValueError(error_msg)
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.budgets = {model: TokenBudget(tpm) for model, tpm in (tpm_budgets or {}).items() if tpm > 0}
+
+        self.active = 0
+        self.admitted_count = 0
+        self.rejected = 0
+        self.completed = 0
+        self._queue: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self.queue_waits = LatencySamples()
+        self.budget_waits = LatencySamples()
+
+    @property
+    def queued(self) -> int:
+        """Number of requests waiting for a worker."""
+        return len(self._queue)
+
+    async def _acquire_worker(self, priority: int) -> None:
+        if self.active < self.max_workers and not self._queue:
+            self.active += 1
+            return
+
+        if len(self._queue) >= self.max_queue_depth:
+            self.rejected += 1
+            error_msg = f"Agent is overloaded ({self.active} running, {len(self._queue)} queued); retry later"
+            raise OverloadedError(error_msg)
+
+        slot: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._sequence), slot))
+        try:
+            await slot
+        except asyncio.CancelledError:
+            if slot.done() and not slot.cancelled():
+                # A worker was handed to us just as we were cancelled; pass it on
+                self._release_worker()
+            else:
+                # _release_worker may already have popped our cancelled slot
+                entry = next((entry for entry in self._queue if entry[2] is slot), None)
+                if entry is not None:
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+            raise
+
+    def _release_worker(self) -> None:
+        while self._queue:
+            _, _, slot = heapq.heappop(self._queue)
+            if not slot.done():
+                slot.set_result(None)  # the worker moves straight to the next waiter
+                return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def admitted(
+        self,
+        *,
+        priority: int = PRIORITY_NORMAL,
+        model: str | None = None,
+        estimated_tokens: int = 0,
+    ) -> AsyncIterator[Callable[[int | None], None]]:
+        """Take token budget, then hold a worker for the duration of the block.
+
+        Yields a ``settle(actual_tokens)`` callback that charges or refunds the
+        difference between the estimate and what the call really used.
+        """
+        budget = self.budgets.get(model) if model else None
+        charged = budget is not None and estimated_tokens > 0
+        if charged:
+            self.budget_waits.add(await budget.acquire(estimated_tokens))
+
+        enqueued = time.monotonic()
+        try:
+            await self._acquire_worker(priority)
+        except BaseException:
+            if charged:
+                budget.adjust(-estimated_tokens)  # the call never ran
+            raise
+        self.admitted_count += 1
+        self.queue_waits.add(time.monotonic() - enqueued)
+
+        def settle(actual_tokens: int | None) -> None:
+            if budget is not None and actual_tokens is not None:
+                budget.adjust(actual_tokens - estimated_tokens)
+
+        try:
+            yield settle
+        finally:
+            self.completed += 1
+            self._release_worker()
+
+    async def run(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        *,
+        priority: int = PRIORITY_NORMAL,
+        model: str | None = None,
+        estimated_tokens: int = 0,
+        actual_tokens: Callable[[Any], int | None] | None = None,
+    ) -> Any:
+        """Run ``fn()`` once a worker and token budget are available."""
+        async with self.admitted(priority=priority, model=model, estimated_tokens=estimated_tokens) as settle:
+            result = await fn()
+            if actual_tokens is not None:
+                settle(actual_tokens(result))
+            return result
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue depth, rejection counts and queue wait percentiles (seconds)."""
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "admitted": self.admitted_count,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            **self.queue_waits.summary("queue_wait"),
+            "budget_wait_p95": round(self.budget_waits.percentile(0.95), 4),
+        }
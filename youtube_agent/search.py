@@ -0,0 +1,257 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Local full-text index of fetched transcripts for timestamped "where is X mentioned" lookups."""
+
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from youtube_agent.packing import clean_transcript
+from youtube_agent.results import latest_user_text
+from youtube_agent.segmentation import STOPWORDS
+from youtube_agent.stats import LatencySamples
+from youtube_agent.summarize import format_timestamp
+from youtube_agent.transcripts import CompactTranscript, find_video_ids
+
+_WORD_RE = re.compile(r"\w+")
+
+# "where/when/at what point do they talk about X", "find where they mention X", ...
+_LOOKUP_PATTERNS = (
+    re.compile(
+        r"^\s*(?:where|when|at what (?:time|timestamp|point|minute)|what (?:time|timestamp|minute)|which "
+        r"(?:part|timestamp|minute|section))\b.*?\b(?:talks?|talked|talking|speaks?|mentions?|mentioned|discuss(?:es|ed)?"
+        r"|says?|said|explains?|explained|covers?|covered|brings? up|gets? to|shows?|showed)\s+(?:about\s+)?"
+        r"(?P<query>.+?)[\s?.!]*$",
+        re.IGNORECASE,
+    ),
+    re.compile(
+        r"^\s*(?:find|search(?: for)?|show me|list)\s+(?:where|when|(?:all\s+)?(?:mentions|timestamps) (?:of|for)"
+        r"|the (?:part|parts|moment|moments) (?:about|on|where))\s+(?:they\s+|he\s+|she\s+)?(?:talks? about\s+|mentions?\s+)?"
+        r"(?P<query>.+?)[\s?.!]*$",
+        re.IGNORECASE,
+    ),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SearchHit:
+    """One matching passage: where it starts and ends, its text and an excerpt with the matches in bold."""
+
+    video_id: str
+    start: float
+    end: float
+    text: str
+    excerpt: str
+    score: float
+
+
+@dataclass(frozen=True, slots=True)
+class TranscriptLookup:
+    """A request to find where something is said in one video."""
+
+    video_id: str
+    query: str
+
+
+def query_terms(text: str) -> list[str]:
+    """Return the searchable words of ``text``: lowercased, without stopwords or duplicates."""
+    words = [word.lower() for word in _WORD_RE.findall(text)]
+    return list(dict.fromkeys(word for word in words if word not in STOPWORDS and len(word) > 1))
+
+
+def parse_lookup(messages: list[dict[str, Any]]) -> TranscriptLookup | None:
+    """Detect a "where is X mentioned" question about one video.
+
+    The video can be named in the question itself or, for follow-ups, in an
+    earlier message of the conversation.
+    """
+    text = latest_user_text(messages)
+    for pattern in _LOOKUP_PATTERNS:
+        match = pattern.match(text)
+        if match is not None:
+            break
+    else:
+        return None
+
+    # Drop the video's URL and a trailing "in this video" or "in <url>"
+    query = " ".join(word for word in match.group("query").split() if not find_video_ids(word))
+    query = re.sub(
+        r"\s+(?:in|on|during)\s+(?:this|the|that)\s+(?:video|talk|lecture|episode)\b.*$", "", query, flags=re.IGNORECASE
+    )
+    query = re.sub(r"\s+(?:in|on|from|during)$", "", query, flags=re.IGNORECASE)
+    if not query_terms(query):
+        return None
+
+    for message in reversed(messages):
+        video_ids = find_video_ids(str(message.get("content") or ""))
+        if len(video_ids) == 1:
+            return TranscriptLookup(video_ids[0], query)
+        if video_ids:
+            return None
+    return None
+
+
+class TranscriptIndex:
+    """SQLite FTS5 index of transcript passages with their start and end times.
+
+    Each transcript is cleaned the same way as for prompts and indexed as
+    passages of about ``passage_seconds``, so a phrase that spans a few
+    caption lines is still found. Words are Porter-stemmed and matched by
+    prefix, so "backprop" also finds "backpropagation". Videos are indexed
+    once; ``path=None`` keeps the index in memory, which is what tests use.
+    """
+
+    def __init__(self, path: str | Path | None, *, passage_seconds: float = 20.0) -> None:
+        """Open (or create) the index at ``path``."""
+        self.passage_seconds = passage_seconds
+        self.searches = 0
+        self.hits = 0
+        self.search_latency = LatencySamples()
+        self._indexed: set[str] = set()
+        self._lock = threading.Lock()
+
+        if path is not None:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+        # Worker processes (--workers) share the file; wait for another writer's lock rather than fail
+        self._db = sqlite3.connect(
+            ":memory:" if path is None else path, check_same_thread=False, isolation_level=None, timeout=30.0
+        )
+        if path is not None:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS passages "
+            "USING fts5(text, video_id UNINDEXED, start UNINDEXED, end UNINDEXED, tokenize='porter unicode61')"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS indexed_videos "
+            "(video_id TEXT PRIMARY KEY, passages INTEGER NOT NULL, indexed_at REAL NOT NULL)"
+        )
+
+    def contains(self, video_id: str) -> bool:
+        """Return True if ``video_id`` has been indexed (by this or another process)."""
+        if video_id in self._indexed:
+            return True
+        with self._lock:
+            row = self._db.execute("SELECT 1 FROM indexed_videos WHERE video_id = ?", (video_id,)).fetchone()
+        if row is not None:
+            self._indexed.add(video_id)
+        return row is not None
+
+    def _passages(self, transcript: CompactTranscript) -> list[tuple[str, float, float]]:
+        cleaned = clean_transcript(transcript)
+        passages: list[tuple[str, float, float]] = []
+        lines: list[str] = []
+        start = end = 0.0
+        for line, line_start, line_end in zip(
+            cleaned.lines(), cleaned.starts.tolist(), cleaned.ends.tolist(), strict=True
+        ):
+            if not lines:
+                start = line_start
+            lines.append(line)
+            end = line_end
+            if end - start >= self.passage_seconds:
+                passages.append((" ".join(lines), start, end))
+                lines = []
+        if lines:
+            passages.append((" ".join(lines), start, end))
+        return passages
+
+    def add(self, video_id: str, transcript: CompactTranscript) -> int:
+        """Index a transcript unless it already is; returns the number of passages added."""
+        if self.contains(video_id):
+            return 0
+        passages = self._passages(transcript)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                # Another process may have indexed it while this one was cleaning the transcript
+                if self._db.execute("SELECT 1 FROM indexed_videos WHERE video_id = ?", (video_id,)).fetchone():
+                    self._db.execute("ROLLBACK")
+                    self._indexed.add(video_id)
+                    return 0
+                self._db.executemany(
+                    "INSERT INTO passages (text, video_id, start, end) VALUES (?, ?, ?, ?)",
+                    [(text, video_id, start, end) for text, start, end in passages],
+                )
+                self._db.execute(
+                    "INSERT INTO indexed_videos (video_id, passages, indexed_at) VALUES (?, ?, ?)",
+                    (video_id, len(passages), time.time()),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        self._indexed.add(video_id)
+        return len(passages)
+
+    def _match(self, query: str, video_id: str | None, limit: int, operator: str) -> list[SearchHit]:
+        terms = query_terms(query)
+        if not terms:
+            return []
+        expression = f" {operator} ".join(f'"{term}"*' for term in terms)
+        sql = (
+            "SELECT video_id, start, end, text, snippet(passages, 0, '**', '**', '…', 24), bm25(passages) "
+            "FROM passages WHERE passages MATCH ?"
+        )
+        params: list[Any] = [expression]
+        if video_id is not None:
+            sql += " AND video_id = ?"
+            params.append(video_id)
+        sql += " ORDER BY bm25(passages) LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [SearchHit(row[0], float(row[1]), float(row[2]), row[3], row[4], -float(row[5])) for row in rows]
+
+    def search(self, query: str, *, video_id: str | None = None, limit: int = 5) -> list[SearchHit]:
+        """Return the passages best matching every word of ``query`` (any word if none match all).
+
+        Hits are ordered by relevance; use their ``start`` to order them in time.
+        """
+        started = time.perf_counter()
+        hits = self._match(query, video_id, limit, "AND") or self._match(query, video_id, limit, "OR")
+        self.search_latency.add(time.perf_counter() - started)
+        self.searches += 1
+        self.hits += bool(hits)
+        return hits
+
+    def stats(self) -> dict[str, Any]:
+        """Return the number of indexed videos and passages, and search counts and latency."""
+        with self._lock:
+            videos, passages = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(passages), 0) FROM indexed_videos"
+            ).fetchone()
+        return {
+            "videos": videos,
+            "passages": passages,
+            "searches": self.searches,
+            "hits": self.hits,
+            **self.search_latency.summary("search"),
+        }
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            self._db.close()
+
+
+def format_hits(video_id: str, query: str, hits: list[SearchHit]) -> str:
+    """Render hits in time order as markdown lines linking to each moment of the video."""
+    url = f"https://www.youtube.com/watch?v={video_id}"
+    lines = [f'Mentions of "{query}" in {url}:', ""]
+    for hit in sorted(hits, key=lambda hit: hit.start):
+        lines.append(f"- [{format_timestamp(hit.start)}]({url}&t={int(hit.start)}s) {hit.excerpt}")
+    return "\n".join(lines)
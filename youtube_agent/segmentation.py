@@ -0,0 +1,251 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Local topic segmentation (TextTiling over TF-IDF blocks) that finds chapter boundaries."""
+
+import itertools
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from youtube_agent.summarize import format_timestamp
+from youtube_agent.transcripts import TranscriptSnippet
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9']+")
+
+# Short, high-frequency words that carry no topic signal
+_STOPWORDS_TEXT = """
+about above after again against all also and any are around back because been before being below
+between both but can could did does doing don down during each even every few for from further get
+going gonna got had has have having her here hers him his how into its itself just know like look
+make more most much need now off once one only other our out over own really right said same say see
+she should some something still such sure take than that thats the their them then there these they
+thing things think this those through too under until very want was way well were what when where
+which while who why will with would yeah yes you your youre
+"""
+STOPWORDS = frozenset(_STOPWORDS_TEXT.split())
+
+
+@dataclass(frozen=True, slots=True)
+class Segment:
+    """A topically coherent span of the transcript with exact caption start/end times."""
+
+    index: int
+    start: float
+    end: float
+    text: str
+    keywords: tuple[str, ...]
+
+
+def _tokenize(text: str) -> list[str]:
+    return [word for word in _WORD_RE.findall(text.lower()) if len(word) > 2 and word not in STOPWORDS]
+
+
+@dataclass(frozen=True, slots=True)
+class _TermWeights:
+    """Sparse TF-IDF matrix: the weight of every (term, block) pair that occurs, sorted by term then block."""
+
+    keys: np.ndarray  # term * n_blocks + block
+    weights: np.ndarray
+    n_blocks: int
+    vocabulary: list[str]
+
+    @property
+    def blocks(self) -> np.ndarray:
+        """Block of every entry."""
+        return self.keys % self.n_blocks
+
+    @property
+    def terms(self) -> np.ndarray:
+        """Vocabulary index of every entry."""
+        return self.keys // self.n_blocks
+
+    def block_scores(self, first: int, last: int) -> np.ndarray:
+        """Return the summed weight of every term over blocks ``first`` to ``last`` (exclusive)."""
+        blocks = self.blocks
+        inside = (blocks >= first) & (blocks < last)
+        return np.bincount(self.terms[inside], weights=self.weights[inside], minlength=len(self.vocabulary))
+
+
+def _block_term_weights(block_ids: np.ndarray, texts: Sequence[str], n_blocks: int) -> _TermWeights:
+    """Return the TF-IDF weights of every block, without materialising the dense (blocks x vocabulary) matrix."""
+    vocabulary: dict[str, int] = {}
+    rows: list[int] = []
+    cols: list[int] = []
+    for block, text in zip(block_ids.tolist(), texts, strict=True):
+        for word in _tokenize(text):
+            rows.append(block)
+            cols.append(vocabulary.setdefault(word, len(vocabulary)))
+
+    pairs = np.asarray(cols, dtype=np.int64) * n_blocks + np.asarray(rows, dtype=np.int64)
+    keys, counts = np.unique(pairs, return_counts=True)
+    document_frequency = np.bincount(keys // n_blocks, minlength=len(vocabulary))
+    idf = np.log((1 + n_blocks) / (1 + document_frequency)) + 1.0
+    return _TermWeights(keys, counts * idf[keys // n_blocks], n_blocks, list(vocabulary))
+
+
+def _band_products(matrix: _TermWeights, reach: int) -> np.ndarray:
+    """Return ``band[i, d]``, the dot product of blocks ``i`` and ``i + d``, for every ``d < reach``."""
+    keys, weights, n_blocks = matrix.keys, matrix.weights, matrix.n_blocks
+    blocks = matrix.blocks
+    band = np.zeros((n_blocks, reach))
+    if not len(keys):
+        return band
+    for distance in range(reach):
+        # The same term ``distance`` blocks later has the key ``distance`` higher
+        target = keys + distance
+        found = np.minimum(np.searchsorted(keys, target), len(keys) - 1)
+        match = (keys[found] == target) & (blocks + distance < n_blocks)
+        band[:, distance] = np.bincount(
+            blocks[match], weights=weights[match] * weights[found[match]], minlength=n_blocks
+        )
+    return band
+
+
+def _gap_similarity(matrix: _TermWeights, window: int) -> np.ndarray:
+    """Cosine similarity between the ``window`` blocks before and after every gap.
+
+    The window sums are never built: their dot product and norms are sums of
+    products of block pairs at most ``2 * window - 1`` apart, read from a
+    (blocks x 2 * window) band, so memory grows with the transcript, not with
+    its length times its vocabulary.
+    """
+    n_blocks = matrix.n_blocks
+    band = _band_products(matrix, 2 * window)
+    gaps = np.arange(1, n_blocks)  # gap g sits between block g-1 and block g
+
+    def pair(first: np.ndarray, distance: int) -> np.ndarray:
+        # Block pairs running off either end of the video are outside the window
+        valid = (first >= 0) & (first + distance < n_blocks)
+        return np.where(valid, band[np.clip(first, 0, n_blocks - 1), distance], 0.0)
+
+    dot = np.zeros(len(gaps))
+    before = np.zeros(len(gaps))
+    after = np.zeros(len(gaps))
+    for a in range(window):
+        for b in range(window):
+            # Block g-1-a before the gap against block g+b after it
+            dot += pair(gaps - 1 - a, a + b + 1)
+            if a <= b:
+                weight = 1.0 if a == b else 2.0
+                before += weight * pair(gaps - 1 - b, b - a)
+                after += weight * pair(gaps + a, b - a)
+    norms = np.sqrt(np.maximum(before, 0.0) * np.maximum(after, 0.0))
+    return np.divide(dot, norms, out=np.zeros(len(gaps)), where=norms > 0)
+
+
+def _depth_scores(similarity: np.ndarray, reach: int) -> np.ndarray:
+    """How far each gap dips below the highest similarity within ``reach`` gaps on either side."""
+    padded = np.pad(similarity, reach, mode="edge")
+    windows = sliding_window_view(padded, reach + 1)
+    left_peak = windows[: len(similarity)].max(axis=1)
+    right_peak = windows[reach:].max(axis=1)
+    return (left_peak - similarity) + (right_peak - similarity)
+
+
+def find_boundaries(
+    similarity: np.ndarray,
+    *,
+    min_gap: int,
+    max_boundaries: int | None = None,
+    cutoff_std: float = 0.5,
+) -> list[int]:
+    """Pick the deepest similarity valleys as boundaries, at least ``min_gap`` gaps apart.
+
+    A gap qualifies when its depth score exceeds ``mean + cutoff_std * std`` of
+    all depth scores; qualifying gaps are then taken deepest first.
+    """
+    if len(similarity) == 0:
+        return []
+    depth = _depth_scores(similarity, reach=max(min_gap, 1))
+    cutoff = depth.mean() + cutoff_std * depth.std()
+
+    chosen: list[int] = []
+    for gap in np.argsort(-depth, kind="stable").tolist():
+        if depth[gap] <= cutoff or (max_boundaries is not None and len(chosen) >= max_boundaries):
+            break
+        # Keep boundaries away from each other and from the ends of the video
+        if gap + 1 < min_gap or len(similarity) - gap < min_gap:
+            continue
+        if all(abs(gap - other) >= min_gap for other in chosen):
+            chosen.append(gap)
+    return sorted(chosen)
+
+
+def segment_transcript(
+    snippets: Sequence[TranscriptSnippet],
+    *,
+    block_seconds: float = 30.0,
+    window_blocks: int = 4,
+    min_segment_seconds: float = 120.0,
+    max_segments: int | None = 24,
+    keywords: int = 4,
+) -> list[Segment]:
+    """Split a transcript into topical segments.
+
+    Snippets are grouped into ``block_seconds`` blocks, each block becomes a
+    TF-IDF vector, and boundaries go where the similarity between the
+    ``window_blocks`` blocks before and after a gap drops the deepest
+    (TextTiling). Boundaries always fall on a caption start time, so every
+    segment's start and end are exact transcript times.
+    """
+    if not snippets:
+        return []
+
+    starts = np.fromiter((snippet.start for snippet in snippets), dtype=np.float64, count=len(snippets))
+    ends = np.fromiter((snippet.end for snippet in snippets), dtype=np.float64, count=len(snippets))
+    # Non-decreasing block numbers, even if a caption is slightly out of order
+    block_ids = np.maximum.accumulate(np.floor((starts - starts.min()) / block_seconds).astype(np.intp))
+    n_blocks = int(block_ids[-1]) + 1
+
+    cut_snippets: list[int] = []
+    weights: _TermWeights | None = None
+    if n_blocks > 1:
+        weights = _block_term_weights(block_ids, [snippet.text for snippet in snippets], n_blocks)
+        similarity = _gap_similarity(weights, window_blocks)
+        min_gap = max(1, round(min_segment_seconds / block_seconds))
+        limit = None if max_segments is None else max(max_segments - 1, 0)
+        gaps = find_boundaries(similarity, min_gap=min_gap, max_boundaries=limit)
+        # Gap g starts block g + 1; the segment starts at that block's first caption
+        cut_snippets = np.searchsorted(block_ids, np.asarray(gaps, dtype=np.intp) + 1, side="left").tolist()
+
+    bounds = [0, *cut_snippets, len(snippets)]
+    segments: list[Segment] = []
+    for first, last in itertools.pairwise(bounds):
+        if first >= last:
+            continue
+        terms: tuple[str, ...] = ()
+        if weights is not None and weights.vocabulary and keywords:
+            scores = weights.block_scores(int(block_ids[first]), int(block_ids[last - 1]) + 1)
+            top = np.argsort(-scores, kind="stable")[:keywords]
+            terms = tuple(weights.vocabulary[i] for i in top.tolist() if scores[i] > 0)
+        segments.append(
+            Segment(
+                index=len(segments),
+                start=float(starts[first]),
+                end=float(ends[first:last].max()),
+                text=" ".join(snippet.text for snippet in snippets[first:last]),
+                keywords=terms,
+            )
+        )
+    return segments
+
+
+def format_segments(segments: Sequence[Segment]) -> str:
+    """Render segments for the agent: exact time range, keywords and text of each."""
+    parts = []
+    for segment in segments:
+        header = f"[Segment {segment.index + 1}] {format_timestamp(segment.start)} - {format_timestamp(segment.end)}"
+        if segment.keywords:
+            header += f" (keywords: {', '.join(segment.keywords)})"
+        parts.append(f"{header}\n{segment.text}")
+    return "\n\n".join(parts)
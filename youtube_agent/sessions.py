@@ -0,0 +1,266 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Per-conversation store of compact video analyses, used to answer follow-up questions."""
+
+import hashlib
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+from textwrap import dedent
+from typing import Any
+
+from youtube_agent.cache import TieredCache
+from youtube_agent.search import SearchHit
+from youtube_agent.summarize import format_timestamp
+from youtube_agent.transcripts import find_video_ids
+
+_TIMESTAMP_RE = re.compile(r"\b(?:\d{1,2}:)?\d{1,2}:\d{2}\b")
+_BULLET_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+_MARKUP_RE = re.compile(r"[*_`#>]+")
+
+FOLLOWUP_INSTRUCTIONS = dedent("""\
+    You answer follow-up questions about a YouTube video that has already been analyzed.
+    Use only the analysis and transcript excerpts you are given; cite their timestamps (HH:MM:SS).
+    If they do not contain the answer, say so instead of guessing.
+""")
+
+
+def _plain(line: str) -> str:
+    """Strip list markers and markdown emphasis from one line."""
+    return " ".join(_MARKUP_RE.sub("", _BULLET_RE.sub("", line)).split())
+
+
+def _clip(text: str, max_chars: int) -> str:
+    return text if len(text) <= max_chars else text[: max_chars - 1].rstrip() + "…"
+
+
+@dataclass(frozen=True, slots=True)
+class VideoAnalysis:
+    """The compact form of one finished analysis: overview, timestamped chapters and key points."""
+
+    video_id: str
+    overview: str
+    chapters: tuple[str, ...]
+    key_points: tuple[str, ...]
+
+    @classmethod
+    def from_markdown(
+        cls,
+        video_id: str,
+        text: str,
+        *,
+        max_overview_chars: int = 800,
+        max_chapters: int = 30,
+        max_key_points: int = 15,
+        max_line_chars: int = 200,
+    ) -> "VideoAnalysis":
+        """Distill the agent's markdown answer: lines with timestamps become chapters, other bullets key points.
+
+        The overview is the first paragraph of prose. Every part is capped, so
+        the artifact stays the same size however long the analysis was.
+        """
+        overview: list[str] = []
+        chapters: list[str] = []
+        key_points: list[str] = []
+        for raw in text.splitlines():
+            line = _plain(raw)
+            if not line or raw.lstrip().startswith("#"):
+                if overview and not line:
+                    overview.append("")
+                continue
+            if _TIMESTAMP_RE.search(line):
+                chapters.append(_clip(line, max_line_chars))
+            elif _BULLET_RE.match(raw):
+                key_points.append(_clip(line, max_line_chars))
+            elif "" not in overview and not chapters and not key_points:
+                overview.append(line)
+        return cls(
+            video_id,
+            _clip(" ".join(part for part in overview if part), max_overview_chars),
+            tuple(chapters[:max_chapters]),
+            tuple(key_points[:max_key_points]),
+        )
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "VideoAnalysis":
+        """Decode the stored form."""
+        return cls(payload["video_id"], payload["overview"], tuple(payload["chapters"]), tuple(payload["key_points"]))
+
+    def to_payload(self) -> dict[str, Any]:
+        """Return the JSON-serializable form kept in the session store."""
+        return {
+            "video_id": self.video_id,
+            "overview": self.overview,
+            "chapters": list(self.chapters),
+            "key_points": list(self.key_points),
+        }
+
+    def render(self) -> str:
+        """Render the analysis as the compact text given to the follow-up agent."""
+        parts = [f"Video: https://www.youtube.com/watch?v={self.video_id}"]
+        if self.overview:
+            parts.append(f"Overview: {self.overview}")
+        if self.chapters:
+            parts.append("Chapters:\n" + "\n".join(f"- {chapter}" for chapter in self.chapters))
+        if self.key_points:
+            parts.append("Key points:\n" + "\n".join(f"- {point}" for point in self.key_points))
+        return "\n\n".join(parts)
+
+
+# Conversation ids a caller may put on its messages; A2A task ids change every turn, so they are not one
+_CONVERSATION_ID_KEYS = ("context_id", "contextId", "user_id", "userId")
+
+
+def session_id(messages: list[dict[str, Any]], reply: str | None = None) -> str | None:
+    """Identify the conversation ``messages`` belong to.
+
+    A context or user id on the messages is used when the caller provides
+    one. Otherwise the conversation is identified by its first user message
+    together with the first assistant reply, both of which every later turn
+    resends; ``reply`` stands in for that reply while it is being produced.
+    Whitespace is ignored, so a client that reflows the reply still matches.
+    """
+    for message in reversed(messages):
+        for key in _CONVERSATION_ID_KEYS:
+            if message.get(key):
+                return hashlib.sha256(f"{key}:{message[key]}".encode()).hexdigest()[:32]
+
+    first_user = next((message for message in messages if message.get("role") == "user"), None)
+    if first_user is None:
+        return None
+    first_reply = next((message for message in messages if message.get("role") == "assistant"), None)
+    if first_reply is not None:
+        reply = str(first_reply.get("content") or "")
+    if reply is None:
+        return None
+    digest = hashlib.sha256()
+    for part in (str(first_user.get("content") or ""), reply):
+        digest.update(" ".join(part.split()).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:32]
+
+
+def followup_video(messages: list[dict[str, Any]]) -> str | None:
+    """Return the video a follow-up question is about, or None if this is not a follow-up.
+
+    A follow-up names no video itself; it is about the one video named by the
+    most recent earlier message that names any.
+    """
+    user_turns = [i for i, message in enumerate(messages) if message.get("role") == "user"]
+    if len(user_turns) < 2 or find_video_ids(str(messages[user_turns[-1]].get("content") or "")):
+        return None
+    for message in reversed(messages[: user_turns[-1]]):
+        video_ids = find_video_ids(str(message.get("content") or ""))
+        if video_ids:
+            return video_ids[0] if len(video_ids) == 1 else None
+    return None
+
+
+def build_followup_prompt(
+    analysis: VideoAnalysis,
+    messages: list[dict[str, Any]],
+    excerpts: Sequence[SearchHit] = (),
+    *,
+    max_excerpt_chars: int = 600,
+    max_previous_chars: int = 600,
+) -> str:
+    """Build the single prompt for a follow-up: the analysis, relevant excerpts and the question.
+
+    Only the previous exchange is included (clipped), not the whole
+    conversation, so the prompt does not grow with the number of turns.
+    """
+    question = ""
+    previous: list[str] = []
+    for message in reversed(messages):
+        role, content = message.get("role"), str(message.get("content") or "")
+        if not question:
+            if role == "user":
+                question = content
+            continue
+        if role in ("user", "assistant") and len(previous) < 2:
+            previous.insert(0, f"{role.title()}: {_clip(' '.join(content.split()), max_previous_chars)}")
+        if len(previous) == 2:
+            break
+
+    parts = [f"ANALYSIS\n{analysis.render()}"]
+    if excerpts:
+        lines = [
+            f"[{format_timestamp(hit.start)} - {format_timestamp(hit.end)}] {_clip(hit.text, max_excerpt_chars)}"
+            for hit in sorted(excerpts, key=lambda hit: hit.start)
+        ]
+        parts.append("TRANSCRIPT EXCERPTS\n" + "\n".join(lines))
+    if previous:
+        parts.append("PREVIOUS EXCHANGE\n" + "\n".join(previous))
+    parts.append(f"QUESTION\n{question}")
+    return "\n\n".join(parts)
+
+
+class SessionStore:
+    """Compact analyses per conversation and video, kept in a TieredCache.
+
+    With a SQLite-backed cache every worker process sees every session.
+    """
+
+    def __init__(self, store: TieredCache) -> None:
+        """Keep analyses in ``store``."""
+        self.store = store
+        self.stored = 0
+        self.followups = 0
+        self.misses = 0
+        self.prompt_chars_max = 0
+
+    @staticmethod
+    def key(session: str, video_id: str) -> str:
+        """Return the cache key of one video's analysis in one conversation."""
+        return f"{session}:{video_id}"
+
+    def remember(
+        self, messages: list[dict[str, Any]], video_id: str, content: Any, *, reply: str | None = None
+    ) -> VideoAnalysis | None:
+        """Store the compact form of an analysis of ``video_id`` made in this conversation.
+
+        ``reply`` is the text sent back for ``messages`` when it is not
+        ``content`` itself (such as the JSON of a structured analysis).
+        """
+        if not isinstance(content, str) or not content.strip():
+            return None
+        session = session_id(messages, reply if reply is not None else content)
+        if session is None:
+            return None
+        analysis = VideoAnalysis.from_markdown(video_id, content)
+        self.store.set(self.key(session, video_id), analysis.to_payload())
+        self.stored += 1
+        return analysis
+
+    def lookup(self, messages: list[dict[str, Any]]) -> VideoAnalysis | None:
+        """Return the stored analysis a follow-up question in this conversation is about, if any."""
+        video_id = followup_video(messages)
+        session = session_id(messages)
+        if video_id is None or session is None:
+            return None
+        payload = self.store.get(self.key(session, video_id))
+        if payload is None:
+            self.misses += 1
+            return None
+        self.followups += 1
+        return VideoAnalysis.from_payload(payload)
+
+    def record_prompt(self, prompt: str) -> None:
+        """Track the size of follow-up prompts."""
+        self.prompt_chars_max = max(self.prompt_chars_max, len(prompt))
+
+    def stats(self) -> dict[str, Any]:
+        """Return how many analyses were stored and follow-ups answered from them."""
+        return {
+            "stored": self.stored,
+            "followups": self.followups,
+            "misses": self.misses,
+            "prompt_chars_max": self.prompt_chars_max,
+        }
@@ -0,0 +1,69 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Single-flight coalescing of concurrent identical calls."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class _Call:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; duplicate callers share its result.
+
+    The shared call runs in its own task, so a caller that is cancelled only
+    stops waiting; the call is cancelled once no caller is waiting for it any
+    more. Exceptions propagate to every caller of the call that raised them.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty in-flight table."""
+        self._calls: dict[Hashable, _Call] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of ``fn()``, joining an in-flight call for ``key`` if any."""
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if not call.task.done() and call.waiters == 1:
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def in_flight(self) -> int:
+        """Return the number of calls currently running."""
+        return len(self._calls)
+
+    def stats(self) -> dict[str, int]:
+        """Return leader/coalesced counters."""
+        return {"leaders": self.leaders, "coalesced": self.coalesced, "in_flight": self.in_flight()}
@@ -0,0 +1,129 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Large tool outputs kept on disk, with a short reference in the agent's message history instead."""
+
+import inspect
+import re
+import shutil
+import tempfile
+import threading
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+_REFERENCE_RE = re.compile(r"\A\[spilled tool output ([0-9a-f]{32}): [^\]]*\]\Z")
+
+# The spilled outputs of the agent run in progress, deleted when it ends
+_scope: ContextVar[list[str] | None] = ContextVar("youtube_agent_spill_scope", default=None)
+
+
+class SpillStore:
+    """Writes tool outputs over ``max_chars`` to files and returns a reference in their place.
+
+    The reference is what agno keeps in the run's message history, so a
+    transcript-sized output is not held in memory for the rest of the run.
+    The model layer calls ``restore`` on every message it sends, so the
+    model still sees the full output. Outputs spilled inside ``scope()`` are
+    deleted when the scope ends, others when ``release_references`` is given
+    the run's messages; the rest go when the store is closed.
+    """
+
+    def __init__(self, directory: Path | None = None, *, max_chars: int = 16_000) -> None:
+        """Spill into ``directory``, or into a fresh temporary directory."""
+        self.directory = Path(directory or tempfile.mkdtemp(prefix="youtube-agent-spill-"))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_chars = max_chars
+        self.spilled = 0
+        self.spilled_chars = 0
+        self.restored = 0
+        self.released = 0
+        self._lock = threading.Lock()
+
+    def _path(self, output_id: str) -> Path:
+        return self.directory / f"{output_id}.txt"
+
+    def spill(self, function_name: str, output: str) -> str:
+        """Write ``output`` to disk and return its reference."""
+        output_id = uuid.uuid4().hex
+        self._path(output_id).write_text(output, encoding="utf-8")
+        with self._lock:
+            self.spilled += 1
+            self.spilled_chars += len(output)
+        owned = _scope.get()
+        if owned is not None:
+            owned.append(output_id)
+        return f"[spilled tool output {output_id}: {function_name}, {len(output)} characters]"
+
+    def restore(self, content: Any) -> Any:
+        """Return the spilled output ``content`` refers to, or ``content`` itself if it is no reference."""
+        if not isinstance(content, str) or not content.startswith("[spilled tool output "):
+            return content
+        match = _REFERENCE_RE.match(content)
+        if match is None:
+            return content
+        try:
+            output = self._path(match.group(1)).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return content
+        with self._lock:
+            self.restored += 1
+        return output
+
+    async def tool_hook(self, function_name: str, function_call: Callable, arguments: dict[str, Any]) -> Any:
+        """agno ``tool_hooks`` middleware that spills string results over ``max_chars``."""
+        result = function_call(**arguments)
+        if inspect.isawaitable(result):
+            result = await result
+        if isinstance(result, str) and len(result) > self.max_chars:
+            return self.spill(function_name, result)
+        return result
+
+    def release(self, output_ids: list[str]) -> None:
+        """Delete spilled outputs that are no longer needed."""
+        for output_id in output_ids:
+            self._path(output_id).unlink(missing_ok=True)
+        with self._lock:
+            self.released += len(output_ids)
+
+    def release_references(self, contents: Iterable[Any]) -> None:
+        """Delete the spilled outputs any of ``contents`` (such as a finished run's messages) refer to."""
+        self.release([
+            match.group(1)
+            for content in contents
+            if isinstance(content, str) and (match := _REFERENCE_RE.match(content)) is not None
+        ])
+
+    @contextmanager
+    def scope(self) -> Iterator[None]:
+        """Delete the outputs spilled inside the block (one agent run) when it ends."""
+        owned: list[str] = []
+        token = _scope.set(owned)
+        try:
+            yield
+        finally:
+            _scope.reset(token)
+            self.release(owned)
+
+    def close(self) -> None:
+        """Delete every spilled output and the spill directory."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def stats(self) -> dict[str, Any]:
+        """Return how many outputs were spilled, restored for a model call and released."""
+        return {
+            "spilled": self.spilled,
+            "spilled_chars": self.spilled_chars,
+            "restored": self.restored,
+            "released": self.released,
+            "max_chars": self.max_chars,
+        }
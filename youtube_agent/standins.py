@@ -0,0 +1,390 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Local stand-ins for OpenRouter, YouTube and Mem0, used by the offline benchmarks and tests."""
+
+import json
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from youtube_agent.stats import LatencySamples
+from youtube_agent.transcripts import TranscriptSnippet, find_video_ids
+
+TOPICS: tuple[tuple[str, ...], ...] = (
+    ("python", "function", "variable", "loop", "list", "dictionary", "import", "module", "class", "exception"),
+    ("guitar", "chord", "string", "strum", "melody", "rhythm", "fret", "tuning", "scale", "pick"),
+    ("bread", "flour", "yeast", "dough", "oven", "knead", "crust", "bake", "proof", "starter"),
+    ("planet", "orbit", "telescope", "galaxy", "star", "gravity", "nebula", "comet", "light", "moon"),
+    ("market", "revenue", "customer", "pricing", "growth", "margin", "sales", "funnel", "churn", "retention"),
+    ("muscle", "squat", "protein", "workout", "cardio", "stretch", "recovery", "reps", "sets", "form"),
+)
+
+_FILLER_TEXT = "so we basically here going look this thing and then you know right okay now let me show what happens"
+FILLER: tuple[str, ...] = tuple(_FILLER_TEXT.split())
+
+# Tools the stand-in model calls once per conversation when a video URL is present
+_TRANSCRIPT_TOOLS = ("get_video_segments", "get_youtube_video_captions")
+
+
+def synthetic_transcript(
+    minutes: float,
+    *,
+    topic_minutes: float = 6.0,
+    caption_seconds: float = 3.0,
+    words_per_caption: int = 10,
+    topic_word_rate: float = 0.3,
+    seed: int = 0,
+) -> tuple[list[TranscriptSnippet], list[float]]:
+    """Return ``minutes`` of captions that change topic every ``topic_minutes``, and the true boundary times."""
+    rng = random.Random(seed)  # noqa: S311 - synthetic data, not security sensitive
+    snippets: list[TranscriptSnippet] = []
+    boundaries: list[float] = []
+    topic = -1
+    now = 0.0
+    while now < minutes * 60:
+        if topic < 0 or int(now // (topic_minutes * 60)) != len(boundaries) - 1:
+            topic = (topic + 1 + rng.randrange(len(TOPICS) - 1)) % len(TOPICS)
+            boundaries.append(now)
+        vocabulary = TOPICS[topic]
+        words = [
+            rng.choice(vocabulary) if rng.random() < topic_word_rate else rng.choice(FILLER)
+            for _ in range(words_per_caption)
+        ]
+        duration = caption_seconds * rng.uniform(0.7, 1.3)
+        snippets.append(TranscriptSnippet(" ".join(words), round(now, 2), round(duration, 2)))
+        now += duration
+    return snippets, boundaries
+
+
+class FakeTranscriptProvider:
+    """Transcript provider that returns synthetic captions after a configurable delay."""
+
+    def __init__(self, *, latency: float = 0.05, minutes: float = 20.0) -> None:
+        """Serve ``minutes`` of captions per video, ``latency`` seconds after each fetch starts."""
+        self.latency = latency
+        self.minutes = minutes
+        self.fetch_times = LatencySamples()
+
+    def fetch(self, video_id: str, languages: Sequence[str]) -> list[TranscriptSnippet]:
+        """Return a deterministic synthetic transcript for ``video_id``."""
+        started = time.perf_counter()
+        time.sleep(self.latency)
+        snippets, _ = synthetic_transcript(self.minutes, seed=sum(map(ord, video_id)))
+        self.fetch_times.add(time.perf_counter() - started)
+        return snippets
+
+
+class FakeMemoryBackend:
+    """In-process stand-in for mem0's MemoryClient with a configurable per-call delay.
+
+    Each added message becomes one memory; search ranks a user's memories by
+    how many query words they share. ``calls`` counts the calls per method.
+    """
+
+    def __init__(self, *, latency: float = 0.0) -> None:
+        """Create an empty store whose calls each take ``latency`` seconds."""
+        self.latency = latency
+        self.memories: dict[str, list[dict[str, Any]]] = {}
+        self.calls: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _call(self, method: str) -> None:
+        time.sleep(self.latency)
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+
+    def add(self, messages: list[dict[str, str]], *, user_id: str, **kwargs: Any) -> dict[str, Any]:
+        """Store every message's content as a memory of ``user_id``."""
+        self._call("add")
+        added = [{"id": uuid.uuid4().hex, "memory": message["content"], "user_id": user_id} for message in messages]
+        with self._lock:
+            self.memories.setdefault(user_id, []).extend(added)
+        return {"results": [{**memory, "event": "ADD"} for memory in added]}
+
+    def search(self, query: str, *, user_id: str, limit: int = 5, **kwargs: Any) -> dict[str, Any]:
+        """Return the memories of ``user_id`` sharing at least one word with ``query``."""
+        self._call("search")
+        words = set(query.lower().split())
+        with self._lock:
+            scored = [
+                (len(words & set(memory["memory"].lower().split())) / (len(words) or 1), memory)
+                for memory in self.memories.get(user_id, [])
+            ]
+        ranked = sorted((item for item in scored if item[0] > 0), key=lambda item: -item[0])[:limit]
+        return {"results": [{**memory, "score": round(score, 4)} for score, memory in ranked]}
+
+    def get_all(self, *, user_id: str, **kwargs: Any) -> dict[str, Any]:
+        """Return every memory of ``user_id``."""
+        self._call("get_all")
+        with self._lock:
+            return {"results": list(self.memories.get(user_id, []))}
+
+    def delete_all(self, *, user_id: str, **kwargs: Any) -> dict[str, str]:
+        """Delete every memory of ``user_id``."""
+        self._call("delete_all")
+        with self._lock:
+            self.memories.pop(user_id, None)
+        return {"message": "Memories deleted successfully!"}
+
+
+class StandInLLMServer:
+    """OpenAI-compatible ``/chat/completions`` endpoint with tunable latency and token rate.
+
+    Each completion waits ``latency`` seconds before the first token and then
+    produces ``completion_tokens`` words at ``tokens_per_second``. When the
+    request offers a transcript tool and mentions a YouTube URL that no tool
+    has been called for yet, the first reply is a call to that tool, so the
+    agent's tool path is exercised like it is against a real model.
+
+    Faults can be injected: the next ``failures`` requests are answered with
+    ``failure_status``, and the next ``slow_requests`` wait ``slow_latency``
+    instead of ``latency``.
+
+    Like a provider's prompt cache, each reply reports as cached the tokens of
+    the longest prompt prefix it shares with a recent request; the system
+    prompts received are kept in ``system_prompts``.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency: float = 0.2,
+        tokens_per_second: float = 200.0,
+        completion_tokens: int = 200,
+    ) -> None:
+        """Bind the server; use port 0 to pick a free port."""
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.call_times = LatencySamples()
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.system_prompts: deque[str] = deque(maxlen=64)
+        self.failures = 0
+        self.failure_status = 503
+        self.slow_requests = 0
+        self.slow_latency = 0.0
+        self.failed = 0
+        self._prompts: deque[str] = deque(maxlen=64)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _StandInHandler)
+        self._server.standin = self  # type: ignore[attr-defined]
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to configure as the OpenAI/OpenRouter endpoint."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _next_fault(self) -> tuple[int | None, float]:
+        """Return (error status or None, latency) for the next request, using up one injected fault."""
+        with self._lock:
+            if self.failures > 0:
+                self.failures -= 1
+                self.failed += 1
+                return self.failure_status, 0.0
+            if self.slow_requests > 0:
+                self.slow_requests -= 1
+                return None, self.slow_latency
+        return None, self.latency
+
+    def _cached_tokens(self, body: dict[str, Any]) -> int:
+        """Return the tokens of the request's longest prompt prefix shared with a recent request."""
+        messages = body.get("messages") or []
+        prompt = "".join(str(message.get("content") or "") for message in messages)
+        with self._lock:
+            if messages and messages[0].get("role") in ("system", "developer"):
+                self.system_prompts.append(str(messages[0].get("content") or ""))
+            shared = max((_shared_prefix(prompt, earlier) for earlier in self._prompts), default=0)
+            self._prompts.append(prompt)
+        return shared // 4
+
+    def _reply(self, body: dict[str, Any]) -> tuple[dict[str, Any] | None, str, int]:
+        """Return (tool call or None, content, prompt tokens) for a request body."""
+        messages = body.get("messages") or []
+        prompt_tokens = sum(len(str(message.get("content") or "")) for message in messages) // 4
+
+        offered = {tool.get("function", {}).get("name") for tool in body.get("tools") or []}
+        called = any(message.get("role") == "tool" for message in messages)
+        user_text = " ".join(str(m.get("content") or "") for m in messages if m.get("role") == "user")
+        video_ids = find_video_ids(user_text)
+        tool = next((name for name in _TRANSCRIPT_TOOLS if name in offered), None)
+        if tool and video_ids and not called:
+            arguments = json.dumps({"url": f"https://www.youtube.com/watch?v={video_ids[0]}"})
+            return {"id": f"call_{uuid.uuid4().hex[:12]}", "name": tool, "arguments": arguments}, "", prompt_tokens
+
+        words = [f"word{i % 97}" for i in range(self.completion_tokens)]
+        return None, " ".join(words), prompt_tokens
+
+    def start(self) -> None:
+        """Start serving in a background daemon thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="standin-llm", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def __enter__(self) -> "StandInLLMServer":
+        """Start the server for the duration of a ``with`` block."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop the server."""
+        self.stop()
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Request handler for StandInLLMServer; the owning stand-in is ``server.standin``."""
+
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def standin(self) -> "StandInLLMServer":
+        return self.server.standin  # type: ignore[attr-defined]
+
+    def do_POST(self) -> None:
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+
+        self._started = time.perf_counter()
+        status, latency = self.standin._next_fault()
+        if status is not None:
+            self._send_json(status, {"error": {"message": "stand-in failure", "code": status}})
+            return
+        tool_call, content, prompt_tokens = self.standin._reply(body)
+        self._cached = self.standin._cached_tokens(body)
+        time.sleep(latency)
+        try:
+            if body.get("stream"):
+                self._stream(body, tool_call, content, prompt_tokens)
+            else:
+                time.sleep(len(content.split()) / self.standin.tokens_per_second if content else 0)
+                self._record(prompt_tokens)
+                self._send_json(200, _completion(body, tool_call, content, prompt_tokens, self._cached))
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up on this request, such as a cancelled hedge
+
+    def _record(self, prompt_tokens: int) -> None:
+        # Recorded before the last bytes go out, so clients see up-to-date counters
+        with self.standin._lock:
+            self.standin.requests += 1
+            self.standin.prompt_tokens += prompt_tokens
+            self.standin.cached_tokens += self._cached
+            self.standin.call_times.add(time.perf_counter() - self._started)
+
+    def _send_json(self, status: int, payload: dict[str, Any]) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_event(self, payload: dict[str, Any] | str) -> None:
+        data = f"data: {payload if isinstance(payload, str) else json.dumps(payload)}\n\n".encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _stream(self, body: dict[str, Any], tool_call: dict | None, content: str, prompt_tokens: int) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        words = content.split()
+        if tool_call is not None:
+            self._send_event(_chunk(body, {"role": "assistant", "tool_calls": [_tool_call_delta(tool_call)]}))
+        for start in range(0, len(words), 5):
+            time.sleep(len(words[start : start + 5]) / self.standin.tokens_per_second)
+            self._send_event(_chunk(body, {"content": " ".join(words[start : start + 5]) + " "}))
+        finish = _chunk(body, {}, "tool_calls" if tool_call else "stop")
+        finish["usage"] = _usage(prompt_tokens, len(words), self._cached)
+        self._record(prompt_tokens)
+        self._send_event(finish)
+        self._send_event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Keep benchmark traffic out of the logs."""
+
+
+def _shared_prefix(a: str, b: str) -> int:
+    """Return the length of the longest common prefix of ``a`` and ``b``, by bisecting on slice equality."""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _usage(prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> dict[str, Any]:
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "prompt_tokens_details": {"cached_tokens": cached_tokens},
+    }
+
+
+def _tool_call_delta(tool_call: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "index": 0,
+        "id": tool_call["id"],
+        "type": "function",
+        "function": {"name": tool_call["name"], "arguments": tool_call["arguments"]},
+    }
+
+
+def _completion(
+    body: dict[str, Any], tool_call: dict | None, content: str, prompt_tokens: int, cached_tokens: int = 0
+) -> dict[str, Any]:
+    message: dict[str, Any] = {"role": "assistant", "content": content or None}
+    if tool_call is not None:
+        message["tool_calls"] = [{key: value for key, value in _tool_call_delta(tool_call).items() if key != "index"}]
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stand-in"),
+        "choices": [{"index": 0, "message": message, "finish_reason": "tool_calls" if tool_call else "stop"}],
+        "usage": _usage(prompt_tokens, len(content.split()), cached_tokens),
+    }
+
+
+def _chunk(body: dict[str, Any], delta: dict[str, Any], finish_reason: str | None = None) -> dict[str, Any]:
+    return {
+        "id": "chatcmpl-standin",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": body.get("model", "stand-in"),
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
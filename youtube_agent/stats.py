@@ -0,0 +1,56 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Small in-process latency sample windows for the stats endpoints."""
+
+import threading
+from collections import deque
+
+
+class LatencySamples:
+    """Sliding window of the most recent latency samples, in seconds.
+
+    Thread-safe: the status server's thread reads windows the event loop is
+    adding to.
+    """
+
+    def __init__(self, maxlen: int = 1024) -> None:
+        """Keep at most ``maxlen`` samples."""
+        self._samples: deque[float] = deque(maxlen=maxlen)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        """Record one sample."""
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+
+    def _sorted(self) -> list[float]:
+        with self._lock:
+            return sorted(self._samples)
+
+    @staticmethod
+    def _pick(ordered: list[float], fraction: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def percentile(self, fraction: float) -> float:
+        """Return the ``fraction`` percentile (0-1) of the window, 0.0 when empty."""
+        return self._pick(self._sorted(), fraction)
+
+    def summary(self, prefix: str) -> dict[str, float]:
+        """Return p50/p95/max keyed as ``{prefix}_p50`` etc., rounded to 0.1ms."""
+        ordered = self._sorted()
+        return {
+            f"{prefix}_p50": round(self._pick(ordered, 0.50), 4),
+            f"{prefix}_p95": round(self._pick(ordered, 0.95), 4),
+            f"{prefix}_max": round(ordered[-1] if ordered else 0.0, 4),
+        }
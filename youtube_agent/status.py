@@ -0,0 +1,84 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Side-car HTTP server for liveness and readiness probes."""
+
+import socket
+import threading
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def port_accepts_connections(host: str, port: int, timeout: float = 0.2) -> bool:
+    """Return True if something is listening on ``host:port``."""
+    if host in ("0.0.0.0", "::", ""):  # noqa: S104
+        host = "127.0.0.1"
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+class StatusServer:
+    """Serve ``/healthz`` (always 200) and ``/ready`` (200 once ``is_ready()``) on a daemon thread.
+
+    It runs next to the bindufy server on its own port so load balancers can
+    keep traffic away from instances that are still warming up.
+    """
+
+    def __init__(self, host: str, port: int, is_ready: Callable[[], bool]) -> None:
+        """Bind the server; use port 0 to pick a free port."""
+        self.is_ready = is_ready
+        self.routes: dict[str, Callable[[], tuple[int, str, str]]] = {
+            "/healthz": lambda: (200, "text/plain", "ok\n"),
+            "/ready": self._ready,
+        }
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def port(self) -> int:
+        """The bound port."""
+        return self._server.server_address[1]
+
+    def _ready(self) -> tuple[int, str, str]:
+        if self.is_ready():
+            return 200, "text/plain", "ready\n"
+        return 503, "text/plain", "warming up\n"
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        routes = self.routes
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                route = routes.get(self.path.split("?", 1)[0])
+                status, content_type, body = route() if route else (404, "text/plain", "not found\n")
+                payload = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                """Keep probe traffic out of the server logs."""
+
+        return _Handler
+
+    def start(self) -> None:
+        """Start serving in a background daemon thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="status-server", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
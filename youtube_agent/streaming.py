@@ -0,0 +1,81 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Token streaming helpers: the final stream item and time-to-first-token telemetry."""
+
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+from youtube_agent.stats import LatencySamples
+
+_TRUTHY = ("1", "true", "yes", "on")
+
+
+def streaming_enabled(value: str | None) -> bool:
+    """Return True when a STREAM_RESPONSES-style setting switches streaming on."""
+    return (value or "").strip().lower() in _TRUTHY
+
+
+@dataclass
+class StreamedResult:
+    """Last item of a streamed response, carrying the full content and run output.
+
+    bindu forwards every truthy chunk to message/stream (SSE) clients, but a
+    message/send client only receives the last item of the generator. This
+    item is falsy, so SSE clients (who already have every delta) never see it
+    twice, while non-streaming clients get the complete answer from
+    ``.content`` exactly as they would from a regular run.
+    """
+
+    content: str
+    run_output: Any = None
+
+    def __bool__(self) -> bool:
+        """Always False, so SSE forwarding skips this item."""
+        return False
+
+    def __str__(self) -> str:
+        """Return the full content."""
+        return self.content
+
+
+class StreamStats:
+    """Time-to-first-token and total latency of streamed responses, in seconds."""
+
+    def __init__(self, maxlen: int = 1024) -> None:
+        """Keep the last ``maxlen`` samples of each series."""
+        self.time_to_first_token = LatencySamples(maxlen)
+        self.total_latency = LatencySamples(maxlen)
+        self.failed = 0
+
+    async def timed(self, chunks: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        """Yield ``chunks`` unchanged while recording first-chunk and total latency."""
+        started = time.perf_counter()
+        first_seen = False
+        try:
+            async for chunk in chunks:
+                if not first_seen and chunk:
+                    first_seen = True
+                    self.time_to_first_token.add(time.perf_counter() - started)
+                yield chunk
+        except BaseException:
+            self.failed += 1
+            raise
+        self.total_latency.add(time.perf_counter() - started)
+
+    def stats(self) -> dict[str, Any]:
+        """Return stream counts with TTFT and total latency percentiles."""
+        return {
+            "streams": self.total_latency.count,
+            "failed": self.failed,
+            **self.time_to_first_token.summary("ttft"),
+            **self.total_latency.summary("total"),
+        }
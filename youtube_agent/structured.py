@@ -0,0 +1,88 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Typed video-summary schema for structured output, and its local markdown rendering."""
+
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, ValidationError
+
+from youtube_agent.summarize import format_timestamp
+
+VideoType = Literal[
+    "tutorial", "lecture", "review", "documentary", "vlog", "podcast", "interview", "entertainment", "other"
+]
+Difficulty = Literal["beginner", "intermediate", "advanced"]
+
+
+class Segment(BaseModel):
+    """One topic segment, using the boundaries returned by get_video_segments."""
+
+    start_seconds: float = Field(description="Segment start, in seconds from the start of the video")
+    end_seconds: float = Field(description="Segment end, in seconds from the start of the video")
+    title: str = Field(description="Short descriptive title")
+    summary: str = Field(description="One or two sentences on what the segment covers")
+
+
+class Chapter(BaseModel):
+    """A group of consecutive segments about one theme."""
+
+    title: str
+    start_seconds: float
+    end_seconds: float
+    segments: list[Segment]
+
+
+class VideoSummary(BaseModel):
+    """Structured analysis of one video."""
+
+    title: str
+    video_type: VideoType
+    difficulty: Difficulty
+    overview: str = Field(description="Two or three sentences: what the video is about and who it is for")
+    chapters: list[Chapter]
+    key_points: list[str] = Field(description="The most important takeaways, one short sentence each")
+
+
+def as_summary(content: Any) -> VideoSummary | None:
+    """Return ``content`` as a VideoSummary if it is one or its JSON (as stored in the result cache)."""
+    if isinstance(content, VideoSummary):
+        return content
+    if isinstance(content, str) and content.lstrip().startswith("{"):
+        try:
+            return VideoSummary.model_validate_json(content)
+        except ValidationError:
+            return None
+    return None
+
+
+def _span(start: float, end: float) -> str:
+    return f"[{format_timestamp(start)} - {format_timestamp(end)}]"
+
+
+def render_markdown(summary: VideoSummary) -> str:
+    """Render a summary as markdown: overview, chapters with timestamped segments, key points."""
+    lines = [
+        f"# {summary.title}",
+        "",
+        summary.overview,
+        "",
+        f"**Type:** {summary.video_type} · **Difficulty:** {summary.difficulty}",
+    ]
+    if summary.chapters:
+        lines += ["", "## Chapters"]
+        for chapter in summary.chapters:
+            lines += ["", f"### {_span(chapter.start_seconds, chapter.end_seconds)} {chapter.title}"]
+            lines += [
+                f"- {_span(segment.start_seconds, segment.end_seconds)} **{segment.title}**: {segment.summary}"
+                for segment in chapter.segments
+            ]
+    if summary.key_points:
+        lines += ["", "## Key Points", *(f"- {point}" for point in summary.key_points)]
+    return "\n".join(lines)
@@ -0,0 +1,175 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Map-reduce summarization for transcripts that are too long for a single prompt."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, replace
+
+from youtube_agent.transcripts import TranscriptSnippet
+
+
+@dataclass(frozen=True, slots=True)
+class TranscriptChunk:
+    """A contiguous, time-aligned slice of a transcript."""
+
+    index: int
+    start: float
+    end: float
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class ChunkSummary:
+    """The map-step summary of one chunk."""
+
+    chunk: TranscriptChunk
+    summary: str
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds as HH:MM:SS."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+def transcript_length(snippets: Iterable[TranscriptSnippet]) -> int:
+    """Return the number of characters the transcript would take in a prompt."""
+    return sum(len(snippet.text) + 1 for snippet in snippets)
+
+
+def iter_chunks(
+    snippets: Iterable[TranscriptSnippet],
+    *,
+    max_seconds: float = 600.0,
+    max_chars: int = 12_000,
+) -> Iterator[TranscriptChunk]:
+    """Yield chunks of ``snippets`` as they fill up; only the chunk being built is held.
+
+    A chunk is closed as soon as adding the next snippet would exceed either
+    ``max_seconds`` of video or ``max_chars`` of text, so every chunk boundary
+    falls on a real caption start time and never cuts a caption line in half.
+    """
+    index = 0
+    lines: list[str] = []
+    chunk_start = 0.0
+    chunk_end = 0.0
+    size = 0
+
+    for snippet in snippets:
+        if lines and (snippet.end - chunk_start > max_seconds or size + len(snippet.text) > max_chars):
+            yield TranscriptChunk(index, chunk_start, chunk_end, " ".join(lines))
+            index, lines, size = index + 1, [], 0
+        if not lines:
+            chunk_start = snippet.start
+        lines.append(snippet.text)
+        size += len(snippet.text) + 1
+        chunk_end = max(chunk_end, snippet.end)
+
+    if lines:
+        yield TranscriptChunk(index, chunk_start, chunk_end, " ".join(lines))
+
+
+def chunk_transcript(
+    snippets: Iterable[TranscriptSnippet],
+    *,
+    max_seconds: float = 600.0,
+    max_chars: int = 12_000,
+) -> list[TranscriptChunk]:
+    """Split snippets into chunks that never cut a caption line in half (see ``iter_chunks``)."""
+    return list(iter_chunks(snippets, max_seconds=max_seconds, max_chars=max_chars))
+
+
+def build_chunk_prompt(chunk: TranscriptChunk) -> str:
+    """Return the map-step prompt for one chunk."""
+    return (
+        f"Transcript section {chunk.index + 1} "
+        f"({format_timestamp(chunk.start)} - {format_timestamp(chunk.end)}):\n\n"
+        f"{chunk.text}\n\n"
+        "Summarize this section in 3-6 bullet points. Name the topics covered, "
+        "key examples or demonstrations, and any resources mentioned. "
+        "Only use timestamps inside this section's time range."
+    )
+
+
+def build_reduce_prompt(summaries: Sequence[ChunkSummary]) -> str:
+    """Return the context handed to the main agent for the reduce step."""
+    sections = "\n\n".join(
+        f"[{format_timestamp(item.chunk.start)} - {format_timestamp(item.chunk.end)}]\n{item.summary.strip()}"
+        for item in summaries
+    )
+    return (
+        "The transcript of this video is long, so it has already been fetched and summarized "
+        "in time-aligned sections below. Do not fetch the captions or timestamps again; "
+        "build the final timestamped outline from these sections, keeping their time ranges.\n\n"
+        f"{sections}"
+    )
+
+
+class MapReduceSummarizer:
+    """Summarize transcript chunks concurrently with a bounded number of LLM calls.
+
+    Wall-clock time of the map step is roughly ``ceil(chunks / max_concurrency)``
+    times the latency of one chunk call, independent of transcript length.
+    """
+
+    def __init__(
+        self,
+        summarize_chunk: Callable[[TranscriptChunk], Awaitable[str]],
+        *,
+        max_concurrency: int = 4,
+    ) -> None:
+        """Create the summarizer around a per-chunk LLM call."""
+        if max_concurrency < 1:
+            error_msg = "max_concurrency must be at least 1"
+            raise ValueError(error_msg)
+        self.summarize_chunk = summarize_chunk
+        self.max_concurrency = max_concurrency
+
+    async def map(self, chunks: Sequence[TranscriptChunk]) -> list[ChunkSummary]:
+        """Summarize every chunk, at most ``max_concurrency`` at a time, in order."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _summarize(chunk: TranscriptChunk) -> ChunkSummary:
+            async with semaphore:
+                return ChunkSummary(chunk, await self.summarize_chunk(chunk))
+
+        # A TaskGroup cancels the remaining chunk calls as soon as one fails
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(_summarize(chunk)) for chunk in chunks]
+        return [task.result() for task in tasks]
+
+    async def map_stream(self, chunks: Iterable[TranscriptChunk]) -> list[ChunkSummary]:
+        """Summarize chunks pulled lazily from ``chunks``, in order, holding at most ``max_concurrency``.
+
+        The next chunk is only drawn once a slot is free, and each chunk's
+        text is dropped as soon as it is summarized, so memory stays flat
+        however long the transcript is; only the summaries are kept.
+        """
+        slots = asyncio.Semaphore(self.max_concurrency)
+        summaries: dict[int, ChunkSummary] = {}
+
+        async def _summarize(chunk: TranscriptChunk) -> None:
+            try:
+                summary = await self.summarize_chunk(chunk)
+                summaries[chunk.index] = ChunkSummary(replace(chunk, text=""), summary)
+            finally:
+                slots.release()
+
+        pending = iter(chunks)
+        async with asyncio.TaskGroup() as group:
+            while True:
+                await slots.acquire()
+                chunk = next(pending, None)
+                if chunk is None:
+                    break
+                group.create_task(_summarize(chunk))
+        return [summaries[index] for index in sorted(summaries)]
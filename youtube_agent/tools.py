@@ -0,0 +1,197 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Agent toolkits layered on top of agno's built-in tools."""
+
+import dataclasses
+from collections.abc import Callable
+from typing import Any
+
+from agno.tools.youtube import YouTubeTools
+
+from youtube_agent.packing import (
+    PackedTranscript,
+    TokenCounter,
+    approximate_tokens,
+    clean_transcript,
+    fit_to_budget,
+    pack_transcript,
+)
+from youtube_agent.search import TranscriptIndex, format_hits
+from youtube_agent.segmentation import format_segments, segment_transcript
+from youtube_agent.transcripts import DEFAULT_LANGUAGES, TranscriptCache, extract_video_id
+
+
+class CachedYouTubeTools(YouTubeTools):
+    """YouTubeTools that serve captions and timestamps through a TranscriptCache.
+
+    Adds ``get_video_segments``, which returns locally computed topic segments
+    with exact start/end times so the model only has to title and summarize them.
+    Captions and segments are packed (filler and auto-caption overlaps removed,
+    fitted to ``max_prompt_tokens``) and ``on_pack`` is told how many tokens
+    each call saved. With a ``transcript_index``, ``search_video_transcript``
+    finds where something is said without sending the transcript to the model.
+    """
+
+    def __init__(
+        self,
+        transcript_cache: TranscriptCache,
+        *,
+        enable_get_video_segments: bool = True,
+        min_segment_seconds: float = 120.0,
+        max_segments: int | None = 24,
+        max_prompt_tokens: int | None = None,
+        count_tokens: TokenCounter = approximate_tokens,
+        on_pack: Callable[[str, PackedTranscript], None] | None = None,
+        transcript_index: TranscriptIndex | None = None,
+        search_hits: int = 5,
+        **kwargs: Any,
+    ) -> None:
+        """Create the toolkit; remaining kwargs are passed to YouTubeTools."""
+        self.transcript_cache = transcript_cache
+        self.min_segment_seconds = min_segment_seconds
+        self.max_segments = max_segments
+        self.max_prompt_tokens = max_prompt_tokens
+        self.count_tokens = count_tokens
+        self.on_pack = on_pack
+        self.transcript_index = transcript_index
+        self.search_hits = search_hits
+        super().__init__(**kwargs)
+        if enable_get_video_segments:
+            self.register(self.get_video_segments)
+        if transcript_index is not None:
+            self.register(self.search_video_transcript)
+
+    def _languages(self) -> tuple[str, ...]:
+        return tuple(self.languages or DEFAULT_LANGUAGES)
+
+    def _report(self, url: str, packed: PackedTranscript) -> None:
+        if self.on_pack is not None:
+            self.on_pack(url, packed)
+
+    def get_youtube_video_captions(self, url: str) -> str:
+        """Use this function to get captions from a YouTube video.
+
+        Args:
+            url: The URL of the YouTube video.
+
+        Returns:
+            str: The captions of the YouTube video, one timestamped line per ~20 seconds.
+        """
+        if not url:
+            return "No URL provided"
+
+        try:
+            transcript = self.transcript_cache.get_compact(url, self._languages())
+        except ValueError:
+            return "Error getting video ID from URL, please provide a valid YouTube url"
+        except Exception as e:
+            return f"Error getting captions for video: {e}"
+
+        packed = pack_transcript(transcript, max_tokens=self.max_prompt_tokens, count_tokens=self.count_tokens)
+        if not packed.text:
+            return "No captions found for video"
+        self._report(url, packed)
+        return packed.text
+
+    def get_video_timestamps(self, url: str) -> str:
+        """Generate timestamps for a YouTube video based on captions.
+
+        Args:
+            url: The URL of the YouTube video.
+
+        Returns:
+            str: Timestamps and summaries for the video.
+        """
+        if not url:
+            return "No URL provided"
+
+        try:
+            snippets = self.transcript_cache.get(url, self._languages())
+        except ValueError:
+            return "Error getting video ID from URL, please provide a valid YouTube url"
+        except Exception as e:
+            return f"Error generating timestamps: {e}"
+
+        timestamps = []
+        for snippet in snippets:
+            minutes, seconds = divmod(int(snippet.start), 60)
+            timestamps.append(f"{minutes}:{seconds:02d} - {snippet.text}")
+        return "\n".join(timestamps)
+
+    def get_video_segments(self, url: str) -> str:
+        """Split a YouTube video into topic segments with exact start and end times.
+
+        Use the returned boundaries as the video's chapters: give each segment a
+        title and summary, and do not invent other timestamps.
+
+        Args:
+            url: The URL of the YouTube video.
+
+        Returns:
+            str: Numbered segments with their time range, keywords and transcript text.
+        """
+        if not url:
+            return "No URL provided"
+
+        try:
+            transcript = self.transcript_cache.get_compact(url, self._languages())
+        except ValueError:
+            return "Error getting video ID from URL, please provide a valid YouTube url"
+        except Exception as e:
+            return f"Error segmenting video: {e}"
+
+        cleaned = clean_transcript(transcript)
+        if not len(cleaned):
+            return "No captions found for video"
+        segments = segment_transcript(
+            cleaned.snippets(),
+            min_segment_seconds=self.min_segment_seconds,
+            max_segments=self.max_segments,
+        )
+        text, truncated = fit_to_budget(
+            [segment.text for segment in segments],
+            lambda texts: format_segments([
+                dataclasses.replace(segment, text=body) for segment, body in zip(segments, texts, strict=True)
+            ]),
+            self.max_prompt_tokens,
+            self.count_tokens,
+        )
+        tokens_before = self.count_tokens(" ".join(transcript.lines()))
+        self._report(url, PackedTranscript(text, len(segments), tokens_before, self.count_tokens(text), truncated))
+        return text
+
+    def search_video_transcript(self, url: str, query: str) -> str:
+        """Find where something is said in a YouTube video.
+
+        Use this for questions like "where do they talk about X" instead of
+        reading the whole transcript.
+
+        Args:
+            url: The URL of the YouTube video.
+            query: The words or topic to look for.
+
+        Returns:
+            str: The best matching moments in time order, each with its timestamp and an excerpt.
+        """
+        video_id = extract_video_id(url or "")
+        if video_id is None or self.transcript_index is None:
+            return "Error getting video ID from URL, please provide a valid YouTube url"
+
+        try:
+            transcript = self.transcript_cache.get_compact(video_id, self._languages())
+        except Exception as e:
+            return f"Error searching video: {e}"
+
+        # A no-op when the transcript cache already indexed it on load
+        self.transcript_index.add(video_id, transcript)
+        hits = self.transcript_index.search(query, video_id=video_id, limit=self.search_hits)
+        if not hits:
+            return f'"{query}" is not mentioned in the transcript'
+        return format_hits(video_id, query, hits)
@@ -0,0 +1,302 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Transcript retrieval: video ID normalization, providers and the transcript cache."""
+
+import re
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Protocol
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from youtube_agent.cache import TieredCache
+
+if TYPE_CHECKING:
+    from youtube_agent.resilience import Upstream
+
+DEFAULT_LANGUAGES: tuple[str, ...] = ("en",)
+
+_VIDEO_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+_URL_RE = re.compile(r"(?:https?://)?(?:www\.|m\.|music\.)?(?:youtube\.com|youtu\.be)/\S+", re.IGNORECASE)
+
+
+def extract_video_id(url: str) -> str | None:
+    """Return the canonical 11-character video ID for a YouTube URL or bare ID.
+
+    Handles ``watch?v=``, ``youtu.be/``, ``/embed/``, ``/v/``, ``/shorts/`` and
+    ``/live/`` forms on any youtube.com subdomain, so different spellings of
+    the same video share one cache entry.
+    """
+    url = url.strip()
+    if _VIDEO_ID_RE.match(url):
+        return url
+
+    if "://" not in url:
+        url = f"https://{url}"
+    parsed = urlparse(url)
+    hostname = (parsed.hostname or "").lower()
+
+    candidate: str | None = None
+    if hostname == "youtu.be":
+        candidate = parsed.path.lstrip("/").split("/")[0]
+    elif hostname == "youtube.com" or hostname.endswith(".youtube.com"):
+        if parsed.path == "/watch":
+            candidate = parse_qs(parsed.query).get("v", [None])[0]
+        else:
+            parts = parsed.path.strip("/").split("/")
+            if len(parts) >= 2 and parts[0] in ("embed", "v", "shorts", "live"):
+                candidate = parts[1]
+
+    if candidate and _VIDEO_ID_RE.match(candidate):
+        return candidate
+    return None
+
+
+def strip_video_urls(text: str) -> str:
+    """Return ``text`` with every YouTube URL in it replaced by a space."""
+    return _URL_RE.sub(" ", text)
+
+
+def find_video_ids(text: str) -> list[str]:
+    """Return the unique video IDs of all YouTube URLs in free text, in order."""
+    seen: dict[str, None] = {}
+    for match in _URL_RE.finditer(text):
+        video_id = extract_video_id(match.group(0).rstrip(").,;!?'\""))
+        if video_id:
+            seen.setdefault(video_id, None)
+    return list(seen)
+
+
+@dataclass(frozen=True, slots=True)
+class TranscriptSnippet:
+    """One caption line with its start time and duration in seconds."""
+
+    text: str
+    start: float
+    duration: float
+
+    @property
+    def end(self) -> float:
+        """End time of the snippet in seconds."""
+        return self.start + self.duration
+
+
+class CompactTranscript:
+    """Array-backed transcript: caption times in NumPy arrays, caption text joined once.
+
+    Line ``i`` is ``text[offsets[i]:offsets[i + 1] - 1]``; caption-internal line
+    breaks are folded into spaces so ``"\\n"`` only ever separates captions.
+    """
+
+    __slots__ = ("durations", "offsets", "starts", "text")
+
+    def __init__(self, starts: np.ndarray, durations: np.ndarray, text: str) -> None:
+        """Wrap parallel ``starts``/``durations`` arrays and the newline-joined caption text."""
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.durations = np.asarray(durations, dtype=np.float64)
+        self.text = text
+        lengths = [len(line) + 1 for line in text.split("\n")] if len(self.starts) else []
+        self.offsets = np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]).astype(np.int64)
+        if len(self.offsets) - 1 != len(self.starts):
+            error_msg = f"Transcript has {len(self.offsets) - 1} lines but {len(self.starts)} start times"
+            raise ValueError(error_msg)
+
+    @classmethod
+    def from_lines(
+        cls, lines: Sequence[str], starts: Sequence[float], durations: Sequence[float]
+    ) -> "CompactTranscript":
+        """Build a transcript from parallel sequences of caption text and times."""
+        text = "\n".join(" ".join(line.split()) for line in lines)
+        return cls(np.asarray(starts, dtype=np.float64), np.asarray(durations, dtype=np.float64), text)
+
+    @classmethod
+    def from_snippets(cls, snippets: Sequence[TranscriptSnippet]) -> "CompactTranscript":
+        """Build a transcript from caption snippets."""
+        return cls.from_lines(
+            [snippet.text for snippet in snippets],
+            [snippet.start for snippet in snippets],
+            [snippet.duration for snippet in snippets],
+        )
+
+    @classmethod
+    def from_payload(cls, payload: Any) -> "CompactTranscript":
+        """Decode the cached form; also accepts the older ``[[text, start, duration], ...]`` rows."""
+        if isinstance(payload, dict):
+            return cls(np.asarray(payload["starts"]), np.asarray(payload["durations"]), payload["text"])
+        return cls.from_lines(
+            [row[0] for row in payload],
+            [row[1] for row in payload],
+            [row[2] for row in payload],
+        )
+
+    def to_payload(self) -> dict[str, Any]:
+        """Return the JSON-serializable columnar form stored in the transcript cache."""
+        return {"text": self.text, "starts": self.starts.tolist(), "durations": self.durations.tolist()}
+
+    def __len__(self) -> int:
+        """Number of captions."""
+        return len(self.starts)
+
+    @property
+    def ends(self) -> np.ndarray:
+        """End time of every caption."""
+        return self.starts + self.durations
+
+    def line(self, index: int) -> str:
+        """Return the caption text of line ``index`` without splitting the whole transcript."""
+        return self.text[self.offsets[index] : self.offsets[index + 1] - 1]
+
+    def lines(self) -> list[str]:
+        """Return the caption text of every line."""
+        return self.text.split("\n") if len(self) else []
+
+    def iter_snippets(self) -> Iterator[TranscriptSnippet]:
+        """Yield the caption snippets one at a time, without expanding the whole transcript."""
+        for index in range(len(self)):
+            yield TranscriptSnippet(self.line(index), float(self.starts[index]), float(self.durations[index]))
+
+    def snippets(self) -> list[TranscriptSnippet]:
+        """Expand back into caption snippets."""
+        return [
+            TranscriptSnippet(line, start, duration)
+            for line, start, duration in zip(self.lines(), self.starts.tolist(), self.durations.tolist(), strict=True)
+        ]
+
+
+class TranscriptProvider(Protocol):
+    """Anything that can fetch the caption snippets of a video."""
+
+    def fetch(self, video_id: str, languages: Sequence[str]) -> list[TranscriptSnippet]:
+        """Fetch the transcript of ``video_id`` in the first available language."""
+        ...
+
+
+class YouTubeTranscriptProvider:
+    """Transcript provider backed by youtube-transcript-api.
+
+    youtube-transcript-api clients are not thread-safe, so each worker thread
+    gets its own client and HTTP session; the session is kept for the life of
+    the thread so consecutive fetches reuse its keep-alive connections. With an
+    ``adapter`` (such as ``HttpPool.requests_adapter()``) every thread's session
+    shares that adapter's connection pool instead of keeping its own.
+    """
+
+    def __init__(self, proxies: dict[str, Any] | None = None, adapter: Any = None) -> None:
+        """Create the provider, optionally routing requests through ``proxies`` and a shared ``adapter``."""
+        self.proxies = proxies
+        self.adapter = adapter
+        self._local = threading.local()
+
+    def _client(self) -> Any:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            from youtube_transcript_api import YouTubeTranscriptApi
+            from youtube_transcript_api.proxies import GenericProxyConfig
+
+            proxy_config = None
+            if self.proxies:
+                proxy_config = GenericProxyConfig(
+                    http_url=self.proxies.get("http"),
+                    https_url=self.proxies.get("https"),
+                )
+            client = YouTubeTranscriptApi(proxy_config=proxy_config, http_client=self.session())
+            self._local.client = client
+        return client
+
+    def session(self) -> Any:
+        """Return this thread's pooled ``requests.Session``."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            from requests import Session
+
+            session = Session()
+            if self.adapter is not None:
+                session.mount("https://", self.adapter)
+                session.mount("http://", self.adapter)
+            self._local.session = session
+        return session
+
+    def fetch(self, video_id: str, languages: Sequence[str]) -> list[TranscriptSnippet]:
+        """Download and parse the transcript of ``video_id``."""
+        fetched = self._client().fetch(video_id, languages=list(languages))
+        return [TranscriptSnippet(line.text, float(line.start), float(line.duration)) for line in fetched]
+
+
+class TranscriptCache:
+    """Read-through cache of transcripts keyed by normalized video ID and language.
+
+    A hit in either tier is served without calling the provider, so a warm
+    request never touches youtube-transcript-api. Provider errors propagate
+    and are never cached. ``on_load`` is called with every transcript this
+    cache returns, such as to index it for search. With an ``upstream``,
+    fetches go through its circuit breaker and retries.
+    """
+
+    def __init__(
+        self,
+        provider: TranscriptProvider,
+        store: TieredCache,
+        *,
+        on_load: Callable[[str, CompactTranscript], None] | None = None,
+        upstream: "Upstream | None" = None,
+    ) -> None:
+        """Wrap ``provider`` with ``store``."""
+        self.provider = provider
+        self.store = store
+        self.on_load = on_load
+        self.upstream = upstream
+
+    @staticmethod
+    def cache_key(video_id: str, languages: Sequence[str]) -> str:
+        """Return the cache key for a video/language combination."""
+        return f"{video_id}:{','.join(lang.lower() for lang in languages)}"
+
+    def get(self, video: str, languages: Sequence[str] | None = None) -> list[TranscriptSnippet]:
+        """Return the transcript for a video URL or ID, fetching it on a miss."""
+        return self.get_compact(video, languages).snippets()
+
+    def get_compact(self, video: str, languages: Sequence[str] | None = None) -> CompactTranscript:
+        """Return the transcript as a CompactTranscript, fetching it on a miss."""
+        video_id = extract_video_id(video)
+        if video_id is None:
+            error_msg = f"Not a valid YouTube URL or video ID: {video}"
+            raise ValueError(error_msg)
+
+        languages = tuple(languages or DEFAULT_LANGUAGES)
+        key = self.cache_key(video_id, languages)
+        cached = self.store.get(key)
+        if cached is not None:
+            transcript = CompactTranscript.from_payload(cached)
+        else:
+            if self.upstream is None:
+                snippets = self.provider.fetch(video_id, languages)
+            else:
+                snippets = self.upstream.call_sync(lambda: self.provider.fetch(video_id, languages))
+            transcript = CompactTranscript.from_snippets(snippets)
+            self.store.set(key, transcript.to_payload())
+        if self.on_load is not None:
+            self.on_load(video_id, transcript)
+        return transcript
+
+    def peek(self, video: str, languages: Sequence[str] | None = None) -> list[TranscriptSnippet] | None:
+        """Return the cached transcript without fetching or counting a lookup."""
+        video_id = extract_video_id(video)
+        if video_id is None:
+            return None
+        cached = self.store.get(self.cache_key(video_id, tuple(languages or DEFAULT_LANGUAGES)), track_stats=False)
+        if cached is None:
+            return None
+        return CompactTranscript.from_payload(cached).snippets()
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters of the underlying store."""
+        return self.store.stats.as_dict()
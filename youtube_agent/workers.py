@@ -0,0 +1,210 @@
+# |---------------------------------------------------------|
+# |                                                         |
+# |                 Give Feedback / Get Help                |
+# | https://github.com/getbindu/Bindu/issues/new/choose    |
+# |                                                         |
+# |---------------------------------------------------------|
+#
+#  Thank you users! We ❤️ you! - 🌻
+
+"""Multi-process serving: worker processes accepting on one shared socket, restarted when they die."""
+
+import multiprocessing
+import signal
+import socket
+import time
+from collections.abc import Callable
+from typing import Any
+
+# Called in each worker process as target(sock, index, ready, *args); it must set ``ready`` once it
+# is about to serve and must be importable (workers are spawned, not forked)
+WorkerTarget = Callable[..., None]
+
+# A worker that dies sooner than this after starting counts as a crash loop and is restarted with backoff
+HEALTHY_UPTIME_SECONDS = 30.0
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Bind and listen on ``host:port``; the socket is handed to every worker."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def serve_app(app: Any, sock: socket.socket, *, ready: Any = None, **config: Any) -> None:
+    """Serve the ASGI ``app`` with uvicorn on an already listening socket.
+
+    Connections that arrive before uvicorn starts accepting wait in the
+    socket's backlog. Extra ``config`` is passed to ``uvicorn.Config``.
+    """
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, **config))
+    if ready is not None:
+        ready.set()
+    server.run(sockets=[sock])
+
+
+def _worker_main(target: WorkerTarget, sock: socket.socket, index: int, ready: Any, args: tuple) -> None:
+    target(sock, index, ready, *args)
+
+
+class _Worker:
+    def __init__(self, process: Any, ready: Any) -> None:
+        self.process = process
+        self.ready = ready
+        self.started = time.monotonic()
+
+
+class WorkerSupervisor:
+    """Runs ``workers`` processes behind one port and restarts any that exit.
+
+    The supervisor binds the socket and every worker accepts on it, so the
+    kernel spreads connections across processes. The first worker starts
+    alone and the rest only once it is ready, so one-time setup such as
+    creating the agent's DID keys happens once. A worker that keeps dying
+    soon after starting is restarted with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        target: WorkerTarget,
+        host: str,
+        port: int,
+        workers: int,
+        *,
+        args: tuple = (),
+        start_timeout: float = 300.0,
+        restart_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+    ) -> None:
+        """Configure the supervisor; nothing starts until ``start()``."""
+        if workers < 1:
+            error_msg = f"workers must be at least 1, got {workers}"
+            raise ValueError(error_msg)
+        self.target = target
+        self.host = host
+        self.workers = workers
+        self.args = args
+        self.start_timeout = start_timeout
+        self.restart_backoff = restart_backoff
+        self.max_backoff = max_backoff
+        self.restarts = 0
+        self._requested_port = port
+        self._sock: socket.socket | None = None
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: dict[int, _Worker] = {}
+        self._failures: dict[int, int] = {}
+        self._restart_at: dict[int, float] = {}
+        self._stopping = False
+
+    @property
+    def port(self) -> int:
+        """The bound port (useful when constructed with port 0)."""
+        if self._sock is None:
+            return self._requested_port
+        return self._sock.getsockname()[1]
+
+    def _spawn(self, index: int) -> _Worker:
+        ready = self._context.Event()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(self.target, self._sock, index, ready, self.args),
+            name=f"youtube-agent-worker-{index}",
+        )
+        process.start()
+        worker = self._workers[index] = _Worker(process, ready)
+        return worker
+
+    def start(self) -> None:
+        """Bind the socket and start the workers, the first one alone."""
+        self._sock = bind_socket(self.host, self._requested_port)
+        first = self._spawn(0)
+        deadline = time.monotonic() + self.start_timeout
+        while not first.ready.wait(0.2):
+            if not first.process.is_alive():
+                self.stop()
+                error_msg = f"Worker 0 exited with code {first.process.exitcode} before it was ready"
+                raise RuntimeError(error_msg)
+            if time.monotonic() > deadline:
+                self.stop()
+                error_msg = f"Worker 0 was not ready within {self.start_timeout:.0f}s"
+                raise RuntimeError(error_msg)
+        for index in range(1, self.workers):
+            self._spawn(index)
+        print(f"👷 {self.workers} workers serving on {self.host}:{self.port}")
+
+    def check(self) -> int:
+        """Restart workers that have exited (after their backoff); returns how many were restarted."""
+        restarted = 0
+        now = time.monotonic()
+        for index, worker in list(self._workers.items()):
+            if self._stopping or worker.process.is_alive():
+                continue
+            if index not in self._restart_at:
+                crashed_early = now - worker.started < HEALTHY_UPTIME_SECONDS
+                failures = self._failures[index] = self._failures.get(index, 0) + 1 if crashed_early else 0
+                delay = min(self.restart_backoff * 2 ** (failures - 1), self.max_backoff) if failures else 0.0
+                self._restart_at[index] = now + delay
+                print(
+                    f"⚠️  Worker {index} (pid {worker.process.pid}) exited with code {worker.process.exitcode}; "
+                    f"restarting in {delay:.1f}s"
+                )
+            if now >= self._restart_at[index]:
+                del self._restart_at[index]
+                worker.process.close()
+                self._spawn(index)
+                self.restarts += 1
+                restarted += 1
+        return restarted
+
+    def run(self, poll_interval: float = 0.5) -> None:
+        """Start the workers and supervise them until SIGINT/SIGTERM, then stop them."""
+
+        def request_stop(signum: int, frame: Any) -> None:
+            self._stopping = True
+
+        previous = {sig: signal.signal(sig, request_stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+        try:
+            self.start()
+            while not self._stopping:
+                self.check()
+                time.sleep(poll_interval)
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+            self.stop()
+
+    def alive(self) -> int:
+        """Return the number of running workers."""
+        return sum(worker.process.is_alive() for worker in self._workers.values())
+
+    def ready(self) -> bool:
+        """Return True when every worker is running and has signalled it is ready."""
+        return len(self._workers) == self.workers and all(
+            worker.process.is_alive() and worker.ready.is_set() for worker in self._workers.values()
+        )
+
+    def stop(self, timeout: float = 15.0) -> None:
+        """Ask every worker to shut down gracefully, kill stragglers and close the socket."""
+        self._stopping = True
+        for worker in self._workers.values():
+            if worker.process.is_alive():
+                worker.process.terminate()
+        deadline = time.monotonic() + timeout
+        for worker in self._workers.values():
+            worker.process.join(max(deadline - time.monotonic(), 0.0))
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join()
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def stats(self) -> dict[str, Any]:
+        """Return worker counts and restarts."""
+        return {"workers": self.workers, "alive": self.alive(), "restarts": self.restarts}